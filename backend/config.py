@@ -1,11 +1,13 @@
 """
 ClientSwarm Configuration
 """
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
 
 
 class Settings(BaseSettings):
+    model_config = SettingsConfigDict(env_file=".env")
+
     # App
     app_name: str = "ClientSwarm"
     debug: bool = False
@@ -31,9 +33,6 @@ class Settings(BaseSettings):
     free_trial_scans: int = 10
     price_per_scan: float = 0.10
 
-    class Config:
-        env_file = ".env"
-
 
 @lru_cache()
 def get_settings() -> Settings:
@@ -7,6 +7,7 @@ Target: 2+ hours continuous operation
 
 import asyncio
 import aiohttp
+import itertools
 import json
 import time
 import os
@@ -14,10 +15,18 @@ import sys
 import signal
 from datetime import datetime, timezone
 from pathlib import Path
+from collections import deque
 from dataclasses import dataclass, field
 from typing import Optional
 import hashlib
 
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+try:
+    import pynvml  # nvidia-ml-py
+except ImportError:
+    pynvml = None
+
 # Configuration
 CONFIG = {
     "queenbee_url": "http://localhost:8000",
@@ -28,8 +37,26 @@ CONFIG = {
     "log_dir": Path("/home/ai/swarm-genesis/logs"),
     "output_dir": Path("/home/ai/swarm-genesis/data/outputs"),
     "dashboard_interval": 60,
+    "gpu_sample_window": 1024,
+    "template_dir": Path(__file__).parent / "templates",
+    "gpu_index": 0,
 }
 
+SPINE_LEVELS = ("L1-L2", "L2-L3", "L3-L4", "L4-L5", "L5-S1")
+STENOSIS_GRADES = ("Normal", "Mild", "Moderate", "Severe")
+
+# Compiled once; bytecode is cached on disk across runs
+TEMPLATES = Environment(
+    loader=FileSystemLoader(CONFIG["template_dir"]),
+    autoescape=True,
+    auto_reload=False,
+    bytecode_cache=FileSystemBytecodeCache(),
+    trim_blocks=True,
+    lstrip_blocks=True,
+    keep_trailing_newline=True,
+)
+REPORT_TEMPLATE = TEMPLATES.get_template("report.html.j2")
+
 @dataclass
 class SessionMetrics:
     """Track session-wide metrics."""
@@ -37,7 +64,33 @@ class SessionMetrics:
     jobs_completed: int = 0
     jobs_failed: int = 0
     total_inference_ms: int = 0
-    gpu_samples: list = field(default_factory=list)
+    gpu_samples: deque = field(default_factory=lambda: deque(maxlen=CONFIG["gpu_sample_window"]))
+    _gpu_sum: float = field(default=0.0, repr=False)
+    _gpu_writes: int = field(default=0, repr=False)
+
+    def record_success(self, inference_ms: int):
+        """Count a completed job. Plain int updates, safe between awaits."""
+        self.jobs_completed += 1
+        self.total_inference_ms += inference_ms
+
+    def record_failure(self):
+        self.jobs_failed += 1
+
+    def record_gpu_sample(self, util: float):
+        """Append to the window, keeping a running sum of the samples it holds."""
+        window = self.gpu_samples
+        if len(window) == window.maxlen:
+            self._gpu_sum -= window[0]
+        window.append(util)
+        self._gpu_sum += util
+        self._gpu_writes += 1
+        if self._gpu_writes % window.maxlen == 0:
+            # Resync once per full window so float error cannot accumulate
+            self._gpu_sum = sum(window)
+
+    def snapshot(self) -> tuple[int, int, int]:
+        """Read (completed, failed, total_inference_ms) in one statement for a consistent view."""
+        return self.jobs_completed, self.jobs_failed, self.total_inference_ms
 
     @property
     def uptime_seconds(self) -> float:
@@ -61,7 +114,7 @@ class SessionMetrics:
 
     @property
     def avg_gpu_util(self) -> float:
-        return sum(self.gpu_samples) / len(self.gpu_samples) if self.gpu_samples else 0
+        return self._gpu_sum / len(self.gpu_samples) if self.gpu_samples else 0
 
 
 class LiveInferenceSession:
@@ -71,6 +124,8 @@ class LiveInferenceSession:
         self.metrics = SessionMetrics()
         self.running = True
         self.session: Optional[aiohttp.ClientSession] = None
+        self.inflight: Optional[asyncio.Task] = None
+        self.gpu_handle = None
         self.log_file = CONFIG["log_dir"] / f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
 
         # Ensure directories exist
@@ -86,6 +141,32 @@ class LiveInferenceSession:
         self.log(f"Received signal {signum}, initiating graceful shutdown...")
         self.running = False
 
+    def init_gpu_sampling(self):
+        """Open an in-process NVML handle; no fork/exec of nvidia-smi per sample."""
+        if pynvml is None:
+            self.log("⚠️  nvidia-ml-py not installed, GPU utilization will not be sampled")
+            return
+        try:
+            pynvml.nvmlInit()
+            self.gpu_handle = pynvml.nvmlDeviceGetHandleByIndex(CONFIG["gpu_index"])
+        except pynvml.NVMLError as e:
+            self.log(f"⚠️  NVML unavailable ({e}), GPU utilization will not be sampled")
+
+    def shutdown_gpu_sampling(self):
+        if self.gpu_handle is not None:
+            self.gpu_handle = None
+            pynvml.nvmlShutdown()
+
+    def sample_gpu(self):
+        if self.gpu_handle is None:
+            return
+        try:
+            util = pynvml.nvmlDeviceGetUtilizationRates(self.gpu_handle).gpu
+        except pynvml.NVMLError as e:
+            self.log(f"⚠️  GPU sample failed: {e}")
+            return
+        self.metrics.record_gpu_sample(util)
+
     def log(self, message: str):
         """Log message to console and file."""
         timestamp = datetime.now(timezone.utc).isoformat()
@@ -168,85 +249,19 @@ class LiveInferenceSession:
         # Generate verification hash
         content_hash = hashlib.sha256(json.dumps(result, sort_keys=True).encode()).hexdigest()[:16]
 
-        html = f"""<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <title>Spine MRI Analysis Report - {job_id}</title>
-    <style>
-        body {{ font-family: 'Helvetica', sans-serif; margin: 40px; color: #1a1a1a; }}
-        .header {{ border-bottom: 3px solid #10b981; padding-bottom: 20px; margin-bottom: 30px; }}
-        .logo {{ font-size: 24px; font-weight: bold; color: #10b981; }}
-        .job-id {{ color: #666; font-size: 14px; }}
-        h2 {{ color: #333; border-bottom: 1px solid #ddd; padding-bottom: 10px; }}
-        table {{ width: 100%; border-collapse: collapse; margin: 20px 0; }}
-        th, td {{ padding: 12px; text-align: left; border-bottom: 1px solid #eee; }}
-        th {{ background: #f8f8f8; }}
-        .confidence {{ background: #f0fdf4; padding: 15px; border-radius: 8px; margin: 20px 0; }}
-        .verification {{ background: #f8f8f8; padding: 10px; border-radius: 4px; font-family: monospace; font-size: 12px; }}
-        .footer {{ margin-top: 40px; padding-top: 20px; border-top: 1px solid #ddd; font-size: 12px; color: #666; }}
-        ul {{ line-height: 1.8; }}
-        .normal {{ color: #10b981; font-weight: bold; }}
-        .mild {{ color: #84cc16; font-weight: bold; }}
-        .moderate {{ color: #f97316; font-weight: bold; }}
-        .severe {{ color: #ef4444; font-weight: bold; }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <div class="logo">SwarmOS Medical AI</div>
-        <div class="job-id">Report ID: {job_id} | Generated: {timestamp}</div>
-    </div>
-
-    <h2>Stenosis Grading by Level</h2>
-    <table>
-        <tr><th>Spinal Level</th><th>Stenosis Grade</th></tr>
-"""
-
-        for level in ["L1-L2", "L2-L3", "L3-L4", "L4-L5", "L5-S1"]:
-            grade = stenosis.get(level, "Not assessed")
-            grade_class = grade.lower() if grade in ["Normal", "Mild", "Moderate", "Severe"] else ""
-            html += f'        <tr><td>{level}</td><td class="{grade_class}">{grade}</td></tr>\n'
-
-        html += """    </table>
-
-    <h2>Clinical Impression</h2>
-    <ul>
-"""
-        for imp in impression:
-            html += f"        <li>{imp}</li>\n"
-
-        html += """    </ul>
-
-    <h2>Recommendations</h2>
-    <ul>
-"""
-        for rec in recommendations:
-            html += f"        <li>{rec}</li>\n"
-
-        conf_score = confidence.get("score_0_100", 0)
-        conf_method = confidence.get("method", "unknown")
-
-        html += f"""    </ul>
-
-    <div class="confidence">
-        <strong>AI Confidence:</strong> {conf_score}%
-        (Method: {conf_method})
-    </div>
-
-    <div class="verification">
-        <strong>Verification Hash:</strong> {content_hash}
-    </div>
-
-    <div class="footer">
-        <p><strong>Model:</strong> Med42-70B + QueenBee-Spine-LoRA</p>
-        <p><strong>Worker:</strong> {CONFIG['worker_ens']}</p>
-        <p style="margin-top:20px"><em>This report was generated by SwarmOS sovereign compute infrastructure.
-        Results should be validated by a qualified radiologist.</em></p>
-    </div>
-</body>
-</html>
-"""
+        html = REPORT_TEMPLATE.render(
+            job_id=job_id,
+            timestamp=timestamp,
+            levels=SPINE_LEVELS,
+            grades=STENOSIS_GRADES,
+            stenosis=stenosis,
+            impression=impression,
+            recommendations=recommendations,
+            conf_score=confidence.get("score_0_100", 0),
+            conf_method=confidence.get("method", "unknown"),
+            hash=content_hash,
+            worker_ens=CONFIG["worker_ens"],
+        )
 
         # Save report
         report_path = CONFIG["output_dir"] / f"{job_id}_report.html"
@@ -257,15 +272,19 @@ class LiveInferenceSession:
 
     def print_dashboard(self):
         """Print live dashboard to console."""
+        completed, failed, total_ms = self.metrics.snapshot()
+        uptime_hours = self.metrics.uptime_seconds / 3600
+        jobs_per_hour = completed / uptime_hours if uptime_hours > 0 else 0
+        avg_ms = total_ms / completed if completed > 0 else 0
         dashboard = f"""
 ═══════════════════════════════════════════════════════════════════════
  🐝⚡ SWARMOS LIVE INFERENCE DASHBOARD
 ═══════════════════════════════════════════════════════════════════════
  Uptime:          {self.metrics.uptime_str}
- Jobs Completed:  {self.metrics.jobs_completed}
- Jobs Failed:     {self.metrics.jobs_failed}
- Jobs/Hour:       {self.metrics.jobs_per_hour:.1f}
- Avg Inference:   {self.metrics.avg_inference_ms:.0f}ms ({self.metrics.avg_inference_ms/1000:.1f}s)
+ Jobs Completed:  {completed}
+ Jobs Failed:     {failed}
+ Jobs/Hour:       {jobs_per_hour:.1f}
+ Avg Inference:   {avg_ms:.0f}ms ({avg_ms/1000:.1f}s)
  GPU Util:        {self.metrics.avg_gpu_util:.0f}%
  Worker:          {CONFIG['worker_ens']}
  Session Log:     {self.log_file.name}
@@ -275,7 +294,6 @@ class LiveInferenceSession:
 
     async def run_job_loop(self):
         """Main job processing loop."""
-        job_counter = 0
 
         # Sample spine findings for testing
         test_findings = [
@@ -285,6 +303,9 @@ class LiveInferenceSession:
             "L2-L3: Mild disc bulge. L3-L4: Moderate central canal stenosis. L4-L5: Mild foraminal narrowing. L5-S1: Normal.",
             "L4-L5: Moderate central canal stenosis with bilateral foraminal narrowing. Ligamentum flavum hypertrophy noted. L5-S1: Mild disc desiccation with minimal bulging.",
         ]
+        # Starts at index 1: job N uses test_findings[N % len], as before
+        findings_cycle = itertools.cycle(test_findings[1:] + test_findings[:1])
+        job_numbers = itertools.count(1)
 
         self.log("Starting job processing loop...")
 
@@ -295,18 +316,17 @@ class LiveInferenceSession:
                 break
 
             # Generate job
-            job_counter += 1
-            job_id = f"live-{datetime.now().strftime('%Y%m%d')}-{job_counter:05d}"
-            findings = test_findings[job_counter % len(test_findings)]
+            job_id = f"live-{datetime.now().strftime('%Y%m%d')}-{next(job_numbers):05d}"
+            findings = next(findings_cycle)
 
             self.log(f"📋 Processing job: {job_id}")
 
-            # Run inference
-            result = await self.run_inference(job_id, findings)
+            # Run inference (shielded so shutdown never drops a job mid-flight)
+            self.inflight = asyncio.ensure_future(self.run_inference(job_id, findings))
+            result = await asyncio.shield(self.inflight)
 
             if result["success"]:
-                self.metrics.jobs_completed += 1
-                self.metrics.total_inference_ms += result["inference_ms"]
+                self.metrics.record_success(result["inference_ms"])
 
                 # Generate report
                 report_path = self.generate_html_report(job_id, result["result"])
@@ -315,20 +335,18 @@ class LiveInferenceSession:
                 self.log(f"   Report: {report_path.name}")
                 self.log(f"   Confidence: {result['result'].get('confidence', {}).get('score_0_100', 0)}%")
             else:
-                self.metrics.jobs_failed += 1
+                self.metrics.record_failure()
                 self.log(f"❌ Job {job_id} failed: {result.get('error', 'Unknown error')}")
 
-            # Add GPU utilization sample (simulated for now, would use nvidia-smi in production)
-            self.metrics.gpu_samples.append(85 + (job_counter % 10))  # Simulated 85-95%
-
             # Brief pause between jobs
             await asyncio.sleep(1)
 
     async def dashboard_loop(self):
-        """Periodically print dashboard."""
+        """Periodically sample the GPU and print dashboard."""
         while self.running:
             await asyncio.sleep(CONFIG["dashboard_interval"])
             if self.running:
+                self.sample_gpu()
                 self.print_dashboard()
 
     async def run(self):
@@ -346,7 +364,15 @@ class LiveInferenceSession:
 """.format(duration=CONFIG["session_duration_hours"], worker=CONFIG["worker_ens"]))
 
         self.log("Initializing session...")
+        self.init_gpu_sampling()
+
+        try:
+            await self.run_session()
+        finally:
+            self.shutdown_gpu_sampling()
 
+    async def run_session(self):
+        """Check services, run the job and dashboard loops, then write the report."""
         async with aiohttp.ClientSession() as session:
             self.session = session
 
@@ -359,11 +385,16 @@ class LiveInferenceSession:
             self.log("All services online. Starting inference loop...")
             self.log(f"Session log: {self.log_file}")
 
-            # Run job loop and dashboard concurrently
-            await asyncio.gather(
-                self.run_job_loop(),
-                self.dashboard_loop(),
-            )
+            # Run job loop and dashboard concurrently; the dashboard stops with the job loop
+            try:
+                async with asyncio.TaskGroup() as tg:
+                    jobs = tg.create_task(self.run_job_loop())
+                    dashboard = tg.create_task(self.dashboard_loop())
+                    jobs.add_done_callback(lambda _: dashboard.cancel())
+            finally:
+                if self.inflight is not None and not self.inflight.done():
+                    self.log("Waiting for in-flight inference to complete...")
+                    await asyncio.shield(self.inflight)
 
         # Generate final report
         await self.generate_session_report()
@@ -12,15 +12,27 @@ Responsibilities:
 """
 
 import os
+import sys
 import asyncio
 from datetime import datetime, timezone
 from decimal import Decimal
+from collections import defaultdict
 from contextlib import asynccontextmanager
+from operator import itemgetter
 from typing import Optional
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+import numpy as np
+import orjson
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from fastapi_cache.backends.redis import RedisBackend
+from fastapi_cache.decorator import cache
+from redis import asyncio as aioredis
+from pydantic import BaseModel, Field
+from sortedcontainers import SortedKeyList
 
 
 # =============================================================================
@@ -43,18 +55,98 @@ class Config:
     PROTOCOL_FEE_ADDRESS: str = os.getenv("PROTOCOL_FEE_ADDRESS", "bee23.eth")
     OPERATOR_FEE_ADDRESS: str = os.getenv("OPERATOR_FEE_ADDRESS", "swarmos.eth")
     
-    # Fee percentages
-    PROTOCOL_FEE_PCT: Decimal = Decimal("0.02")  # 2%
-    OPERATOR_FEE_PCT: Decimal = Decimal("0.05")  # 5%
-    WORK_POOL_PCT: Decimal = Decimal("0.70")     # 70%
-    READINESS_POOL_PCT: Decimal = Decimal("0.23") # 23% (after fees)
+    # Fee shares in basis points (1 bps = 0.01%)
+    PROTOCOL_FEE_BPS: int = 200      # 2%
+    OPERATOR_FEE_BPS: int = 500      # 5%
+    WORK_POOL_BPS: int = 7000        # 70%
+    READINESS_POOL_BPS: int = 2300   # 23% (after fees)
     
     VERSION: str = "1.0.0"
+    
+    # Most payouts accepted by one /v1/payouts/batch call
+    PAYOUT_BATCH_MAX: int = 50
+    
+    # How often cached status payloads are rebuilt
+    STATUS_REFRESH_SECONDS: float = 1.0
+
+    # Response cache: Redis when configured (shared across workers), else in-process
+    REDIS_URL: str = os.getenv("SWARMBANK_REDIS_URL", os.getenv("REDIS_URL", ""))
+    CACHE_TTL_RECIPIENTS: int = 5    # seconds
+    CACHE_TTL_ALLOCATIONS: int = 300
+
+    # Server. Deposits and payouts live in this process's BankStore; keep
+    # WORKERS=1 until that state moves out of process.
+    DEBUG: bool = os.getenv("DEBUG") == "1"
+    WORKERS: int = int(os.getenv("WORKERS", "1"))
 
 
 config = Config()
 
 
+# =============================================================================
+# Money
+# =============================================================================
+
+def to_cents(amount) -> int:
+    """Parse a USD amount (str, float or Decimal) into integer cents."""
+    return int((Decimal(str(amount)) * 100).to_integral_value())
+
+
+def div_round(numerator, denominator: int):
+    """Integer division rounded half-even, like round(Decimal, 2) on the exact amount."""
+    quotient, remainder = divmod(numerator, denominator)
+    twice = 2 * remainder
+    return quotient + ((twice > denominator) | ((twice == denominator) & (quotient % 2 == 1)))
+
+
+def format_cents(cents: int) -> str:
+    sign = "-" if cents < 0 else ""
+    cents = abs(cents)
+    return f"{sign}{cents // 100}.{cents % 100:02d}"
+
+
+# Treasury split, fixed at import. The pools share what is left after fees.
+POOL_SPLIT_BPS = config.WORK_POOL_BPS + config.READINESS_POOL_BPS
+AFTER_FEES_BPS = 10000 - config.PROTOCOL_FEE_BPS - config.OPERATOR_FEE_BPS
+
+ALLOCATIONS = {
+    "work_pool_pct": config.WORK_POOL_BPS / 100,
+    "readiness_pool_pct": config.READINESS_POOL_BPS / 100,
+    "protocol_fee_pct": config.PROTOCOL_FEE_BPS / 100,
+    "operator_fee_pct": config.OPERATOR_FEE_BPS / 100,
+    "protocol_fee_recipient": config.PROTOCOL_FEE_ADDRESS,
+    "operator_fee_recipient": config.OPERATOR_FEE_ADDRESS,
+}
+
+
+def split_cents(amount_cents):
+    """
+    Split an amount in cents into (work, readiness, protocol, operator) shares.
+
+    Integer-only, so it takes a single int or an int64 array of amounts. Each
+    share is rounded on its own from the exact amount, so the four need not
+    add up to the input to the cent.
+    """
+    protocol_fee = div_round(amount_cents * config.PROTOCOL_FEE_BPS, 10000)
+    operator_fee = div_round(amount_cents * config.OPERATOR_FEE_BPS, 10000)
+    pool_cents = amount_cents * AFTER_FEES_BPS
+    work_pool = div_round(pool_cents * config.WORK_POOL_BPS, 10000 * POOL_SPLIT_BPS)
+    readiness_pool = div_round(pool_cents * config.READINESS_POOL_BPS, 10000 * POOL_SPLIT_BPS)
+    return work_pool, readiness_pool, protocol_fee, operator_fee
+
+
+FEE_RECIPIENTS = {
+    "protocol": {
+        "ens": config.PROTOCOL_FEE_ADDRESS,
+        "percentage": config.PROTOCOL_FEE_BPS / 100,
+    },
+    "operator": {
+        "ens": config.OPERATOR_FEE_ADDRESS,
+        "percentage": config.OPERATOR_FEE_BPS / 100,
+    },
+}
+
+
 # =============================================================================
 # Schemas
 # =============================================================================
@@ -96,6 +188,10 @@ class PayoutRequest(BaseModel):
     signature: str
 
 
+class PayoutBatchRequest(BaseModel):
+    items: list[PayoutRequest] = Field(min_length=1, max_length=config.PAYOUT_BATCH_MAX)
+
+
 class TreasuryReport(BaseModel):
     period: str
     total_revenue_usd: str
@@ -110,20 +206,39 @@ class TreasuryReport(BaseModel):
 # In-Memory Store
 # =============================================================================
 
+def _by_created_at(records=()) -> SortedKeyList:
+    """Records kept in created_at order; newest are read from the tail."""
+    return SortedKeyList(records, key=itemgetter("created_at"))
+
+
+def _newest(records: SortedKeyList, limit: int) -> list[dict]:
+    n = len(records)
+    return list(records.islice(max(n - limit, 0), n, reverse=True))
+
+
+# Record statuses, interned so stored values share one object each
+STATUS_PENDING = sys.intern("pending")
+STATUS_PROCESSING = sys.intern("processing")
+STATUS_CONFIRMED = sys.intern("confirmed")
+STATUS_COMPLETED = sys.intern("completed")
+
+OPEN_PAYOUT_STATUSES = frozenset({STATUS_PENDING, STATUS_PROCESSING})
+
+
 class BankStore:
     def __init__(self):
-        # Vault balance
-        self.vault_balance = Decimal("12847.50")
+        # Vault balance (all money in the store is integer cents)
+        self.vault_balance_cents = 1284750
         
         # Deposits
-        self.deposits = [
+        deposits = [
             {
                 "id": "dep-00001",
                 "client_ens": "xyz.clientswarm.eth",
                 "amount_usd": "500.00",
                 "eth_tx_hash": "0x1a2b3c4d5e6f7890abcdef1234567890abcdef1234567890abcdef1234567890",
                 "block_number": 19234567,
-                "status": "confirmed",
+                "status": STATUS_CONFIRMED,
                 "created_at": "2025-01-15T10:30:00Z",
                 "confirmed_at": "2025-01-15T10:32:00Z",
             },
@@ -133,7 +248,7 @@ class BankStore:
                 "amount_usd": "1000.00",
                 "eth_tx_hash": "0x2b3c4d5e6f7890abcdef1234567890abcdef1234567890abcdef1234567890ab",
                 "block_number": 19234890,
-                "status": "confirmed",
+                "status": STATUS_CONFIRMED,
                 "created_at": "2025-01-16T14:22:00Z",
                 "confirmed_at": "2025-01-16T14:24:00Z",
             },
@@ -143,20 +258,20 @@ class BankStore:
                 "amount_usd": "250.00",
                 "eth_tx_hash": "0x3c4d5e6f7890abcdef1234567890abcdef1234567890abcdef1234567890abcd",
                 "block_number": 19235100,
-                "status": "confirmed",
+                "status": STATUS_CONFIRMED,
                 "created_at": "2025-01-17T09:15:00Z",
                 "confirmed_at": "2025-01-17T09:17:00Z",
             },
         ]
         
         # Payouts
-        self.payouts = [
+        payouts = [
             {
                 "id": "pay-00001",
                 "worker_ens": "bee-01.swarmbee.eth",
                 "amount_usd": "250.00",
                 "destination_address": "0xBee1Address1234567890abcdef1234567890abcd",
-                "status": "completed",
+                "status": STATUS_COMPLETED,
                 "eth_tx_hash": "0x8a3f7c2b1e9d4f6a8b0c3e5d7f9a2b4c6e8d0f1a3b5c7d9e1f3a5b7c9dc2d1",
                 "created_at": "2025-01-17T12:00:00Z",
                 "processed_at": "2025-01-17T12:02:00Z",
@@ -166,7 +281,7 @@ class BankStore:
                 "worker_ens": "bee-02.swarmbee.eth",
                 "amount_usd": "175.50",
                 "destination_address": "0xBee2Address1234567890abcdef1234567890abcd",
-                "status": "completed",
+                "status": STATUS_COMPLETED,
                 "eth_tx_hash": "0x2b7c9e4f1a3d5b7c9e1f3a5b7c9d0e2f4a6b8c0d2e4f6a8b0c2d4f6a8bf8e3",
                 "created_at": "2025-01-17T09:30:00Z",
                 "processed_at": "2025-01-17T09:32:00Z",
@@ -176,7 +291,7 @@ class BankStore:
                 "worker_ens": "bee-03.swarmbee.eth",
                 "amount_usd": "100.00",
                 "destination_address": "0xBee3Address1234567890abcdef1234567890abcd",
-                "status": "processing",
+                "status": STATUS_PROCESSING,
                 "eth_tx_hash": None,
                 "created_at": "2025-01-17T14:45:00Z",
                 "processed_at": None,
@@ -186,7 +301,7 @@ class BankStore:
                 "worker_ens": "bee-01.swarmbee.eth",
                 "amount_usd": "500.00",
                 "destination_address": "0xBee1Address1234567890abcdef1234567890abcd",
-                "status": "completed",
+                "status": STATUS_COMPLETED,
                 "eth_tx_hash": "0x9d4e8f2a1b3c5d7e9f0a2b4c6d8e0f2a4b6c8d0e2f4a6b8c0d2e4f6a1b2",
                 "created_at": "2025-01-16T18:00:00Z",
                 "processed_at": "2025-01-16T18:03:00Z",
@@ -196,95 +311,193 @@ class BankStore:
                 "worker_ens": "bee-04.swarmbee.eth",
                 "amount_usd": "89.20",
                 "destination_address": "0xBee4Address1234567890abcdef1234567890abcd",
-                "status": "completed",
+                "status": STATUS_COMPLETED,
                 "eth_tx_hash": "0x3c5f7a9b1d3e5f7a9b1c3d5e7f9a1b3c5d7e9f1a3b5c7d9e1f3a5b7c9dd7e8",
                 "created_at": "2025-01-15T22:00:00Z",
                 "processed_at": "2025-01-15T22:02:00Z",
             },
         ]
         
+        # Sorted by created_at, plus per-status indexes so listing never re-sorts
+        self.deposits = _by_created_at(deposits)
+        self.payouts = _by_created_at(payouts)
+        self._deposits_by_status: dict[str, SortedKeyList] = defaultdict(_by_created_at)
+        self._payouts_by_status: dict[str, SortedKeyList] = defaultdict(_by_created_at)
+        for dep in deposits:
+            self._deposits_by_status[dep["status"]].add(dep)
+        for pay in payouts:
+            self._payouts_by_status[pay["status"]].add(pay)
+        
+        self._deposits_by_id: dict[str, dict] = {d["id"]: d for d in deposits}
+        self._payouts_by_id: dict[str, dict] = {p["id"]: p for p in payouts}
+        
+        # Payout amounts as integer cents, keyed by payout id
+        self.payout_cents: dict[str, int] = {p["id"]: to_cents(p["amount_usd"]) for p in payouts}
+        
         # Treasury stats
-        self.total_deposits = Decimal("8240.00")
-        self.total_payouts = Decimal("5892.40")
+        self.total_deposits_cents = 824000
+        self.total_payouts_cents = 589240
         self.payout_counter = 5
         self.deposit_counter = 3
+        
+        # Status counts, maintained on every status transition
+        self.pending_deposits = sum(1 for d in deposits if d["status"] == STATUS_PENDING)
+        self.pending_payouts = sum(1 for p in payouts if p["status"] in OPEN_PAYOUT_STATUSES)
+        self.completed_payouts = sum(1 for p in payouts if p["status"] == STATUS_COMPLETED)
     
     def get_vault_status(self) -> dict:
-        pending_deps = len([d for d in self.deposits if d["status"] == "pending"])
-        pending_pays = len([p for p in self.payouts if p["status"] in ("pending", "processing")])
-        
         return {
             "address": config.VAULT_ADDRESS,
-            "balance_usd": str(self.vault_balance),
-            "pending_deposits": pending_deps,
-            "pending_payouts": pending_pays,
+            "balance_usd": format_cents(self.vault_balance_cents),
+            "pending_deposits": self.pending_deposits,
+            "pending_payouts": self.pending_payouts,
             "last_updated": datetime.now(timezone.utc).isoformat(),
         }
     
+    def get_stats(self) -> dict:
+        return {
+            "vault_balance_usd": format_cents(self.vault_balance_cents),
+            "total_deposits_usd": format_cents(self.total_deposits_cents),
+            "total_payouts_usd": format_cents(self.total_payouts_cents),
+            "total_deposit_count": len(self.deposits),
+            "total_payout_count": self.completed_payouts,
+            "pending_payouts": self.pending_payouts,
+            "settlement_rate": "100%",
+        }
+    
     def get_deposits(self, limit: int = 50, status: str = None) -> list[dict]:
-        deps = self.deposits
         if status:
-            deps = [d for d in deps if d["status"] == status]
-        return sorted(deps, key=lambda d: d["created_at"], reverse=True)[:limit]
+            if status not in self._deposits_by_status:
+                return []
+            return _newest(self._deposits_by_status[status], limit)
+        return _newest(self.deposits, limit)
     
     def get_payouts(self, limit: int = 50, status: str = None) -> list[dict]:
-        pays = self.payouts
         if status:
-            pays = [p for p in pays if p["status"] == status]
-        return sorted(pays, key=lambda p: p["created_at"], reverse=True)[:limit]
+            if status not in self._payouts_by_status:
+                return []
+            return _newest(self._payouts_by_status[status], limit)
+        return _newest(self.payouts, limit)
+    
+    def get_deposit(self, deposit_id: str) -> dict | None:
+        return self._deposits_by_id.get(deposit_id)
     
-    def create_payout(self, worker_ens: str, amount: Decimal, destination: str) -> dict:
+    def get_payout(self, payout_id: str) -> dict | None:
+        return self._payouts_by_id.get(payout_id)
+    
+    def _new_payout(self, worker_ens: str, amount_cents: int, destination: str, created_at: str) -> dict:
         self.payout_counter += 1
         payout_id = f"pay-{self.payout_counter:05d}"
-        
-        payout = {
+        self.payout_cents[payout_id] = amount_cents
+        return {
             "id": payout_id,
-            "worker_ens": worker_ens,
-            "amount_usd": str(amount),
+            "worker_ens": sys.intern(worker_ens),
+            "amount_usd": format_cents(amount_cents),
             "destination_address": destination,
-            "status": "pending",
+            "status": STATUS_PENDING,
             "eth_tx_hash": None,
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": created_at,
             "processed_at": None,
         }
-        
-        self.payouts.append(payout)
+    
+    def create_payout(self, worker_ens: str, amount_cents: int, destination: str) -> dict:
+        payout = self._new_payout(
+            worker_ens, amount_cents, destination,
+            datetime.now(timezone.utc).isoformat(),
+        )
+        self.payouts.add(payout)
+        self._payouts_by_status[STATUS_PENDING].add(payout)
+        self._payouts_by_id[payout["id"]] = payout
+        self.pending_payouts += 1
         return payout
     
+    def create_payouts_bulk(self, items: list[tuple[str, int, str]]) -> list[dict]:
+        """Queue (worker_ens, amount_cents, destination) payouts in one store update."""
+        created_at = datetime.now(timezone.utc).isoformat()
+        payouts = [
+            self._new_payout(worker_ens, amount_cents, destination, created_at)
+            for worker_ens, amount_cents, destination in items
+        ]
+        self.payouts.update(payouts)
+        self._payouts_by_status[STATUS_PENDING].update(payouts)
+        self._payouts_by_id.update((p["id"], p) for p in payouts)
+        self.pending_payouts += len(payouts)
+        return payouts
+    
     def process_payout(self, payout_id: str, tx_hash: str) -> dict:
-        for payout in self.payouts:
-            if payout["id"] == payout_id:
-                payout["status"] = "completed"
-                payout["eth_tx_hash"] = tx_hash
-                payout["processed_at"] = datetime.now(timezone.utc).isoformat()
-                
-                # Update totals
-                self.total_payouts += Decimal(payout["amount_usd"])
-                self.vault_balance -= Decimal(payout["amount_usd"])
-                
-                return payout
-        return None
+        payout = self._payouts_by_id.get(payout_id)
+        if payout is None:
+            return None
+        
+        self._payouts_by_status[payout["status"]].remove(payout)
+        if payout["status"] in OPEN_PAYOUT_STATUSES:
+            self.pending_payouts -= 1
+        if payout["status"] != STATUS_COMPLETED:
+            self.completed_payouts += 1
+        payout["status"] = STATUS_COMPLETED
+        self._payouts_by_status[STATUS_COMPLETED].add(payout)
+        payout["eth_tx_hash"] = tx_hash
+        payout["processed_at"] = datetime.now(timezone.utc).isoformat()
+        
+        # Update totals
+        amount_cents = self.payout_cents[payout_id]
+        self.total_payouts_cents += amount_cents
+        self.vault_balance_cents -= amount_cents
+        
+        return payout
     
-    def get_treasury_report(self, epoch_revenue: Decimal) -> dict:
-        protocol_fee = epoch_revenue * config.PROTOCOL_FEE_PCT
-        operator_fee = epoch_revenue * config.OPERATOR_FEE_PCT
-        remaining = epoch_revenue - protocol_fee - operator_fee
-        work_pool = remaining * (config.WORK_POOL_PCT / (config.WORK_POOL_PCT + config.READINESS_POOL_PCT))
-        readiness_pool = remaining - work_pool
+    def get_treasury_report(self, revenue_cents: int) -> dict:
+        work_pool, readiness_pool, protocol_fee, operator_fee = split_cents(revenue_cents)
         
         return {
-            "total_revenue_usd": str(epoch_revenue),
-            "work_pool_usd": str(round(work_pool, 2)),
-            "readiness_pool_usd": str(round(readiness_pool, 2)),
-            "protocol_fee_usd": str(round(protocol_fee, 2)),
-            "operator_fee_usd": str(round(operator_fee, 2)),
-            "total_distributed_usd": str(epoch_revenue),
+            "total_revenue_usd": format_cents(revenue_cents),
+            "work_pool_usd": format_cents(work_pool),
+            "readiness_pool_usd": format_cents(readiness_pool),
+            "protocol_fee_usd": format_cents(protocol_fee),
+            "operator_fee_usd": format_cents(operator_fee),
+            "total_distributed_usd": format_cents(revenue_cents),
         }
 
 
 store = BankStore()
 
 
+# =============================================================================
+# Cached Status Payloads
+# =============================================================================
+
+# Static /health body up to the opening quote of the timestamp value
+_HEALTH_PREFIX = orjson.dumps({
+    "status": "healthy",
+    "service": "swarmbank",
+    "version": config.VERSION,
+    "timestamp": "",
+})[:-2]
+
+_status_cache: dict[str, bytes] = {}
+
+
+def refresh_status_cache():
+    """Re-serialize the polled status endpoints from the current store state."""
+    now = datetime.now(timezone.utc).isoformat().encode()
+    _status_cache["health"] = _HEALTH_PREFIX + now + b'"}'
+    _status_cache["vault"] = orjson.dumps(store.get_vault_status())
+    _status_cache["stats"] = orjson.dumps(store.get_stats())
+
+
+async def status_refresher():
+    while True:
+        await asyncio.sleep(config.STATUS_REFRESH_SECONDS)
+        refresh_status_cache()
+
+
+def cached_json(name: str) -> Response:
+    return Response(content=_status_cache[name], media_type="application/json")
+
+
+refresh_status_cache()
+
+
 # =============================================================================
 # Lifespan
 # =============================================================================
@@ -294,7 +507,13 @@ async def lifespan(app: FastAPI):
     print(f"🏦 SwarmBank API starting...")
     print(f"   ENS: {config.ENS}")
     print(f"   Vault: {config.VAULT_ADDRESS}")
+    if config.REDIS_URL:
+        FastAPICache.init(RedisBackend(aioredis.from_url(config.REDIS_URL)), prefix="swarmbank")
+    else:
+        FastAPICache.init(InMemoryBackend(), prefix="swarmbank")
+    refresher = asyncio.create_task(status_refresher())
     yield
+    refresher.cancel()
     print(f"🏦 SwarmBank API shutting down...")
 
 
@@ -307,6 +526,7 @@ app = FastAPI(
     description="Treasury and payout management for SwarmOS",
     version=config.VERSION,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -331,32 +551,19 @@ app.add_middleware(
 
 @app.get("/health")
 async def health():
-    return {
-        "status": "healthy",
-        "service": "swarmbank",
-        "version": config.VERSION,
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-    }
+    return cached_json("health")
 
 
-@app.get("/v1/vault", response_model=VaultStatus)
+@app.get("/v1/vault")
 async def get_vault_status():
     """Get current vault status."""
-    return store.get_vault_status()
+    return cached_json("vault")
 
 
 @app.get("/v1/stats")
 async def get_stats():
     """Get treasury statistics."""
-    return {
-        "vault_balance_usd": str(store.vault_balance),
-        "total_deposits_usd": str(store.total_deposits),
-        "total_payouts_usd": str(store.total_payouts),
-        "total_deposit_count": len(store.deposits),
-        "total_payout_count": len([p for p in store.payouts if p["status"] == "completed"]),
-        "pending_payouts": len([p for p in store.payouts if p["status"] in ("pending", "processing")]),
-        "settlement_rate": "100%",
-    }
+    return cached_json("stats")
 
 
 # =============================================================================
@@ -376,10 +583,10 @@ async def list_deposits(limit: int = 50, status: Optional[str] = None):
 @app.get("/v1/deposits/{deposit_id}")
 async def get_deposit(deposit_id: str):
     """Get specific deposit."""
-    for dep in store.deposits:
-        if dep["id"] == deposit_id:
-            return dep
-    raise HTTPException(status_code=404, detail="Deposit not found")
+    deposit = store.get_deposit(deposit_id)
+    if not deposit:
+        raise HTTPException(status_code=404, detail="Deposit not found")
+    return deposit
 
 
 @app.post("/v1/deposits/watch")
@@ -406,42 +613,43 @@ async def list_payouts(limit: int = 50, status: Optional[str] = None, worker: Op
     if worker:
         payouts = [p for p in payouts if p["worker_ens"] == worker]
     
-    total_amount = sum(Decimal(p["amount_usd"]) for p in payouts if p["status"] == "completed")
+    total_cents = sum(store.payout_cents[p["id"]] for p in payouts if p["status"] == STATUS_COMPLETED)
     
     return {
         "payouts": payouts,
         "total": len(payouts),
-        "total_amount_usd": str(total_amount),
+        "total_amount_usd": format_cents(total_cents),
     }
 
 
 @app.get("/v1/payouts/{payout_id}")
 async def get_payout(payout_id: str):
     """Get specific payout."""
-    for pay in store.payouts:
-        if pay["id"] == payout_id:
-            return pay
-    raise HTTPException(status_code=404, detail="Payout not found")
+    payout = store.get_payout(payout_id)
+    if not payout:
+        raise HTTPException(status_code=404, detail="Payout not found")
+    return payout
 
 
 @app.post("/v1/payouts/request")
 async def request_payout(request: PayoutRequest):
     """Request a worker payout."""
-    amount = Decimal(request.amount_usd)
+    amount_cents = to_cents(request.amount_usd)
     
     # Verify sufficient vault balance
-    if amount > store.vault_balance:
+    if amount_cents > store.vault_balance_cents:
         raise HTTPException(
             status_code=402,
-            detail=f"Insufficient vault balance. Available: ${store.vault_balance}"
+            detail=f"Insufficient vault balance. Available: ${format_cents(store.vault_balance_cents)}"
         )
     
     # Create payout request
     payout = store.create_payout(
         worker_ens=request.worker_ens,
-        amount=amount,
+        amount_cents=amount_cents,
         destination=request.destination_address,
     )
+    refresh_status_cache()
     
     return {
         "status": "pending",
@@ -450,12 +658,60 @@ async def request_payout(request: PayoutRequest):
     }
 
 
+@app.post("/v1/payouts/batch")
+async def request_payouts_batch(request: PayoutBatchRequest):
+    """Request up to PAYOUT_BATCH_MAX worker payouts in one call."""
+    results: list[dict] = [{} for _ in request.items]
+    accepted: list[int] = []
+    queued: list[tuple[str, int, str]] = []
+    
+    for i, item in enumerate(request.items):
+        try:
+            amount_cents = to_cents(item.amount_usd)
+        except ArithmeticError:
+            amount_cents = 0
+        if amount_cents <= 0:
+            results[i] = {
+                "status": "rejected",
+                "worker_ens": item.worker_ens,
+                "error": f"Invalid amount: {item.amount_usd}",
+            }
+            continue
+        accepted.append(i)
+        queued.append((item.worker_ens, amount_cents, item.destination_address))
+    
+    # Verify sufficient vault balance once, against the whole batch
+    total_cents = sum(amount_cents for _, amount_cents, _ in queued)
+    if total_cents > store.vault_balance_cents:
+        raise HTTPException(
+            status_code=402,
+            detail=(
+                f"Insufficient vault balance for batch of ${format_cents(total_cents)}. "
+                f"Available: ${format_cents(store.vault_balance_cents)}"
+            ),
+        )
+    
+    payouts = store.create_payouts_bulk(queued)
+    for i, payout in zip(accepted, payouts):
+        results[i] = {"status": "pending", "payout": payout}
+    if payouts:
+        refresh_status_cache()
+    
+    return {
+        "accepted": len(payouts),
+        "rejected": len(results) - len(payouts),
+        "total_usd": format_cents(total_cents),
+        "results": results,
+    }
+
+
 @app.post("/v1/payouts/{payout_id}/process")
 async def process_payout(payout_id: str, tx_hash: str):
     """Mark payout as processed (internal use)."""
     payout = store.process_payout(payout_id, tx_hash)
     if not payout:
         raise HTTPException(status_code=404, detail="Payout not found")
+    refresh_status_cache()
     
     return {
         "status": "completed",
@@ -470,7 +726,7 @@ async def process_payout(payout_id: str, tx_hash: str):
 @app.get("/v1/treasury/report")
 async def get_treasury_report(epoch_revenue: float = 24.80):
     """Get treasury allocation report for an epoch."""
-    report = store.get_treasury_report(Decimal(str(epoch_revenue)))
+    report = store.get_treasury_report(to_cents(epoch_revenue))
     return {
         "period": "epoch",
         **report,
@@ -478,33 +734,21 @@ async def get_treasury_report(epoch_revenue: float = 24.80):
 
 
 @app.get("/v1/treasury/allocations")
+@cache(expire=config.CACHE_TTL_ALLOCATIONS)
 async def get_allocations():
     """Get fee allocation percentages."""
-    return {
-        "work_pool_pct": float(config.WORK_POOL_PCT) * 100,
-        "readiness_pool_pct": float(config.READINESS_POOL_PCT) * 100,
-        "protocol_fee_pct": float(config.PROTOCOL_FEE_PCT) * 100,
-        "operator_fee_pct": float(config.OPERATOR_FEE_PCT) * 100,
-        "protocol_fee_recipient": config.PROTOCOL_FEE_ADDRESS,
-        "operator_fee_recipient": config.OPERATOR_FEE_ADDRESS,
-    }
+    return ALLOCATIONS
 
 
 @app.get("/v1/treasury/recipients")
+@cache(expire=config.CACHE_TTL_RECIPIENTS)
 async def get_fee_recipients():
     """Get fee recipient addresses."""
     return {
-        "protocol": {
-            "ens": config.PROTOCOL_FEE_ADDRESS,
-            "percentage": float(config.PROTOCOL_FEE_PCT) * 100,
-        },
-        "operator": {
-            "ens": config.OPERATOR_FEE_ADDRESS,
-            "percentage": float(config.OPERATOR_FEE_PCT) * 100,
-        },
+        **FEE_RECIPIENTS,
         "vault": {
             "address": config.VAULT_ADDRESS,
-            "balance_usd": str(store.vault_balance),
+            "balance_usd": format_cents(store.vault_balance_cents),
         },
     }
 
@@ -513,33 +757,40 @@ async def get_fee_recipients():
 # Worker Balances (for payout eligibility)
 # =============================================================================
 
+# In production: fetch from SwarmLedger
+# Demo data
+WORKER_BALANCES = {
+    "bee-01.swarmbee.eth": {"available": "347.30", "pending": "45.20"},
+    "bee-02.swarmbee.eth": {"available": "223.15", "pending": "38.90"},
+    "bee-03.swarmbee.eth": {"available": "112.80", "pending": "22.10"},
+    "bee-04.swarmbee.eth": {"available": "98.40", "pending": "15.60"},
+    "bee-05.swarmbee.eth": {"available": "56.20", "pending": "12.30"},
+}
+
+# Full response bodies, built once
+_BALANCE_RESPONSES = {
+    ens: {
+        "worker_ens": ens,
+        "available_usd": bal["available"],
+        "pending_usd": bal["pending"],
+        "can_withdraw": True,
+    }
+    for ens, bal in WORKER_BALANCES.items()
+}
+
+
 @app.get("/v1/workers/{worker_ens}/balance")
 async def get_worker_balance(worker_ens: str):
     """Get worker's available balance for withdrawal."""
-    # In production: fetch from SwarmLedger
-    # Demo data
-    balances = {
-        "bee-01.swarmbee.eth": {"available": "347.30", "pending": "45.20"},
-        "bee-02.swarmbee.eth": {"available": "223.15", "pending": "38.90"},
-        "bee-03.swarmbee.eth": {"available": "112.80", "pending": "22.10"},
-        "bee-04.swarmbee.eth": {"available": "98.40", "pending": "15.60"},
-        "bee-05.swarmbee.eth": {"available": "56.20", "pending": "12.30"},
-    }
-    
-    if worker_ens not in balances:
+    response = _BALANCE_RESPONSES.get(worker_ens)
+    if response is None:
         return {
             "worker_ens": worker_ens,
             "available_usd": "0.00",
             "pending_usd": "0.00",
             "message": "Worker not found or no earnings",
         }
-    
-    return {
-        "worker_ens": worker_ens,
-        "available_usd": balances[worker_ens]["available"],
-        "pending_usd": balances[worker_ens]["pending"],
-        "can_withdraw": True,
-    }
+    return response
 
 
 # =============================================================================
@@ -549,17 +800,41 @@ async def get_worker_balance(worker_ens: str):
 @app.post("/v1/epochs/{epoch_id}/settle")
 async def settle_epoch(epoch_id: str, total_revenue: float, settlements: list[dict]):
     """Settle an epoch (called by epoch sealer)."""
-    revenue = Decimal(str(total_revenue))
-    report = store.get_treasury_report(revenue)
+    report = store.get_treasury_report(to_cents(total_revenue))
     
     # In production: would execute actual settlements
-    # For now, return what would be distributed
+    # For now, return what would be distributed per settlement
+    amounts_cents = np.fromiter(
+        (to_cents(s.get("total_earned_usd", "0")) for s in settlements),
+        dtype=np.int64,
+        count=len(settlements),
+    )
+    work, ready, proto, op = split_cents(amounts_cents)
+    distributions = [
+        {
+            "worker_ens": s.get("worker_ens"),
+            "total_earned_usd": format_cents(total),
+            "work_pool_usd": format_cents(w),
+            "readiness_pool_usd": format_cents(r),
+            "protocol_fee_usd": format_cents(p),
+            "operator_fee_usd": format_cents(o),
+        }
+        for s, total, w, r, p, o in zip(
+            settlements,
+            amounts_cents.tolist(),
+            work.tolist(),
+            ready.tolist(),
+            proto.tolist(),
+            op.tolist(),
+        )
+    ]
     
     return {
         "epoch_id": epoch_id,
         "status": "settled",
         "treasury": report,
         "settlements_count": len(settlements),
+        "distributions": distributions,
         "message": "Epoch settled. Worker balances updated in SwarmLedger.",
     }
 
@@ -570,4 +845,12 @@ async def settle_epoch(epoch_id: str, total_revenue: float, settlements: list[di
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("main:app", host=config.HOST, port=config.PORT, reload=True)
+    uvicorn.run(
+        "main:app",
+        host=config.HOST,
+        port=config.PORT,
+        reload=config.DEBUG,
+        loop="uvloop",
+        http="httptools",
+        workers=config.WORKERS,
+    )
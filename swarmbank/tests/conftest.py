@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Import the service as `api.main`, the way the Dockerfile runs it
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
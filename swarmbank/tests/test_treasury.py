@@ -0,0 +1,69 @@
+"""Tests for the treasury fee split."""
+
+from decimal import Decimal
+
+import numpy as np
+
+from api.main import format_cents, split_cents, store
+
+
+AMOUNTS = list(range(0, 2001)) + [2480, 99999, 123456789]
+
+
+def report_cents(revenue_cents: int) -> tuple[int, int, int, int]:
+    report = store.get_treasury_report(revenue_cents)
+    return tuple(
+        int(report[key].replace(".", ""))
+        for key in ("work_pool_usd", "readiness_pool_usd", "protocol_fee_usd", "operator_fee_usd")
+    )
+
+
+def test_vectorized_split_matches_treasury_report():
+    work, ready, proto, op = split_cents(np.array(AMOUNTS, dtype=np.int64))
+    for i, amount in enumerate(AMOUNTS):
+        assert (work[i], ready[i], proto[i], op[i]) == report_cents(amount)
+
+
+def test_scalar_split_matches_treasury_report():
+    for amount in AMOUNTS:
+        assert split_cents(amount) == report_cents(amount)
+
+
+def test_report_totals():
+    report = store.get_treasury_report(2480)
+    assert report["total_revenue_usd"] == format_cents(2480) == "24.80"
+    assert report["total_distributed_usd"] == "24.80"
+
+
+def test_split_rounds_each_share_half_even():
+    # (revenue, work, readiness, protocol, operator) in cents
+    cases = [
+        (2, 1, 0, 0, 0),      # work 1.4
+        (5, 4, 1, 0, 0),      # work 3.5 -> 4, operator 0.25
+        (10, 7, 2, 0, 0),     # operator 0.5 -> 0
+        (25, 18, 6, 0, 1),    # work 17.5 -> 18, protocol 0.5 -> 0
+        (30, 21, 7, 1, 2),    # operator 1.5 -> 2
+        (75, 52, 17, 2, 4),   # work 52.5 -> 52, protocol 1.5 -> 2
+        (2480, 1736, 570, 50, 124),
+    ]
+    for revenue, *shares in cases:
+        assert split_cents(revenue) == tuple(shares)
+        assert report_cents(revenue) == tuple(shares)
+
+
+def test_split_matches_decimal_percentages():
+    # The original Decimal-percentage report, each share rounded with round(x, 2)
+    protocol_pct, operator_pct = Decimal("0.02"), Decimal("0.05")
+    work_pct, readiness_pct = Decimal("0.70"), Decimal("0.23")
+    for amount in AMOUNTS:
+        revenue = Decimal(amount) / 100
+        protocol_fee = revenue * protocol_pct
+        operator_fee = revenue * operator_pct
+        remaining = revenue - protocol_fee - operator_fee
+        work_pool = remaining * (work_pct / (work_pct + readiness_pct))
+        readiness_pool = remaining - work_pool
+        expected = tuple(
+            int(round(share, 2) * 100)
+            for share in (work_pool, readiness_pool, protocol_fee, operator_fee)
+        )
+        assert split_cents(amount) == expected
@@ -11,13 +11,22 @@ Provides:
 """
 
 import os
+import sys
 import time
+from collections import defaultdict
 from datetime import datetime, timezone
 from contextlib import asynccontextmanager
 from decimal import Decimal
 
+import numpy as np
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from fastapi_cache.backends.redis import RedisBackend
+from fastapi_cache.decorator import cache
+from redis import asyncio as aioredis
 from pydantic import BaseModel
 
 
@@ -31,6 +40,16 @@ class Config:
     ENS: str = "swarmbee.eth"
     VERSION: str = "1.0.0"
 
+    # Response cache: Redis when configured (shared across workers), else in-process
+    REDIS_URL: str = os.getenv("SWARMBEE_REDIS_URL", os.getenv("REDIS_URL", ""))
+    CACHE_TTL_STATS: int = 5         # seconds
+    CACHE_TTL_HARDWARE: int = 300
+
+    # Server. The worker registry is seeded static data, so extra WORKERS
+    # processes are safe; DEBUG=1 enables reload.
+    DEBUG: bool = os.getenv("DEBUG") == "1"
+    WORKERS: int = int(os.getenv("WORKERS", "1"))
+
 
 config = Config()
 
@@ -74,13 +93,20 @@ class HardwareInventory(BaseModel):
 # In-Memory Store
 # =============================================================================
 
+# Worker statuses, interned so stored values share one object each
+STATUS_ONLINE = sys.intern("online")
+STATUS_BUSY = sys.intern("busy")
+STATUS_OFFLINE = sys.intern("offline")
+STATUS_DRAINING = sys.intern("draining")
+
+
 class WorkerStore:
     def __init__(self):
         self.workers = {
             "bee-01.swarmbee.eth": {
                 "ens": "bee-01.swarmbee.eth",
                 "role": "Primary Worker",
-                "status": "online",
+                "status": STATUS_ONLINE,
                 "gpu_model": "RTX 5090",
                 "gpu_count": 8,
                 "vram_gb": 256,
@@ -94,7 +120,7 @@ class WorkerStore:
             "bee-02.swarmbee.eth": {
                 "ens": "bee-02.swarmbee.eth",
                 "role": "Inference Node",
-                "status": "busy",
+                "status": STATUS_BUSY,
                 "gpu_model": "RTX 6000 Ada",
                 "gpu_count": 8,
                 "vram_gb": 384,
@@ -108,7 +134,7 @@ class WorkerStore:
             "bee-03.swarmbee.eth": {
                 "ens": "bee-03.swarmbee.eth",
                 "role": "Batch Processor",
-                "status": "online",
+                "status": STATUS_ONLINE,
                 "gpu_model": "RTX 3090",
                 "gpu_count": 8,
                 "vram_gb": 192,
@@ -122,7 +148,7 @@ class WorkerStore:
             "bee-04.swarmbee.eth": {
                 "ens": "bee-04.swarmbee.eth",
                 "role": "Training Node",
-                "status": "online",
+                "status": STATUS_ONLINE,
                 "gpu_model": "RTX 5090",
                 "gpu_count": 8,
                 "vram_gb": 256,
@@ -136,7 +162,7 @@ class WorkerStore:
             "bee-05.swarmbee.eth": {
                 "ens": "bee-05.swarmbee.eth",
                 "role": "Medical AI",
-                "status": "busy",
+                "status": STATUS_BUSY,
                 "gpu_model": "RTX 6000 Ada",
                 "gpu_count": 8,
                 "vram_gb": 384,
@@ -154,47 +180,65 @@ class WorkerStore:
             {"gpu_model": "RTX 6000 Ada", "count": 48, "vram_per_gpu_gb": 48},
             {"gpu_model": "RTX 3090", "count": 200, "vram_per_gpu_gb": 24},
         ]
+        
+        # Inventory is static: derive rows and totals once
+        self._hardware = [
+            {
+                **h,
+                "total_vram_gb": h["count"] * h["vram_per_gpu_gb"],
+            }
+            for h in self.hardware_inventory
+        ]
+        self._hw_counts = np.array([h["count"] for h in self.hardware_inventory], dtype=np.int32)
+        self._hw_vram = np.array([h["vram_per_gpu_gb"] for h in self.hardware_inventory], dtype=np.int32)
+        self.total_gpus = int(self._hw_counts.sum())
+        self.total_vram_gb = int(self._hw_counts @ self._hw_vram)
+        
+        # The worker set is static (nothing mutates it at runtime), so status
+        # views, leaderboard order and stats are all derived once here
+        self._all_workers = list(self.workers.values())
+        self._by_status: dict[str, list[dict]] = defaultdict(list)
+        for worker in self._all_workers:
+            self._by_status[worker["status"]].append(worker)
+        
+        self._leaderboard = sorted(
+            self._all_workers, key=lambda w: w["jobs_completed"], reverse=True
+        )
+        
+        busy = len(self._by_status[STATUS_BUSY])
+        online = len(self._by_status[STATUS_ONLINE]) + busy
+        uptimes = [w["uptime_pct"] for w in self._all_workers]
+        avg_uptime = sum(uptimes) / len(uptimes) if uptimes else 0
+        
+        self._stats = {
+            "total_gpus": self.total_gpus,
+            "total_vram_tb": round(self.total_vram_gb / 1000, 1),
+            "active_workers": online,
+            "busy_workers": busy,
+            "total_jobs": sum(w["jobs_completed"] for w in self._all_workers),
+            "avg_uptime_pct": round(avg_uptime, 1),
+        }
     
     def get_all_workers(self) -> list[dict]:
-        return list(self.workers.values())
+        return self._all_workers
+    
+    def get_workers_by_status(self, status: str) -> list[dict]:
+        return self._by_status.get(status, [])
     
     def get_worker(self, ens: str) -> dict | None:
         return self.workers.get(ens)
     
     def get_online_workers(self) -> list[dict]:
-        return [w for w in self.workers.values() if w["status"] in ("online", "busy")]
+        return self._by_status[STATUS_ONLINE] + self._by_status[STATUS_BUSY]
     
     def get_stats(self) -> dict:
-        workers = list(self.workers.values())
-        online = [w for w in workers if w["status"] in ("online", "busy")]
-        busy = [w for w in workers if w["status"] == "busy"]
-        
-        total_gpus = sum(h["count"] for h in self.hardware_inventory)
-        total_vram_tb = sum(h["count"] * h["vram_per_gpu_gb"] for h in self.hardware_inventory) / 1000
-        total_jobs = sum(w["jobs_completed"] for w in workers)
-        avg_uptime = sum(w["uptime_pct"] for w in workers) / len(workers) if workers else 0
-        
-        return {
-            "total_gpus": total_gpus,
-            "total_vram_tb": round(total_vram_tb, 1),
-            "active_workers": len(online),
-            "busy_workers": len(busy),
-            "total_jobs": total_jobs,
-            "avg_uptime_pct": round(avg_uptime, 1),
-        }
+        return self._stats
     
     def get_hardware(self) -> list[dict]:
-        return [
-            {
-                **h,
-                "total_vram_gb": h["count"] * h["vram_per_gpu_gb"],
-            }
-            for h in self.hardware_inventory
-        ]
+        return self._hardware
     
     def get_leaderboard(self, limit: int = 10) -> list[dict]:
-        workers = list(self.workers.values())
-        return sorted(workers, key=lambda w: w["jobs_completed"], reverse=True)[:limit]
+        return self._leaderboard[:limit]
 
 
 store = WorkerStore()
@@ -208,6 +252,10 @@ store = WorkerStore()
 async def lifespan(app: FastAPI):
     print(f"🐝 SwarmBee API starting...")
     print(f"   ENS: {config.ENS}")
+    if config.REDIS_URL:
+        FastAPICache.init(RedisBackend(aioredis.from_url(config.REDIS_URL)), prefix="swarmbee")
+    else:
+        FastAPICache.init(InMemoryBackend(), prefix="swarmbee")
     yield
     print(f"🐝 SwarmBee API shutting down...")
 
@@ -221,6 +269,7 @@ app = FastAPI(
     description="Worker registry for SwarmOS",
     version=config.VERSION,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -253,6 +302,7 @@ async def health():
 
 
 @app.get("/v1/stats", response_model=SwarmStats)
+@cache(expire=config.CACHE_TTL_STATS)
 async def get_stats():
     """Get swarm-wide statistics."""
     return store.get_stats()
@@ -261,9 +311,10 @@ async def get_stats():
 @app.get("/v1/workers")
 async def list_workers(status: str | None = None):
     """List all workers, optionally filtered by status."""
-    workers = store.get_all_workers()
     if status:
-        workers = [w for w in workers if w["status"] == status]
+        workers = store.get_workers_by_status(status)
+    else:
+        workers = store.get_all_workers()
     return {"workers": workers, "total": len(workers)}
 
 
@@ -277,20 +328,18 @@ async def get_worker(ens: str):
 
 
 @app.get("/v1/hardware")
+@cache(expire=config.CACHE_TTL_HARDWARE)
 async def get_hardware():
     """Get hardware inventory."""
-    hardware = store.get_hardware()
-    total_gpus = sum(h["count"] for h in hardware)
-    total_vram_tb = sum(h["total_vram_gb"] for h in hardware) / 1000
-    
     return {
-        "inventory": hardware,
-        "total_gpus": total_gpus,
-        "total_vram_tb": round(total_vram_tb, 1),
+        "inventory": store.get_hardware(),
+        "total_gpus": store.total_gpus,
+        "total_vram_tb": round(store.total_vram_gb / 1000, 1),
     }
 
 
 @app.get("/v1/leaderboard")
+@cache(expire=config.CACHE_TTL_STATS)
 async def get_leaderboard(limit: int = 10):
     """Get top workers by jobs completed."""
     return {
@@ -305,4 +354,12 @@ async def get_leaderboard(limit: int = 10):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("main:app", host=config.HOST, port=config.PORT, reload=True)
+    uvicorn.run(
+        "main:app",
+        host=config.HOST,
+        port=config.PORT,
+        reload=config.DEBUG,
+        loop="uvloop",
+        http="httptools",
+        workers=config.WORKERS,
+    )
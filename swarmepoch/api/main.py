@@ -12,13 +12,21 @@ Provides:
 
 import os
 import hashlib
-import json
 from datetime import datetime, timezone
 from contextlib import asynccontextmanager
 from decimal import Decimal
+from typing import Annotated
 
-from fastapi import FastAPI, HTTPException
+import msgspec
+import orjson
+from fastapi import FastAPI, HTTPException, Depends, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from fastapi_cache.backends.redis import RedisBackend
+from fastapi_cache.decorator import cache
+from redis import asyncio as aioredis
 from pydantic import BaseModel
 
 
@@ -32,6 +40,21 @@ class Config:
     ENS: str = "swarmepoch.eth"
     VERSION: str = "1.0.0"
 
+    # Response cache: Redis when configured (shared across workers), else in-process
+    REDIS_URL: str = os.getenv("SWARMEPOCH_REDIS_URL", os.getenv("REDIS_URL", ""))
+    CACHE_TTL_EPOCHS: int = 30       # seconds
+
+    # Most receipts accepted by one /v1/verify-batch call
+    VERIFY_BATCH_MAX: int = 1024
+
+    # Archives larger than this stream /v1/epochs and /v1/index as chunked JSON
+    STREAM_MIN_EPOCHS: int = int(os.getenv("SWARMEPOCH_STREAM_MIN_EPOCHS", "500"))
+
+    # Server. Each process builds its own EpochStore (Merkle layers, receipt
+    # blobs); these are read-only after seal, so WORKERS > 1 only costs memory.
+    DEBUG: bool = os.getenv("DEBUG") == "1"
+    WORKERS: int = int(os.getenv("WORKERS", "1"))
+
 
 config = Config()
 
@@ -40,19 +63,6 @@ config = Config()
 # Schemas
 # =============================================================================
 
-class EpochSummary(BaseModel):
-    epoch_id: str
-    status: str  # active, sealing, finalized
-    jobs_count: int
-    total_revenue_usd: str
-    jobs_merkle_root: str | None
-    agents_count: int
-    clients_count: int
-    start_time: str
-    sealed_at: str | None
-    ipfs_hash: str | None
-
-
 class JobReceipt(BaseModel):
     receipt_version: str
     job_id: str
@@ -63,19 +73,148 @@ class JobReceipt(BaseModel):
     price: str
     currency: str
     timing: dict
+    hash_algo: str
     leaf_hash: str
     jobs_merkle_root: str
     merkle_proof: list[dict]
     epoch_signature_ref: str
 
 
-class VerifyRequest(BaseModel):
+# Request bodies are msgspec structs, decoded by msgspec_body()
+class VerifyRequest(msgspec.Struct):
     job_id: str
     epoch_id: str
     leaf_hash: str
     merkle_proof: list[dict]
 
 
+class VerifyBatchLeaf(msgspec.Struct):
+    job_id: str
+    leaf_hash: str
+
+
+class VerifyBatchRequest(msgspec.Struct):
+    epoch_id: str
+    leaves: Annotated[
+        list[VerifyBatchLeaf], msgspec.Meta(min_length=1, max_length=config.VERIFY_BATCH_MAX)
+    ]
+
+
+# =============================================================================
+# Money
+# =============================================================================
+
+def to_cents(amount) -> int:
+    """Parse a USD amount (str, float or Decimal) into integer cents."""
+    return int((Decimal(str(amount)) * 100).to_integral_value())
+
+
+def format_cents(cents: int) -> str:
+    sign = "-" if cents < 0 else ""
+    cents = abs(cents)
+    return f"{sign}{cents // 100}.{cents % 100:02d}"
+
+
+# =============================================================================
+# Merkle
+# =============================================================================
+
+HASH_SIZE = 32
+PAIR_SIZE = 2 * HASH_SIZE
+
+# Node hash for leaves and parents. hashlib's sha256 is OpenSSL's, which already
+# dispatches to SHA-NI / ARMv8 SHA instructions where the CPU has them. Receipts
+# carry HASH_ALGO so verifiers never have to assume it.
+HASH_ALGO = "sha256"
+node_hash = hashlib.sha256
+
+
+def merkle_layers(leaves: list[bytes]) -> list[bytes]:
+    """
+    Build Merkle layers from raw 32-byte leaf digests.
+
+    Each layer is one contiguous buffer of 32*N bytes; parents are hashed
+    straight from 64-byte slices so nodes stay raw until the root is
+    hex-encoded. An odd last node is paired with itself, as in
+    rails.crypto.signing.MerkleTree.
+    """
+    if not leaves:
+        return [node_hash(b"").digest()]
+
+    sha256 = node_hash
+    layer = b"".join(leaves)
+    layers = [layer]
+    while len(layer) > HASH_SIZE:
+        if len(layer) % PAIR_SIZE:
+            layer += layer[-HASH_SIZE:]
+        # A list, not a generator: join sizes the output buffer once. Plain
+        # 64-byte slices beat memoryview slicing or bytearray slice
+        # assignment here, since hashlib's call overhead dominates.
+        layer = b"".join([
+            sha256(layer[j:j + PAIR_SIZE]).digest()
+            for j in range(0, len(layer), PAIR_SIZE)
+        ])
+        layers.append(layer)
+    return layers
+
+
+def verify_proof(leaf: bytes, proof: list[dict], root: bytes) -> bool:
+    """Walk a receipt's merkle_proof from the leaf up and compare to the root."""
+    sha256 = node_hash
+    node = leaf
+    for step in proof:
+        sibling = bytes.fromhex(step["hash"])
+        if len(sibling) != HASH_SIZE:
+            return False
+        if step["position"] == "left":
+            node = sha256(sibling + node).digest()
+        else:
+            node = sha256(node + sibling).digest()
+    return node == root
+
+
+def merkle_multiproof(layers: list[bytes], indices: list[int]) -> list[list[tuple[int, bytes]]]:
+    """
+    Batched inclusion proof for several leaves of one tree.
+
+    Returns, per level below the root, only the sibling nodes that cannot be
+    derived from the batch's own path nodes, so shared ancestors are never
+    sent (or hashed) twice.
+    """
+    copath = []
+    known = sorted(set(indices))
+    for layer in layers[:-1]:
+        width = len(layer) // HASH_SIZE
+        on_path = set(known)
+        level = []
+        for index in known:
+            sibling = index ^ 1
+            if sibling < width and sibling not in on_path:
+                offset = sibling * HASH_SIZE
+                level.append((sibling, layer[offset:offset + HASH_SIZE]))
+        copath.append(level)
+        known = sorted({index // 2 for index in known})
+    return copath
+
+
+def multiproof_root(leaves: dict[int, bytes], copath: list[list[tuple[int, bytes]]], leaf_count: int) -> bytes:
+    """Rebuild the root from leaf digests by index plus a merkle_multiproof copath."""
+    sha256 = node_hash
+    nodes = dict(leaves)
+    width = leaf_count
+    for level in copath:
+        nodes.update(level)
+        parents = {}
+        for left_index in {index & ~1 for index in nodes}:
+            left = nodes[left_index]
+            # Odd last node is paired with itself
+            right = nodes[left_index + 1] if left_index + 1 < width else left
+            parents[left_index // 2] = sha256(left + right).digest()
+        nodes = parents
+        width = (width + 1) // 2
+    return nodes[0]
+
+
 # =============================================================================
 # Demo Data
 # =============================================================================
@@ -225,17 +364,83 @@ class EpochStore:
                 },
             ]
         }
-    
-    def get_all_epochs(self) -> list[dict]:
-        return sorted(
+        
+        # Epoch ids are append-only, so newest-first order only changes on add
+        self._epochs_desc = sorted(
             self.epochs.values(),
             key=lambda e: e["epoch_id"],
             reverse=True
         )
+        
+        # Finalized-epoch aggregates as parallel int columns, appended on finalize
+        self._finalized_revenue_cents: list[int] = []
+        self._finalized_jobs: list[int] = []
+        # Finalized epochs pinned to IPFS, newest first, for /v1/index
+        self._finalized_with_ipfs: list[dict] = []
+        for epoch in reversed(self._epochs_desc):
+            if epoch["status"] == "finalized":
+                self._record_finalized(epoch)
+        
+        # Leaf digests by job id; jobs are immutable once recorded
+        self._leaf_hashes: dict[str, bytes] = {}
+        
+        # Receipts (with their proofs) are serialized when an epoch is sealed
+        self._receipt_blobs: dict[str, bytes] = {}
+        
+        # Merkle layers per sealed epoch and each job's leaf position.
+        # Kept off the epoch dicts, which are served as JSON.
+        self._merkle_layers: dict[str, list[bytes]] = {}
+        self._leaf_index: dict[str, int] = {}
+        
+        for epoch_id in {job["epoch_id"] for job in self.jobs.values()}:
+            if self.epochs[epoch_id]["status"] == "finalized":
+                self._seal_epoch(epoch_id)
+        
+        # Finalized epochs never change: serialize once and give each a
+        # validator derived from (epoch_id, status, sealed_at)
+        self._epoch_blobs: dict[str, bytes] = {}
+        self._epoch_etags: dict[str, str] = {}
+        for epoch_id, epoch in self.epochs.items():
+            if epoch["status"] == "finalized":
+                self._epoch_blobs[epoch_id] = orjson.dumps(epoch)
+                self._epoch_etags[epoch_id] = '"%s"' % hashlib.blake2b(
+                    orjson.dumps([epoch_id, epoch["status"], epoch["sealed_at"]]),
+                    digest_size=8,
+                ).hexdigest()
+    
+    def get_all_epochs(self) -> list[dict]:
+        return self._epochs_desc
+    
+    def _record_finalized(self, epoch: dict) -> None:
+        self._finalized_revenue_cents.append(to_cents(epoch["total_revenue_usd"]))
+        self._finalized_jobs.append(epoch["jobs_count"])
+        if epoch.get("ipfs_hash"):
+            self._finalized_with_ipfs.insert(0, epoch)
+    
+    def get_finalized_with_ipfs(self) -> list[dict]:
+        return self._finalized_with_ipfs
+    
+    def get_stats(self) -> dict:
+        return {
+            "epochs_total": len(self._epochs_desc),
+            "epochs_finalized": len(self._finalized_jobs),
+            "total_jobs_archived": sum(self._finalized_jobs),
+            "total_revenue_settled_usd": format_cents(sum(self._finalized_revenue_cents)),
+            "latest_epoch": self._epochs_desc[0]["epoch_id"] if self._epochs_desc else None,
+        }
     
     def get_epoch(self, epoch_id: str) -> dict | None:
         return self.epochs.get(epoch_id)
     
+    def get_epoch_blob(self, epoch_id: str) -> bytes | None:
+        return self._epoch_blobs.get(epoch_id)
+    
+    def get_epoch_etag(self, epoch_id: str) -> str | None:
+        return self._epoch_etags.get(epoch_id)
+    
+    def get_receipt_blob(self, job: dict) -> bytes | None:
+        return self._receipt_blobs.get(job["id"])
+    
     def get_current_epoch(self) -> dict | None:
         for epoch in self.epochs.values():
             if epoch["status"] == "active":
@@ -248,23 +453,62 @@ class EpochStore:
     def get_agents(self, epoch_id: str) -> list[dict]:
         return self.agents.get(epoch_id, [])
     
+    def get_leaf_digest(self, job: dict) -> bytes:
+        digest = self._leaf_hashes.get(job["id"])
+        if digest is None:
+            leaf_data = orjson.dumps(job, option=orjson.OPT_SORT_KEYS)
+            digest = node_hash(leaf_data).digest()
+            self._leaf_hashes[job["id"]] = digest
+        return digest
+    
+    def get_leaf_hash(self, job: dict) -> str:
+        return self.get_leaf_digest(job).hex()
+    
+    def _seal_epoch(self, epoch_id: str) -> None:
+        """Build the epoch's Merkle tree and serialize every receipt once."""
+        jobs = sorted(
+            (job for job in self.jobs.values() if job["epoch_id"] == epoch_id),
+            key=lambda j: j["id"]
+        )
+        for index, job in enumerate(jobs):
+            self._leaf_index[job["id"]] = index
+        
+        layers = merkle_layers([self.get_leaf_digest(job) for job in jobs])
+        self._merkle_layers[epoch_id] = layers
+        self.epochs[epoch_id]["jobs_merkle_root"] = layers[-1].hex()
+        
+        for job in jobs:
+            self._receipt_blobs[job["id"]] = orjson.dumps(self.generate_receipt(job))
+    
+    def get_leaf_position(self, job: dict) -> int | None:
+        return self._leaf_index.get(job["id"])
+    
+    def get_merkle_layers(self, epoch_id: str) -> list[bytes] | None:
+        return self._merkle_layers.get(epoch_id)
+    
+    def get_merkle_proof(self, job: dict) -> list[dict]:
+        layers = self._merkle_layers[job["epoch_id"]]
+        index = self._leaf_index[job["id"]]
+        proof = []
+        for layer in layers[:-1]:
+            sibling = index ^ 1
+            offset = sibling * HASH_SIZE
+            if offset >= len(layer):
+                # Odd last node was paired with itself
+                offset = index * HASH_SIZE
+            proof.append({
+                "hash": layer[offset:offset + HASH_SIZE].hex(),
+                "position": "left" if sibling < index else "right",
+            })
+            index //= 2
+        return proof
+    
     def generate_receipt(self, job: dict) -> dict:
-        """Generate a receipt with mock Merkle proof."""
+        """Generate a receipt with its Merkle inclusion proof."""
         epoch = self.epochs.get(job["epoch_id"])
-        if not epoch or not epoch.get("jobs_merkle_root"):
+        if not epoch or job["epoch_id"] not in self._merkle_layers:
             return None
         
-        # Mock leaf hash
-        leaf_data = json.dumps(job, sort_keys=True).encode()
-        leaf_hash = hashlib.sha256(leaf_data).hexdigest()
-        
-        # Mock Merkle proof (in reality would be computed)
-        mock_proof = [
-            {"hash": "b4c5d6e7f8a9b0c1d2e3f4a5b6c7d8e9f0a1b2c3d4e5f6a7b8c9d0e1f2a3b4c5", "position": "right"},
-            {"hash": "c5d6e7f8a9b0c1d2e3f4a5b6c7d8e9f0a1b2c3d4e5f6a7b8c9d0e1f2a3b4c5d6", "position": "left"},
-            {"hash": "d6e7f8a9b0c1d2e3f4a5b6c7d8e9f0a1b2c3d4e5f6a7b8c9d0e1f2a3b4c5d6e7", "position": "right"},
-        ]
-        
         return {
             "receipt_version": "1.1.0",
             "job_id": job["id"],
@@ -278,9 +522,10 @@ class EpochStore:
                 "submitted_utc": job["submitted_at"],
                 "completed_utc": job["completed_at"],
             },
-            "leaf_hash": leaf_hash,
+            "hash_algo": HASH_ALGO,
+            "leaf_hash": self.get_leaf_hash(job),
             "jobs_merkle_root": epoch["jobs_merkle_root"],
-            "merkle_proof": mock_proof,
+            "merkle_proof": self.get_merkle_proof(job),
             "epoch_signature_ref": f"ipfs://{epoch.get('ipfs_hash', 'pending')}/SIGNATURE.txt",
         }
 
@@ -296,6 +541,10 @@ store = EpochStore()
 async def lifespan(app: FastAPI):
     print(f"📦 SwarmEpoch API starting...")
     print(f"   ENS: {config.ENS}")
+    if config.REDIS_URL:
+        FastAPICache.init(RedisBackend(aioredis.from_url(config.REDIS_URL)), prefix="swarmepoch")
+    else:
+        FastAPICache.init(InMemoryBackend(), prefix="swarmepoch")
     yield
     print(f"📦 SwarmEpoch API shutting down...")
 
@@ -304,13 +553,79 @@ async def lifespan(app: FastAPI):
 # FastAPI App
 # =============================================================================
 
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+msgpack_encoder = msgspec.msgpack.Encoder()
+
+
+def negotiate(request: Request, payload):
+    """Encode as msgpack for service clients that ask for it; JSON otherwise."""
+    if MSGPACK_MEDIA_TYPE in request.headers.get("accept", ""):
+        return Response(msgpack_encoder.encode(payload), media_type=MSGPACK_MEDIA_TYPE)
+    return payload
+
+
+def msgspec_body(struct_type: type[msgspec.Struct]):
+    """Dependency that decodes a JSON body with msgspec instead of Pydantic."""
+    decoder = msgspec.json.Decoder(struct_type)
+
+    async def decode_body(request: Request):
+        try:
+            return decoder.decode(await request.body())
+        except msgspec.DecodeError as exc:  # also covers ValidationError
+            raise HTTPException(status_code=422, detail=str(exc))
+
+    return decode_body
+
+
+# Schemas of msgspec request bodies, merged into the OpenAPI components by
+# openapi() below (FastAPI only documents bodies it decodes itself)
+_msgspec_components: dict[str, dict] = {}
+
+
+def msgspec_openapi(struct_type: type[msgspec.Struct]) -> dict:
+    """openapi_extra documenting the request body that msgspec_body() decodes."""
+    (schema,), components = msgspec.json.schema_components(
+        [struct_type], ref_template="#/components/schemas/{name}"
+    )
+    _msgspec_components.update(components)
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": schema}},
+        }
+    }
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match check, using the weak comparison RFC 9110 requires for it."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
 app = FastAPI(
     title="SwarmEpoch API",
     description="Immutable archive for SwarmOS epochs",
     version=config.VERSION,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
+
+def openapi() -> dict:
+    """Default schema plus the msgspec request body components."""
+    if app.openapi_schema is None:
+        schema = FastAPI.openapi(app)
+        schema.setdefault("components", {}).setdefault("schemas", {}).update(_msgspec_components)
+    return app.openapi_schema
+
+
+app.openapi = openapi
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -343,24 +658,11 @@ async def health():
 @app.get("/v1/stats")
 async def get_stats():
     """Get archive-wide statistics."""
-    epochs = store.get_all_epochs()
-    finalized = [e for e in epochs if e["status"] == "finalized"]
-    
-    total_jobs = sum(e["jobs_count"] for e in finalized)
-    total_revenue = sum(float(e["total_revenue_usd"]) for e in finalized)
-    
-    return {
-        "epochs_total": len(epochs),
-        "epochs_finalized": len(finalized),
-        "total_jobs_archived": total_jobs,
-        "total_revenue_settled_usd": f"{total_revenue:.2f}",
-        "latest_epoch": epochs[0]["epoch_id"] if epochs else None,
-    }
+    return store.get_stats()
 
 
-@app.get("/v1/epochs")
-async def list_epochs():
-    """List all epochs."""
+@cache(expire=config.CACHE_TTL_EPOCHS)
+async def epochs_listing() -> dict:
     epochs = store.get_all_epochs()
     return {
         "epochs": epochs,
@@ -368,6 +670,32 @@ async def list_epochs():
     }
 
 
+def stream_epochs(epochs: list[dict]):
+    """Yield the /v1/epochs JSON body one epoch at a time."""
+    yield b'{"epochs":['
+    for i, epoch in enumerate(epochs):
+        blob = store.get_epoch_blob(epoch["epoch_id"]) or orjson.dumps(epoch, default=str)
+        yield b"," + blob if i else blob
+    yield b'],"total":%d}' % len(epochs)
+
+
+def wants_stream(request: Request) -> bool:
+    return (
+        len(store.get_all_epochs()) > config.STREAM_MIN_EPOCHS
+        and MSGPACK_MEDIA_TYPE not in request.headers.get("accept", "")
+    )
+
+
+@app.get("/v1/epochs")
+async def list_epochs(request: Request):
+    """List all epochs."""
+    if wants_stream(request):
+        # Snapshot the list so an epoch added mid-stream can't skew "total"
+        epochs = list(store.get_all_epochs())
+        return StreamingResponse(stream_epochs(epochs), media_type="application/json")
+    return negotiate(request, await epochs_listing())
+
+
 @app.get("/v1/epochs/current")
 async def get_current_epoch():
     """Get current active epoch."""
@@ -378,8 +706,15 @@ async def get_current_epoch():
 
 
 @app.get("/v1/epochs/{epoch_id}")
-async def get_epoch(epoch_id: str):
+async def get_epoch(epoch_id: str, request: Request):
     """Get epoch details."""
+    blob = store.get_epoch_blob(epoch_id)
+    if blob is not None:
+        etag = store.get_epoch_etag(epoch_id)
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        return Response(content=blob, media_type="application/json", headers={"ETag": etag})
+    
     epoch = store.get_epoch(epoch_id)
     if not epoch:
         raise HTTPException(status_code=404, detail="Epoch not found")
@@ -424,22 +759,24 @@ async def get_epoch_ipfs(epoch_id: str):
     }
 
 
-@app.get("/v1/jobs/{job_id}/receipt", response_model=JobReceipt)
+# Receipts are stored pre-serialized; JobReceipt only documents their shape
+@app.get("/v1/jobs/{job_id}/receipt", responses={200: {"model": JobReceipt}})
 async def get_job_receipt(job_id: str):
     """Get job receipt with Merkle proof."""
     job = store.get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    receipt = store.generate_receipt(job)
-    if not receipt:
+    # Every job of a finalized epoch got its blob in _seal_epoch
+    blob = store.get_receipt_blob(job)
+    if blob is None:
         raise HTTPException(status_code=404, detail="Receipt not available (epoch not sealed)")
     
-    return receipt
+    return Response(content=blob, media_type="application/json")
 
 
-@app.post("/v1/verify")
-async def verify_receipt(request: VerifyRequest):
+@app.post("/v1/verify", openapi_extra=msgspec_openapi(VerifyRequest))
+async def verify_receipt(request: VerifyRequest = Depends(msgspec_body(VerifyRequest))):
     """Verify a job receipt against epoch Merkle root."""
     epoch = store.get_epoch(request.epoch_id)
     if not epoch:
@@ -448,8 +785,20 @@ async def verify_receipt(request: VerifyRequest):
     if not epoch.get("jobs_merkle_root"):
         return {"valid": False, "error": "Epoch not sealed"}
     
-    # In production: actually verify the Merkle proof
-    # For demo: simulate verification
+    job = store.get_job(request.job_id)
+    if not job or job["epoch_id"] != request.epoch_id:
+        return {"valid": False, "error": "Job not in epoch"}
+    
+    leaf = store.get_leaf_digest(job)
+    if request.leaf_hash != leaf.hex():
+        return {"valid": False, "error": "Leaf hash mismatch"}
+    
+    try:
+        valid = verify_proof(leaf, request.merkle_proof, bytes.fromhex(epoch["jobs_merkle_root"]))
+    except (KeyError, TypeError, ValueError):
+        valid = False
+    if not valid:
+        return {"valid": False, "error": "Merkle proof does not match epoch root"}
     
     return {
         "valid": True,
@@ -460,28 +809,112 @@ async def verify_receipt(request: VerifyRequest):
     }
 
 
-@app.get("/v1/index")
-async def get_index():
-    """Get epoch index (for SwarmOrb)."""
+@app.post("/v1/verify-batch", openapi_extra=msgspec_openapi(VerifyBatchRequest))
+async def verify_receipts_batch(
+    request: VerifyBatchRequest = Depends(msgspec_body(VerifyBatchRequest)),
+):
+    """Verify several receipts of one epoch with a single shared Merkle proof."""
+    epoch = store.get_epoch(request.epoch_id)
+    if not epoch:
+        return {"valid": False, "error": "Epoch not found"}
+    
+    if epoch["status"] != "finalized":
+        return {"valid": False, "error": "Epoch not sealed"}
+    
+    # Layers are only built for epochs with jobs
+    layers = store.get_merkle_layers(request.epoch_id)
+    if layers is None:
+        return {"valid": False, "error": "Epoch has no jobs"}
+    
+    # The root is rebuilt from the client's leaf hashes, so a tampered
+    # receipt fails here or at the root comparison below
+    leaves: dict[int, bytes] = {}
+    positions: dict[str, int] = {}
+    for item in request.leaves:
+        job = store.get_job(item.job_id)
+        if not job or job["epoch_id"] != request.epoch_id:
+            return {"valid": False, "error": f"Job not in epoch: {item.job_id}"}
+        if item.leaf_hash != store.get_leaf_digest(job).hex():
+            return {"valid": False, "error": f"Leaf hash mismatch: {item.job_id}"}
+        index = store.get_leaf_position(job)
+        leaves[index] = bytes.fromhex(item.leaf_hash)
+        positions[item.job_id] = index
+    
+    copath = merkle_multiproof(layers, list(leaves))
+    root = multiproof_root(leaves, copath, len(layers[0]) // HASH_SIZE)
+    
+    return {
+        "valid": root.hex() == epoch["jobs_merkle_root"],
+        "epoch_id": request.epoch_id,
+        "epoch_merkle_root": epoch["jobs_merkle_root"],
+        "hash_algo": HASH_ALGO,
+        "leaf_count": len(layers[0]) // HASH_SIZE,
+        "leaves": [
+            {"job_id": job_id, "index": index, "leaf_hash": leaves[index].hex()}
+            for job_id, index in sorted(positions.items(), key=lambda item: item[1])
+        ],
+        "inner_copath": [
+            [{"index": index, "hash": node.hex()} for index, node in level]
+            for level in copath
+        ],
+        "verified_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+@cache(expire=config.CACHE_TTL_EPOCHS)
+async def index_payload() -> dict:
     epochs = store.get_all_epochs()
-    finalized = [e for e in epochs if e["status"] == "finalized" and e.get("ipfs_hash")]
+    current = store.get_current_epoch()
     
     return {
         "version": "1.1.0",
         "latest_epoch": epochs[0]["epoch_id"] if epochs else None,
-        "current_epoch": store.get_current_epoch()["epoch_id"] if store.get_current_epoch() else None,
+        "current_epoch": current["epoch_id"] if current else None,
         "epochs": {
             e["epoch_id"]: f"ipfs://{e['ipfs_hash']}/"
-            for e in finalized
+            for e in store.get_finalized_with_ipfs()
         },
         "generated_at": datetime.now(timezone.utc).isoformat(),
     }
 
 
+def stream_index(epochs: list[dict], finalized: list[dict], current: dict | None):
+    """Yield the /v1/index JSON body one epoch URI at a time."""
+    yield orjson.dumps({
+        "version": "1.1.0",
+        "latest_epoch": epochs[0]["epoch_id"] if epochs else None,
+        "current_epoch": current["epoch_id"] if current else None,
+    })[:-1] + b',"epochs":{'
+    for i, e in enumerate(finalized):
+        pair = orjson.dumps(e["epoch_id"]) + b":" + orjson.dumps(f"ipfs://{e['ipfs_hash']}/")
+        yield b"," + pair if i else pair
+    yield b'},"generated_at":' + orjson.dumps(datetime.now(timezone.utc).isoformat()) + b"}"
+
+
+@app.get("/v1/index")
+async def get_index(request: Request):
+    """Get epoch index (for SwarmOrb)."""
+    if wants_stream(request):
+        epochs = list(store.get_all_epochs())
+        return StreamingResponse(
+            stream_index(epochs, list(store.get_finalized_with_ipfs()), store.get_current_epoch()),
+            media_type="application/json",
+        )
+    return negotiate(request, await index_payload())
+
+
 # =============================================================================
 # Main
 # =============================================================================
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("main:app", host=config.HOST, port=config.PORT, reload=True)
+    uvicorn.run(
+        "main:app",
+        host=config.HOST,
+        port=config.PORT,
+        reload=config.DEBUG,
+        loop="uvloop",
+        http="httptools",
+        workers=config.WORKERS,
+    )
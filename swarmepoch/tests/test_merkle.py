@@ -0,0 +1,85 @@
+"""Tests for the Merkle layer builder and batched (multi-leaf) proofs."""
+
+import hashlib
+import itertools
+
+import pytest
+
+from api.main import (
+    HASH_SIZE, merkle_layers, merkle_multiproof, multiproof_root, verify_proof,
+)
+
+
+def make_leaves(count: int) -> list[bytes]:
+    return [hashlib.sha256(f"job-{i}".encode()).digest() for i in range(count)]
+
+
+def leaf_at(layers: list[bytes], index: int) -> bytes:
+    return layers[0][index * HASH_SIZE:(index + 1) * HASH_SIZE]
+
+
+def single_proof(layers: list[bytes], index: int) -> list[dict]:
+    """Receipt-style path proof, odd last node paired with itself."""
+    proof = []
+    for layer in layers[:-1]:
+        width = len(layer) // HASH_SIZE
+        sibling = index ^ 1 if (index ^ 1) < width else index
+        proof.append({
+            "hash": layer[sibling * HASH_SIZE:(sibling + 1) * HASH_SIZE].hex(),
+            "position": "left" if index & 1 else "right",
+        })
+        index //= 2
+    return proof
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 4, 5, 7, 8, 9, 16, 17])
+def test_layers_match_path_proofs(count):
+    layers = merkle_layers(make_leaves(count))
+    root = layers[-1]
+    assert len(root) == HASH_SIZE
+    for index in range(count):
+        assert verify_proof(leaf_at(layers, index), single_proof(layers, index), root)
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 5, 6, 7, 8])
+def test_multiproof_root_every_subset(count):
+    layers = merkle_layers(make_leaves(count))
+    for size in range(1, count + 1):
+        for indices in itertools.combinations(range(count), size):
+            copath = merkle_multiproof(layers, list(indices))
+            leaves = {index: leaf_at(layers, index) for index in indices}
+            assert multiproof_root(leaves, copath, count) == layers[-1]
+
+
+@pytest.mark.parametrize("count", [9, 16, 17, 33])
+def test_multiproof_root_larger_trees(count):
+    layers = merkle_layers(make_leaves(count))
+    for indices in ([0], [count - 1], [0, count - 1], list(range(0, count, 3))):
+        copath = merkle_multiproof(layers, indices)
+        leaves = {index: leaf_at(layers, index) for index in indices}
+        assert multiproof_root(leaves, copath, count) == layers[-1]
+
+
+def test_multiproof_skips_derivable_siblings():
+    layers = merkle_layers(make_leaves(8))
+    
+    # Siblings 0/1 and their parents 0/1 are both in the batch
+    copath = merkle_multiproof(layers, [0, 1, 2, 3])
+    assert copath[0] == []
+    assert copath[1] == []
+    assert [index for index, _ in copath[2]] == [1]
+    
+    # Every leaf: nothing to send
+    assert all(level == [] for level in merkle_multiproof(layers, list(range(8))))
+
+
+def test_multiproof_duplicate_indices():
+    layers = merkle_layers(make_leaves(5))
+    assert merkle_multiproof(layers, [3, 3, 1]) == merkle_multiproof(layers, [1, 3])
+
+
+def test_multiproof_rejects_tampered_leaf():
+    layers = merkle_layers(make_leaves(6))
+    copath = merkle_multiproof(layers, [1, 4])
+    leaves = {1: leaf_at(layers, 1), 4: hashlib.sha256(b"forged").digest()}
+    assert multiproof_root(leaves, copath, 6) != layers[-1]
@@ -11,12 +11,17 @@ Provides:
 """
 
 import os
+import hashlib
+from collections import defaultdict
 from datetime import datetime, timezone
 from contextlib import asynccontextmanager
+from types import MappingProxyType
 
-from fastapi import FastAPI, HTTPException
+import msgspec
+import orjson
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse
 
 
 # =============================================================================
@@ -29,6 +34,11 @@ class Config:
     ENS: str = "swarmhive.eth"
     VERSION: str = "1.0.0"
 
+    # Server. The model catalog is static, so WORKERS > 1 is safe; DEBUG=1
+    # enables reload.
+    DEBUG: bool = os.getenv("DEBUG") == "1"
+    WORKERS: int = int(os.getenv("WORKERS", "1"))
+
 
 config = Config()
 
@@ -37,14 +47,14 @@ config = Config()
 # Schemas
 # =============================================================================
 
-class ModelSpecs(BaseModel):
+class ModelSpecs(msgspec.Struct):
     vram_gb: int
     inference_seconds: float
     input_formats: list[str]
     output_formats: list[str]
 
 
-class ModelPerformance(BaseModel):
+class ModelPerformance(msgspec.Struct, kw_only=True):
     accuracy: float
     sensitivity: float | None = None
     specificity: float | None = None
@@ -52,13 +62,13 @@ class ModelPerformance(BaseModel):
     training_samples: int
 
 
-class ModelWeights(BaseModel):
+class ModelWeights(msgspec.Struct, kw_only=True):
     huggingface: str | None = None
     ipfs: str | None = None
     container: str
 
 
-class ModelCard(BaseModel):
+class ModelCard(msgspec.Struct):
     id: str
     name: str
     version: str
@@ -407,6 +417,10 @@ MODELS = {
     },
 }
 
+# The catalog is fixed at import and every precomputed response below is
+# derived from it, so expose it read-only
+MODELS = MappingProxyType(MODELS)
+
 # Infrastructure
 INFRASTRUCTURE = {
     "gpus": [
@@ -423,6 +437,106 @@ INFRASTRUCTURE = {
 }
 
 
+# =============================================================================
+# Precomputed Responses
+# =============================================================================
+
+# The catalog is static, so every derived response body is serialized once
+
+# Catalog indexes, in MODELS order
+_BY_CATEGORY: dict[str, list[dict]] = defaultdict(list)
+_BY_STATUS: dict[str, list[dict]] = defaultdict(list)
+for _model in MODELS.values():
+    _BY_CATEGORY[_model["category"]].append(_model)
+    _BY_STATUS[_model["status"]].append(_model)
+_IDS_BY_STATUS = {status: {m["id"] for m in models} for status, models in _BY_STATUS.items()}
+
+_MODEL_CATEGORIES = list(_BY_CATEGORY)
+_MODEL_STATUSES = list(_BY_STATUS)
+
+_MEDICAL_MODELS = _BY_CATEGORY["medical"]
+_AVG_ACCURACY = sum(m["performance"]["accuracy"] for m in _MEDICAL_MODELS) / len(_MEDICAL_MODELS)
+
+
+def _build_categories() -> dict:
+    return {
+        "categories": {
+            cat: {"count": len(models), "models": [m["id"] for m in models]}
+            for cat, models in _BY_CATEGORY.items()
+        }
+    }
+
+
+def _filter_models(category: str | None, status: str | None) -> dict:
+    if category is None:
+        models = _BY_STATUS[status] if status else list(MODELS.values())
+    elif status is None:
+        models = _BY_CATEGORY[category]
+    else:
+        ids = _IDS_BY_STATUS[status]
+        models = [m for m in _BY_CATEGORY[category] if m["id"] in ids]
+    return {"models": models, "total": len(models)}
+
+
+# list_models payloads for every (category, status) filter, None meaning unfiltered
+_LIST_MODELS = {
+    (category, status): _filter_models(category, status)
+    for category in (None, *_MODEL_CATEGORIES)
+    for status in (None, *_MODEL_STATUSES)
+}
+_LIST_MODELS_BYTES = {key: orjson.dumps(payload) for key, payload in _LIST_MODELS.items()}
+_LIST_MODELS_MSGPACK = {key: msgspec.msgpack.encode(payload) for key, payload in _LIST_MODELS.items()}
+_NO_MODELS = {"models": [], "total": 0}
+_NO_MODELS_BYTES = orjson.dumps(_NO_MODELS)
+_NO_MODELS_MSGPACK = msgspec.msgpack.encode(_NO_MODELS)
+
+_MODEL_BYTES = {model_id: orjson.dumps(model) for model_id, model in MODELS.items()}
+_WEIGHTS_BYTES = {
+    model_id: orjson.dumps({
+        "model_id": model_id,
+        "version": model["version"],
+        "weights": model["weights"],
+        "license": model["license"],
+    })
+    for model_id, model in MODELS.items()
+}
+_CATEGORIES_BYTES = orjson.dumps(_build_categories())
+_INFRA_BYTES = orjson.dumps(INFRASTRUCTURE)
+
+_BENCHMARKS = sorted(
+    (
+        {
+            "model_id": model["id"],
+            "name": model["name"],
+            "version": model["version"],
+            "status": model["status"],
+            "accuracy": model["performance"]["accuracy"],
+            "inference_seconds": model["specs"]["inference_seconds"],
+            "vram_gb": model["specs"]["vram_gb"],
+        }
+        for model in _MEDICAL_MODELS
+    ),
+    key=lambda x: x["accuracy"],
+    reverse=True,
+)
+
+_STATS_BYTES = orjson.dumps({
+    "total_models": len(MODELS),
+    "medical_models": len(_MEDICAL_MODELS),
+    "llm_models": len(_BY_CATEGORY["llm"]),
+    "production_models": len(_BY_STATUS["production"]),
+    "total_gpus": INFRASTRUCTURE["totals"]["gpu_count"],
+    "total_vram_tb": INFRASTRUCTURE["totals"]["total_vram_tb"],
+    "avg_accuracy": _AVG_ACCURACY,
+})
+
+# Strong validator for everything derived from the registry, which is fixed for
+# the life of the process
+_REGISTRY_ETAG = '"%s"' % hashlib.blake2b(
+    orjson.dumps([dict(MODELS), INFRASTRUCTURE]), digest_size=8
+).hexdigest()
+
+
 # =============================================================================
 # Lifespan
 # =============================================================================
@@ -440,11 +554,61 @@ async def lifespan(app: FastAPI):
 # FastAPI App
 # =============================================================================
 
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+msgpack_encoder = msgspec.msgpack.Encoder()
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match check, using the weak comparison RFC 9110 requires for it."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+def json_bytes(body: bytes, etag: str | None = None) -> Response:
+    headers = {"ETag": etag} if etag else None
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def negotiate(
+    request: Request,
+    payload,
+    json_body: bytes | None = None,
+    etag: str | None = None,
+    msgpack_body: bytes | None = None,
+):
+    """Encode as msgpack for service clients that ask for it; JSON otherwise."""
+    use_msgpack = MSGPACK_MEDIA_TYPE in request.headers.get("accept", "")
+    if etag is not None:
+        if use_msgpack:
+            # Each representation gets its own validator
+            etag = etag[:-1] + '-msgpack"'
+        if etag_matches(request, etag):
+            return not_modified(etag)
+    headers = {"ETag": etag, "Vary": "Accept"} if etag else None
+    if use_msgpack:
+        if msgpack_body is None:
+            msgpack_body = msgpack_encoder.encode(payload)
+        return Response(msgpack_body, media_type=MSGPACK_MEDIA_TYPE, headers=headers)
+    if json_body is not None:
+        return Response(content=json_body, media_type="application/json", headers=headers)
+    return payload
+
+
 app = FastAPI(
     title="SwarmHive API",
     description="Model Registry for SwarmOS - Sovereign AI Models",
     version=config.VERSION,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -478,19 +642,16 @@ async def health():
 
 
 @app.get("/v1/models")
-async def list_models(category: str = None, status: str = None):
+async def list_models(request: Request, category: str = None, status: str = None):
     """List all models in the registry."""
-    models = list(MODELS.values())
-    
-    if category:
-        models = [m for m in models if m["category"] == category]
-    if status:
-        models = [m for m in models if m["status"] == status]
-    
-    return {
-        "models": models,
-        "total": len(models),
-    }
+    key = (category or None, status or None)
+    return negotiate(
+        request,
+        _LIST_MODELS.get(key, _NO_MODELS),
+        _LIST_MODELS_BYTES.get(key, _NO_MODELS_BYTES),
+        _REGISTRY_ETAG,
+        _LIST_MODELS_MSGPACK.get(key, _NO_MODELS_MSGPACK),
+    )
 
 
 @app.get("/v1/models/{model_id}")
@@ -498,7 +659,7 @@ async def get_model(model_id: str):
     """Get specific model details."""
     if model_id not in MODELS:
         raise HTTPException(status_code=404, detail="Model not found")
-    return MODELS[model_id]
+    return json_bytes(_MODEL_BYTES[model_id])
 
 
 @app.get("/v1/models/{model_id}/weights")
@@ -506,34 +667,21 @@ async def get_model_weights(model_id: str):
     """Get model weight locations."""
     if model_id not in MODELS:
         raise HTTPException(status_code=404, detail="Model not found")
-    
-    model = MODELS[model_id]
-    return {
-        "model_id": model_id,
-        "version": model["version"],
-        "weights": model["weights"],
-        "license": model["license"],
-    }
+    return json_bytes(_WEIGHTS_BYTES[model_id])
 
 
 @app.get("/v1/categories")
-async def list_categories():
+async def list_categories(request: Request):
     """List model categories."""
-    categories = {}
-    for model in MODELS.values():
-        cat = model["category"]
-        if cat not in categories:
-            categories[cat] = {"count": 0, "models": []}
-        categories[cat]["count"] += 1
-        categories[cat]["models"].append(model["id"])
-    
-    return {"categories": categories}
+    if etag_matches(request, _REGISTRY_ETAG):
+        return not_modified(_REGISTRY_ETAG)
+    return json_bytes(_CATEGORIES_BYTES, _REGISTRY_ETAG)
 
 
 @app.get("/v1/categories/{category}")
 async def get_category(category: str):
     """Get models in a category."""
-    models = [m for m in MODELS.values() if m["category"] == category]
+    models = _BY_CATEGORY.get(category)
     if not models:
         raise HTTPException(status_code=404, detail="Category not found")
     
@@ -545,49 +693,30 @@ async def get_category(category: str):
 
 
 @app.get("/v1/infrastructure")
-async def get_infrastructure():
+async def get_infrastructure(request: Request):
     """Get GPU infrastructure status."""
-    return INFRASTRUCTURE
+    if etag_matches(request, _REGISTRY_ETAG):
+        return not_modified(_REGISTRY_ETAG)
+    return json_bytes(_INFRA_BYTES, _REGISTRY_ETAG)
 
 
 @app.get("/v1/benchmarks")
-async def get_benchmarks():
+async def get_benchmarks(request: Request):
     """Get model performance benchmarks."""
-    benchmarks = []
-    for model in MODELS.values():
-        if model["category"] == "medical":
-            benchmarks.append({
-                "model_id": model["id"],
-                "name": model["name"],
-                "version": model["version"],
-                "status": model["status"],
-                "accuracy": model["performance"]["accuracy"],
-                "inference_seconds": model["specs"]["inference_seconds"],
-                "vram_gb": model["specs"]["vram_gb"],
-            })
-    
-    return {
-        "benchmarks": sorted(benchmarks, key=lambda x: x["accuracy"], reverse=True),
-        "updated_at": datetime.now(timezone.utc).isoformat(),
-    }
+    # Weak: the benchmarks are fixed but updated_at is not
+    etag = "W/" + _REGISTRY_ETAG
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return ORJSONResponse(
+        {"benchmarks": _BENCHMARKS, "updated_at": datetime.now(timezone.utc).isoformat()},
+        headers={"ETag": etag},
+    )
 
 
 @app.get("/v1/stats")
 async def get_stats():
     """Get registry statistics."""
-    medical = [m for m in MODELS.values() if m["category"] == "medical"]
-    llm = [m for m in MODELS.values() if m["category"] == "llm"]
-    production = [m for m in MODELS.values() if m["status"] == "production"]
-    
-    return {
-        "total_models": len(MODELS),
-        "medical_models": len(medical),
-        "llm_models": len(llm),
-        "production_models": len(production),
-        "total_gpus": INFRASTRUCTURE["totals"]["gpu_count"],
-        "total_vram_tb": INFRASTRUCTURE["totals"]["total_vram_tb"],
-        "avg_accuracy": sum(m["performance"]["accuracy"] for m in medical) / len(medical),
-    }
+    return json_bytes(_STATS_BYTES)
 
 
 # =============================================================================
@@ -596,4 +725,12 @@ async def get_stats():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("main:app", host=config.HOST, port=config.PORT, reload=True)
+    uvicorn.run(
+        "main:app",
+        host=config.HOST,
+        port=config.PORT,
+        reload=config.DEBUG,
+        loop="uvloop",
+        http="httptools",
+        workers=config.WORKERS,
+    )
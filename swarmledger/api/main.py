@@ -13,14 +13,25 @@ Responsibilities:
 
 import os
 import time
+import asyncio
+import hashlib
+from bisect import bisect_left
+from collections import defaultdict, deque
 from datetime import datetime, timezone
 from decimal import Decimal
-from contextlib import asynccontextmanager
+from contextlib import AsyncExitStack, asynccontextmanager
 from typing import Optional
 
-from fastapi import FastAPI, HTTPException, Depends
+import msgspec
+from fastapi import FastAPI, HTTPException, Depends, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.responses import ORJSONResponse
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from fastapi_cache.backends.redis import RedisBackend
+from fastapi_cache.decorator import cache
+from redis import asyncio as aioredis
+from sqlalchemy import BigInteger, Column, Integer, MetaData, String, Table, create_engine
 
 
 # =============================================================================
@@ -44,6 +55,25 @@ class Config:
     
     VERSION: str = "1.0.0"
 
+    # Response cache: Redis when configured (shared across workers), else in-process
+    REDIS_URL: str = os.getenv("LEDGER_REDIS_URL", os.getenv("REDIS_URL", ""))
+    CACHE_TTL_STATS: int = 3         # seconds
+
+    # Transactions kept per account for history reads (oldest are trimmed)
+    TX_HISTORY_MAX: int = int(os.getenv("LEDGER_TX_HISTORY_MAX", "10000"))
+
+    # Ledger-wide tail kept in memory; every transaction is also flushed to
+    # DATABASE_URL in batches by a background writer (off with LEDGER_TX_WAL=0)
+    TX_HOT_MAX: int = int(os.getenv("LEDGER_TX_HOT_MAX", "10000"))
+    TX_WAL: bool = os.getenv("LEDGER_TX_WAL", "1") == "1"
+    TX_FLUSH_BATCH: int = 1000
+    TX_FLUSH_INTERVAL: float = 0.1   # seconds
+
+    # Server. Balances live in this process's LedgerStore, so keep WORKERS=1:
+    # a second process would accept reserves against its own copy.
+    DEBUG: bool = os.getenv("DEBUG") == "1"
+    WORKERS: int = int(os.getenv("WORKERS", "1"))
+
 
 config = Config()
 
@@ -52,7 +82,7 @@ config = Config()
 # Models
 # =============================================================================
 
-class Account(BaseModel):
+class Account(msgspec.Struct):
     ens: str
     account_type: str  # client, worker, treasury
     balance_usd: Decimal = Decimal("0")
@@ -62,7 +92,7 @@ class Account(BaseModel):
     total_out_usd: Decimal = Decimal("0")
 
 
-class Transaction(BaseModel):
+class Transaction(msgspec.Struct, kw_only=True):
     id: str
     account_ens: str
     tx_type: str  # DEPOSIT, JOB_CHARGE, EARNING, PAYOUT, REFUND
@@ -78,7 +108,7 @@ class Transaction(BaseModel):
 # Request/Response Schemas
 # =============================================================================
 
-class BalanceResponse(BaseModel):
+class BalanceResponse(msgspec.Struct):
     ens: str
     account_type: str
     balance_usd: str
@@ -89,36 +119,36 @@ class BalanceResponse(BaseModel):
     total_out_usd: str
 
 
-class ReserveFundsRequest(BaseModel):
+class ReserveFundsRequest(msgspec.Struct):
     amount_usd: str
     job_id: str
 
 
-class ChargeFundsRequest(BaseModel):
+class ChargeFundsRequest(msgspec.Struct):
     amount_usd: str
     job_id: str
 
 
-class CreditEarningsRequest(BaseModel):
+class CreditEarningsRequest(msgspec.Struct):
     amount_usd: str
     job_id: str
     pending: bool = True
 
 
-class DepositRequest(BaseModel):
+class DepositRequest(msgspec.Struct):
     client_ens: str
     amount_usd: str
     eth_tx_hash: str
 
 
-class WithdrawalRequest(BaseModel):
+class WithdrawalRequest(msgspec.Struct):
     worker_ens: str
     amount_usd: str
     destination_address: str
     signature: str
 
 
-class EpochSealRequest(BaseModel):
+class EpochSealRequest(msgspec.Struct):
     epoch_id: str
     jobs_merkle_root: str
     jobs_count: int
@@ -127,35 +157,122 @@ class EpochSealRequest(BaseModel):
     signature: str
 
 
-class TransactionHistoryResponse(BaseModel):
+class TransactionHistoryResponse(msgspec.Struct):
     account_ens: str
     transactions: list[dict]
     total_count: int
 
 
+def struct_response(obj: msgspec.Struct) -> Response:
+    """Encode a response struct directly, skipping FastAPI's jsonable_encoder."""
+    return Response(content=msgspec.json.encode(obj), media_type="application/json")
+
+
+def msgspec_body(struct_type: type[msgspec.Struct]):
+    """Dependency that decodes a JSON body with msgspec instead of Pydantic."""
+    decoder = msgspec.json.Decoder(struct_type)
+
+    async def decode_body(request: Request):
+        try:
+            return decoder.decode(await request.body())
+        except msgspec.DecodeError as exc:  # also covers ValidationError
+            raise HTTPException(status_code=422, detail=str(exc))
+
+    return decode_body
+
+
+# Schemas of msgspec request bodies, merged into the OpenAPI components by
+# openapi() below (FastAPI only documents bodies it decodes itself)
+_msgspec_components: dict[str, dict] = {}
+
+
+def msgspec_openapi(struct_type: type[msgspec.Struct]) -> dict:
+    """openapi_extra documenting the request body that msgspec_body() decodes."""
+    (schema,), components = msgspec.json.schema_components(
+        [struct_type], ref_template="#/components/schemas/{name}"
+    )
+    _msgspec_components.update(components)
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": schema}},
+        }
+    }
+
+
+# =============================================================================
+# Money
+# =============================================================================
+
+def to_cents(amount) -> int:
+    """Parse a USD amount (str, float or Decimal) into integer cents."""
+    return int((Decimal(str(amount)) * 100).to_integral_value())
+
+
+def format_cents(cents: int) -> str:
+    sign = "-" if cents < 0 else ""
+    cents = abs(cents)
+    return f"{sign}{cents // 100}.{cents % 100:02d}"
+
+
+def format_ns(ns: int) -> str:
+    """ISO-8601 UTC (microsecond precision) for a time.time_ns() value."""
+    seconds, rem = divmod(ns, 1_000_000_000)
+    return datetime.fromtimestamp(seconds, timezone.utc).replace(microsecond=rem // 1000).isoformat()
+
+
 # =============================================================================
 # In-Memory Store (Would be DB in production)
 # =============================================================================
 
 class LedgerStore:
+    """Account amounts are integer cents; they become strings only in responses."""
+    
     def __init__(self):
         self.accounts: dict[str, dict] = {}
-        self.transactions: list[dict] = []
+        self.transactions: deque[dict] = deque(maxlen=config.TX_HOT_MAX)
+        self._tx_pending: list[dict] = []  # recorded, not yet flushed to the DB
         self.deposits: list[dict] = []
         self.withdrawals: list[dict] = []
         self.epochs: dict[str, dict] = {}
         self.tx_counter = 0
         
+        # Per-account history in insertion order with a parallel column of
+        # non-decreasing time_ns keys, so reads seek by bisect instead of scanning
+        self._by_account: dict[str, list[dict]] = defaultdict(list)
+        self._by_account_times: dict[str, list[int]] = defaultdict(list)
+        self._tx_counts: dict[str, int] = defaultdict(int)
+        
+        # One lock per existing account (made in _init_account) around balance
+        # read-modify-write sections. Forward-looking: those sections hold no
+        # await yet, so the locks only matter once one adds a DB or chain call.
+        # Only created for real accounts, so probes of unknown ENS add nothing.
+        self.locks: dict[str, asyncio.Lock] = {}
+        
+        # Lookup indexes over deposits and withdrawals, filled on insert
+        self._deposits_by_client: dict[str, list[dict]] = defaultdict(list)
+        self._withdrawals_by_id: dict[str, dict] = {}
+        
+        # Running aggregates for /v1/stats, kept in step by adjust_balance()
+        # and seal_epoch rather than re-summed per request
+        self.balance_totals: dict[str, int] = defaultdict(int)  # by account_type
+        self.epochs_finalized = 0
+        
+        # Sealed epochs never change, so their JSON is encoded once at seal
+        # time; the /v1/epochs body is cached until the next seal
+        self._epoch_blobs: dict[str, bytes] = {}
+        self._epochs_list_blob: Optional[bytes] = None
+        
         # Initialize treasury accounts
         self._init_account("swarmbank.eth", "treasury")
         self._init_account("bee23.eth", "treasury")  # Protocol
         self._init_account("swarmos.eth", "treasury")  # Operator
         
         # Demo data
-        self._init_account("xyzclinic.clientswarm.eth", "client", balance=Decimal("245.00"))
-        self._init_account("acme.clientswarm.eth", "client", balance=Decimal("1240.00"))
-        self._init_account("bee-01.swarmbee.eth", "worker", balance=Decimal("847.30"))
-        self._init_account("bee-02.swarmbee.eth", "worker", balance=Decimal("623.15"))
+        self._init_account("xyzclinic.clientswarm.eth", "client", balance=24500)
+        self._init_account("acme.clientswarm.eth", "client", balance=124000)
+        self._init_account("bee-01.swarmbee.eth", "worker", balance=84730)
+        self._init_account("bee-02.swarmbee.eth", "worker", balance=62315)
         
         # Demo epochs
         self.epochs["epoch-001"] = {
@@ -182,68 +299,256 @@ class LedgerStore:
             "total_revenue_usd": "6.70",
             "sealed_at": None,
         }
+        self.epochs_finalized = sum(1 for e in self.epochs.values() if e["status"] == "finalized")
+        for epoch_id, epoch in self.epochs.items():
+            if epoch["status"] == "finalized":
+                self.freeze_epoch(epoch_id)
     
     def _init_account(
         self,
         ens: str,
         account_type: str,
-        balance: Decimal = Decimal("0")
-    ):
-        self.accounts[ens] = {
+        balance: int = 0
+    ) -> dict:
+        account = self.accounts[ens] = {
             "ens": ens,
             "account_type": account_type,
             "balance_usd": balance,
-            "reserved_usd": Decimal("0"),
-            "pending_usd": Decimal("0"),
+            "reserved_usd": 0,
+            "pending_usd": 0,
             "total_in_usd": balance,
-            "total_out_usd": Decimal("0"),
+            "total_out_usd": 0,
         }
+        self.balance_totals[account_type] += balance
+        self.locks[ens] = asyncio.Lock()
+        return account
+    
+    def adjust_balance(self, account: dict, delta: int) -> None:
+        account["balance_usd"] += delta
+        self.balance_totals[account["account_type"]] += delta
+    
+    def freeze_epoch(self, epoch_id: str) -> None:
+        """Serialize a sealed epoch; its dict must not be mutated afterwards."""
+        self._epoch_blobs[epoch_id] = msgspec.json.encode(self.epochs[epoch_id])
+        self._epochs_list_blob = None
+    
+    def get_epoch_blob(self, epoch_id: str) -> Optional[bytes]:
+        return self._epoch_blobs.get(epoch_id)
+    
+    def get_epochs_list_blob(self) -> bytes:
+        if self._epochs_list_blob is None:
+            self._epochs_list_blob = msgspec.json.encode({
+                "epochs": list(self.epochs.values()),
+                "total": len(self.epochs),
+            })
+        return self._epochs_list_blob
     
     def get_account(self, ens: str) -> Optional[dict]:
         return self.accounts.get(ens)
     
     def get_or_create_account(self, ens: str, account_type: str) -> dict:
-        if ens not in self.accounts:
-            self._init_account(ens, account_type)
-        return self.accounts[ens]
+        account = self.accounts.get(ens)
+        if account is None:
+            account = self._init_account(ens, account_type)
+        return account
     
     def record_transaction(
         self,
         account_ens: str,
         tx_type: str,
-        amount: Decimal,
-        balance_after: Decimal,
+        amount: int,
+        balance_after: int,
         reference_type: str = None,
         reference_id: str = None,
         eth_tx_hash: str = None,
+        now_ns: Optional[int] = None,
     ) -> str:
+        """Record one transaction; pass now_ns to reuse the caller's timestamp."""
+        tx = self._new_transaction(
+            account_ens, tx_type, amount, balance_after,
+            reference_type, reference_id, eth_tx_hash,
+            time.time_ns() if now_ns is None else now_ns,
+        )
+        self.transactions.append(tx)
+        if config.TX_WAL:
+            self._tx_pending.append(tx)
+        return tx["id"]
+    
+    def _new_transaction(
+        self,
+        account_ens: str,
+        tx_type: str,
+        amount: int,
+        balance_after: int,
+        reference_type: Optional[str],
+        reference_id: Optional[str],
+        eth_tx_hash: Optional[str],
+        now_ns: int,
+    ) -> dict:
+        """Build a tx and add it to the per-account index; caller appends it to the ledger."""
         self.tx_counter += 1
         tx_id = f"tx-{self.tx_counter:05d}"
         
-        self.transactions.append({
+        tx = {
             "id": tx_id,
             "account_ens": account_ens,
             "tx_type": tx_type,
-            "amount_usd": str(amount),
-            "balance_after": str(balance_after),
+            "amount_usd": format_cents(amount),
+            "balance_after": format_cents(balance_after),
             "reference_type": reference_type,
             "reference_id": reference_id,
             "eth_tx_hash": eth_tx_hash,
-            "created_at": datetime.now(timezone.utc).isoformat(),
-        })
+            "created_at": now_ns,  # formatted on read
+        }
+        
+        history = self._by_account[account_ens]
+        times = self._by_account_times[account_ens]
+        # Clamp so a wall-clock step backwards can't unsort the seek column
+        times.append(max(now_ns, times[-1]) if times else now_ns)
+        history.append(tx)
+        if len(history) > 2 * config.TX_HISTORY_MAX:
+            # Trim in bulk so appends stay amortized O(1)
+            del history[:-config.TX_HISTORY_MAX]
+            del times[:-config.TX_HISTORY_MAX]
+        self._tx_counts[account_ens] += 1
         
-        return tx_id
+        return tx
     
-    def get_transactions(self, account_ens: str, limit: int = 50) -> list[dict]:
-        return [
-            tx for tx in reversed(self.transactions)
-            if tx["account_ens"] == account_ens
-        ][:limit]
+    def settle_earnings(
+        self,
+        epoch_id: str,
+        earnings: dict[str, int],
+        now_ns: Optional[int] = None,
+    ) -> None:
+        """Move each worker's settled earnings from pending to balance in one pass."""
+        if now_ns is None:
+            now_ns = time.time_ns()
+        new_txs = []
+        for worker_ens, earned in earnings.items():
+            account = self.accounts.get(worker_ens)
+            if not account:
+                continue
+            account["pending_usd"] -= earned
+            self.adjust_balance(account, earned)
+            account["total_in_usd"] += earned
+            new_txs.append(self._new_transaction(
+                worker_ens, "EARNING", earned, account["balance_usd"],
+                "epoch", epoch_id, None, now_ns,
+            ))
+        self.transactions.extend(new_txs)
+        if config.TX_WAL:
+            self._tx_pending.extend(new_txs)
+    
+    def take_pending(self, limit: int) -> list[dict]:
+        """Pop up to `limit` of the oldest unflushed transactions."""
+        batch = self._tx_pending[:limit]
+        del self._tx_pending[:limit]
+        return batch
+    
+    def requeue_pending(self, batch: list[dict]) -> None:
+        """Put a batch that failed to flush back at the head of the queue."""
+        self._tx_pending[:0] = batch
+    
+    def get_transactions(
+        self,
+        account_ens: str,
+        limit: int = 50,
+        since_ns: Optional[int] = None,
+    ) -> list[dict]:
+        """
+        Newest-first page of an account's history, or with since_ns the
+        oldest-first page of transactions at or after that time.
+        """
+        history = self._by_account.get(account_ens)
+        limit = max(limit, 0)
+        if not history or not limit:
+            return []
+        if since_ns is None:
+            page = reversed(history[-limit:])
+        else:
+            start = bisect_left(self._by_account_times[account_ens], since_ns)
+            page = history[start:start + limit]
+        return [{**tx, "created_at": format_ns(tx["created_at"])} for tx in page]
+    
+    def get_transaction_count(self, account_ens: str) -> int:
+        return self._tx_counts.get(account_ens, 0)
+    
+    def add_deposit(self, deposit: dict) -> None:
+        self.deposits.append(deposit)
+        self._deposits_by_client[deposit["client_ens"]].append(deposit)
+    
+    def get_deposits(self, client_ens: Optional[str] = None) -> list[dict]:
+        if client_ens is None:
+            return self.deposits
+        return self._deposits_by_client.get(client_ens, [])
+    
+    def add_withdrawal(self, withdrawal: dict) -> None:
+        self.withdrawals.append(withdrawal)
+        self._withdrawals_by_id[withdrawal["id"]] = withdrawal
+    
+    def get_withdrawal(self, withdrawal_id: str) -> Optional[dict]:
+        return self._withdrawals_by_id.get(withdrawal_id)
 
 
 store = LedgerStore()
 
 
+# =============================================================================
+# Transaction WAL
+# =============================================================================
+
+tx_metadata = MetaData()
+
+tx_table = Table(
+    "transactions",
+    tx_metadata,
+    # Append-only log: a row key of its own, since tx ids restart with the
+    # in-memory store
+    Column("seq", Integer, primary_key=True, autoincrement=True),
+    Column("id", String(16), nullable=False),
+    Column("account_ens", String(128), nullable=False, index=True),
+    Column("tx_type", String(16), nullable=False),
+    Column("amount_usd", String(32), nullable=False),
+    Column("balance_after", String(32), nullable=False),
+    Column("reference_type", String(32)),
+    Column("reference_id", String(128)),
+    Column("eth_tx_hash", String(66)),
+    Column("created_at", BigInteger, nullable=False),  # time.time_ns()
+)
+
+
+class TransactionWriter:
+    """Appends transaction batches with one executemany per batch."""
+    
+    def __init__(self, database_url: str):
+        self.engine = create_engine(database_url)
+        tx_metadata.create_all(self.engine)
+    
+    def write(self, batch: list[dict]) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(tx_table.insert(), batch)
+    
+    def close(self) -> None:
+        self.engine.dispose()
+
+
+async def flush_transactions(writer: TransactionWriter, stop: asyncio.Event) -> None:
+    """Drain pending transactions to the DB in batches; a last pass runs after `stop`."""
+    while not stop.is_set():
+        try:
+            await asyncio.wait_for(stop.wait(), config.TX_FLUSH_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+        while batch := store.take_pending(config.TX_FLUSH_BATCH):
+            try:
+                # Blocking DB driver: keep it off the event loop
+                await asyncio.to_thread(writer.write, batch)
+            except Exception as exc:
+                store.requeue_pending(batch)
+                print(f"   ⚠ Transaction flush failed, will retry: {exc}")
+                break
+
+
 # =============================================================================
 # Lifespan
 # =============================================================================
@@ -253,8 +558,24 @@ async def lifespan(app: FastAPI):
     print(f"💰 SwarmLedger API starting...")
     print(f"   ENS: {config.ENS}")
     print(f"   Vault: {config.VAULT_ADDRESS}")
+    if config.REDIS_URL:
+        FastAPICache.init(RedisBackend(aioredis.from_url(config.REDIS_URL)), prefix="swarmledger")
+    else:
+        FastAPICache.init(InMemoryBackend(), prefix="swarmledger")
+    
+    writer = flusher = None
+    stop_flush = asyncio.Event()
+    if config.TX_WAL:
+        writer = TransactionWriter(config.DATABASE_URL)
+        flusher = asyncio.create_task(flush_transactions(writer, stop_flush))
+    
     yield
     print(f"💰 SwarmLedger API shutting down...")
+    
+    if flusher is not None:
+        stop_flush.set()  # wakes the writer for one final drain
+        await flusher
+        writer.close()
 
 
 # =============================================================================
@@ -266,18 +587,33 @@ app = FastAPI(
     description="Settlement layer for SwarmOS",
     version=config.VERSION,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
+
+def openapi() -> dict:
+    """Default schema plus the msgspec request body components."""
+    if app.openapi_schema is None:
+        schema = FastAPI.openapi(app)
+        schema.setdefault("components", {}).setdefault("schemas", {}).update(_msgspec_components)
+    return app.openapi_schema
+
+
+app.openapi = openapi
+
+# Frozenset: Starlette tests `origin in allow_origins` on every CORS request
+CORS_ORIGINS = frozenset({
+    "https://swarmledger.eth.limo",
+    "https://swarmorb.eth.limo",
+    "https://swarmos.eth.limo",
+    "https://clientswarm.eth.limo",
+    "http://localhost:3000",
+    "http://localhost:4321",
+})
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[
-        "https://swarmledger.eth.limo",
-        "https://swarmorb.eth.limo",
-        "https://swarmos.eth.limo",
-        "https://clientswarm.eth.limo",
-        "http://localhost:3000",
-        "http://localhost:4321",
-    ],
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -299,23 +635,15 @@ async def health():
 
 
 @app.get("/v1/stats")
+@cache(expire=config.CACHE_TTL_STATS, namespace="stats")
 async def get_stats():
     """Get ledger-wide statistics."""
-    total_client_balance = sum(
-        a["balance_usd"] for a in store.accounts.values()
-        if a["account_type"] == "client"
-    )
-    total_worker_balance = sum(
-        a["balance_usd"] for a in store.accounts.values()
-        if a["account_type"] == "worker"
-    )
-    
     return {
         "total_accounts": len(store.accounts),
-        "total_client_balance_usd": str(total_client_balance),
-        "total_worker_balance_usd": str(total_worker_balance),
-        "total_transactions": len(store.transactions),
-        "epochs_finalized": sum(1 for e in store.epochs.values() if e["status"] == "finalized"),
+        "total_client_balance_usd": format_cents(store.balance_totals["client"]),
+        "total_worker_balance_usd": format_cents(store.balance_totals["worker"]),
+        "total_transactions": store.tx_counter,
+        "epochs_finalized": store.epochs_finalized,
         "current_epoch": "epoch-003",
     }
 
@@ -324,7 +652,7 @@ async def get_stats():
 # Balances
 # =============================================================================
 
-@app.get("/v1/balances/{ens}", response_model=BalanceResponse)
+@app.get("/v1/balances/{ens}")
 async def get_balance(ens: str):
     """Get account balance."""
     account = store.get_account(ens)
@@ -342,154 +670,173 @@ async def get_balance(ens: str):
     else:
         available = balance
     
-    return BalanceResponse(
+    return struct_response(BalanceResponse(
         ens=ens,
         account_type=account["account_type"],
-        balance_usd=str(balance),
-        reserved_usd=str(reserved),
-        pending_usd=str(pending),
-        available_usd=str(available),
-        total_in_usd=str(account["total_in_usd"]),
-        total_out_usd=str(account["total_out_usd"]),
-    )
-
-
-@app.post("/v1/balances/{ens}/reserve")
-async def reserve_funds(ens: str, request: ReserveFundsRequest):
+        balance_usd=format_cents(balance),
+        reserved_usd=format_cents(reserved),
+        pending_usd=format_cents(pending),
+        available_usd=format_cents(available),
+        total_in_usd=format_cents(account["total_in_usd"]),
+        total_out_usd=format_cents(account["total_out_usd"]),
+    ))
+
+
+@app.post("/v1/balances/{ens}/reserve", openapi_extra=msgspec_openapi(ReserveFundsRequest))
+async def reserve_funds(
+    ens: str,
+    request: ReserveFundsRequest = Depends(msgspec_body(ReserveFundsRequest)),
+):
     """Reserve funds for a pending job."""
     account = store.get_account(ens)
     if not account:
         raise HTTPException(status_code=404, detail="Account not found")
     
-    amount = Decimal(request.amount_usd)
-    available = account["balance_usd"] - account["reserved_usd"]
-    
-    if available < amount:
-        raise HTTPException(
-            status_code=402,
-            detail=f"Insufficient funds. Available: ${available}, Required: ${amount}"
-        )
-    
-    account["reserved_usd"] += amount
-    
-    return {
-        "status": "reserved",
-        "amount_usd": str(amount),
-        "job_id": request.job_id,
-        "reserved_total": str(account["reserved_usd"]),
-    }
+    async with store.locks[ens]:
+        amount = to_cents(request.amount_usd)
+        available = account["balance_usd"] - account["reserved_usd"]
+        
+        if available < amount:
+            raise HTTPException(
+                status_code=402,
+                detail=f"Insufficient funds. Available: ${format_cents(available)}, Required: ${format_cents(amount)}"
+            )
+        
+        account["reserved_usd"] += amount
+        
+        return {
+            "status": "reserved",
+            "amount_usd": format_cents(amount),
+            "job_id": request.job_id,
+            "reserved_total": format_cents(account["reserved_usd"]),
+        }
 
 
-@app.post("/v1/balances/{ens}/charge")
-async def charge_funds(ens: str, request: ChargeFundsRequest):
+@app.post("/v1/balances/{ens}/charge", openapi_extra=msgspec_openapi(ChargeFundsRequest))
+async def charge_funds(
+    ens: str,
+    request: ChargeFundsRequest = Depends(msgspec_body(ChargeFundsRequest)),
+):
     """Finalize charge after job completion (moves from reserved to spent)."""
     account = store.get_account(ens)
     if not account:
         raise HTTPException(status_code=404, detail="Account not found")
     
-    amount = Decimal(request.amount_usd)
-    
-    if account["reserved_usd"] < amount:
-        raise HTTPException(status_code=400, detail="Charge exceeds reserved amount")
-    
-    account["reserved_usd"] -= amount
-    account["balance_usd"] -= amount
-    account["total_out_usd"] += amount
-    
-    # Record transaction
-    tx_id = store.record_transaction(
-        account_ens=ens,
-        tx_type="JOB_CHARGE",
-        amount=-amount,
-        balance_after=account["balance_usd"],
-        reference_type="job",
-        reference_id=request.job_id,
-    )
-    
-    return {
-        "status": "charged",
-        "amount_usd": str(amount),
-        "job_id": request.job_id,
-        "new_balance": str(account["balance_usd"]),
-        "transaction_id": tx_id,
-    }
-
-
-@app.post("/v1/balances/{ens}/credit")
-async def credit_earnings(ens: str, request: CreditEarningsRequest):
-    """Credit worker earnings."""
-    account = store.get_or_create_account(ens, "worker")
-    
-    amount = Decimal(request.amount_usd)
-    
-    if request.pending:
-        # Add to pending (will be finalized at epoch settlement)
-        account["pending_usd"] += amount
-    else:
-        # Add directly to available balance
-        account["balance_usd"] += amount
-        account["total_in_usd"] += amount
+    async with store.locks[ens]:
+        amount = to_cents(request.amount_usd)
+        
+        if account["reserved_usd"] < amount:
+            raise HTTPException(status_code=400, detail="Charge exceeds reserved amount")
+        
+        account["reserved_usd"] -= amount
+        store.adjust_balance(account, -amount)
+        account["total_out_usd"] += amount
         
         # Record transaction
-        store.record_transaction(
+        tx_id = store.record_transaction(
             account_ens=ens,
-            tx_type="EARNING",
-            amount=amount,
+            tx_type="JOB_CHARGE",
+            amount=-amount,
             balance_after=account["balance_usd"],
             reference_type="job",
             reference_id=request.job_id,
         )
+        
+        return {
+            "status": "charged",
+            "amount_usd": format_cents(amount),
+            "job_id": request.job_id,
+            "new_balance": format_cents(account["balance_usd"]),
+            "transaction_id": tx_id,
+        }
+
+
+@app.post("/v1/balances/{ens}/credit", openapi_extra=msgspec_openapi(CreditEarningsRequest))
+async def credit_earnings(
+    ens: str,
+    request: CreditEarningsRequest = Depends(msgspec_body(CreditEarningsRequest)),
+):
+    """Credit worker earnings."""
+    account = store.get_or_create_account(ens, "worker")
     
-    return {
-        "status": "credited",
-        "amount_usd": str(amount),
-        "pending": request.pending,
-        "job_id": request.job_id,
-    }
+    async with store.locks[ens]:
+        amount = to_cents(request.amount_usd)
+        
+        if request.pending:
+            # Add to pending (will be finalized at epoch settlement)
+            account["pending_usd"] += amount
+        else:
+            # Add directly to available balance
+            store.adjust_balance(account, amount)
+            account["total_in_usd"] += amount
+            
+            # Record transaction
+            store.record_transaction(
+                account_ens=ens,
+                tx_type="EARNING",
+                amount=amount,
+                balance_after=account["balance_usd"],
+                reference_type="job",
+                reference_id=request.job_id,
+            )
+        
+        return {
+            "status": "credited",
+            "amount_usd": format_cents(amount),
+            "pending": request.pending,
+            "job_id": request.job_id,
+        }
 
 
 # =============================================================================
 # Deposits
 # =============================================================================
 
-@app.post("/v1/deposits")
-async def record_deposit(request: DepositRequest):
+@app.post("/v1/deposits", openapi_extra=msgspec_openapi(DepositRequest))
+async def record_deposit(request: DepositRequest = Depends(msgspec_body(DepositRequest))):
     """Record a USDC deposit from L1."""
+    now_ns = time.time_ns()  # one clock read for the deposit and its tx
     account = store.get_or_create_account(request.client_ens, "client")
     
-    amount = Decimal(request.amount_usd)
-    
-    # Credit balance
-    account["balance_usd"] += amount
-    account["total_in_usd"] += amount
+    async with store.locks[request.client_ens]:
+        amount = to_cents(request.amount_usd)
+        
+        # Credit balance
+        store.adjust_balance(account, amount)
+        account["total_in_usd"] += amount
+        
+        # Record deposit
+        store.add_deposit({
+            "id": f"dep-{len(store.deposits)+1:05d}",
+            "client_ens": request.client_ens,
+            "amount_usd": format_cents(amount),
+            "eth_tx_hash": request.eth_tx_hash,
+            "status": "confirmed",
+            "created_at": format_ns(now_ns),
+        })
+        
+        # Record transaction
+        tx_id = store.record_transaction(
+            account_ens=request.client_ens,
+            tx_type="DEPOSIT",
+            amount=amount,
+            balance_after=account["balance_usd"],
+            reference_type="eth_tx",
+            reference_id=request.eth_tx_hash,
+            eth_tx_hash=request.eth_tx_hash,
+            now_ns=now_ns,
+        )
+        new_balance = account["balance_usd"]
     
-    # Record deposit
-    store.deposits.append({
-        "id": f"dep-{len(store.deposits)+1:05d}",
-        "client_ens": request.client_ens,
-        "amount_usd": str(amount),
-        "eth_tx_hash": request.eth_tx_hash,
-        "status": "confirmed",
-        "created_at": datetime.now(timezone.utc).isoformat(),
-    })
-    
-    # Record transaction
-    tx_id = store.record_transaction(
-        account_ens=request.client_ens,
-        tx_type="DEPOSIT",
-        amount=amount,
-        balance_after=account["balance_usd"],
-        reference_type="eth_tx",
-        reference_id=request.eth_tx_hash,
-        eth_tx_hash=request.eth_tx_hash,
-    )
+    # Balances moved: don't serve cached stats for the rest of the TTL
+    await FastAPICache.clear(namespace="stats")
     
     return {
         "status": "confirmed",
         "client_ens": request.client_ens,
-        "amount_usd": str(amount),
-        "new_balance": str(account["balance_usd"]),
-        "scans_available": int(account["balance_usd"] / Decimal("0.10")),
+        "amount_usd": format_cents(amount),
+        "new_balance": format_cents(new_balance),
+        "scans_available": new_balance // 10,
         "transaction_id": tx_id,
     }
 
@@ -497,9 +844,7 @@ async def record_deposit(request: DepositRequest):
 @app.get("/v1/deposits")
 async def list_deposits(client_ens: Optional[str] = None, limit: int = 50):
     """List deposits."""
-    deposits = store.deposits
-    if client_ens:
-        deposits = [d for d in deposits if d["client_ens"] == client_ens]
+    deposits = store.get_deposits(client_ens or None)
     return {"deposits": deposits[:limit], "total": len(deposits)}
 
 
@@ -507,70 +852,78 @@ async def list_deposits(client_ens: Optional[str] = None, limit: int = 50):
 # Withdrawals
 # =============================================================================
 
-@app.post("/v1/withdrawals")
-async def request_withdrawal(request: WithdrawalRequest):
+@app.post("/v1/withdrawals", openapi_extra=msgspec_openapi(WithdrawalRequest))
+async def request_withdrawal(
+    request: WithdrawalRequest = Depends(msgspec_body(WithdrawalRequest)),
+):
     """Request a withdrawal (worker payout)."""
     account = store.get_account(request.worker_ens)
     if not account:
         raise HTTPException(status_code=404, detail="Account not found")
     
-    if account["account_type"] != "worker":
-        raise HTTPException(status_code=400, detail="Only workers can withdraw")
-    
-    amount = Decimal(request.amount_usd)
-    
-    if account["balance_usd"] < amount:
-        raise HTTPException(
-            status_code=402,
-            detail=f"Insufficient funds. Available: ${account['balance_usd']}"
-        )
-    
-    # Create withdrawal request
-    withdrawal_id = f"wd-{len(store.withdrawals)+1:05d}"
-    store.withdrawals.append({
-        "id": withdrawal_id,
-        "worker_ens": request.worker_ens,
-        "amount_usd": str(amount),
-        "destination_address": request.destination_address,
-        "status": "pending",
-        "created_at": datetime.now(timezone.utc).isoformat(),
-    })
-    
-    # Reserve funds (don't deduct until processed)
-    account["reserved_usd"] += amount
-    
-    return {
-        "status": "pending",
-        "withdrawal_id": withdrawal_id,
-        "amount_usd": str(amount),
-        "destination": request.destination_address,
-        "message": "Withdrawal queued for processing",
-    }
+    async with store.locks[request.worker_ens]:
+        if account["account_type"] != "worker":
+            raise HTTPException(status_code=400, detail="Only workers can withdraw")
+        
+        amount = to_cents(request.amount_usd)
+        
+        if account["balance_usd"] < amount:
+            raise HTTPException(
+                status_code=402,
+                detail=f"Insufficient funds. Available: ${format_cents(account['balance_usd'])}"
+            )
+        
+        # Create withdrawal request
+        withdrawal_id = f"wd-{len(store.withdrawals)+1:05d}"
+        store.add_withdrawal({
+            "id": withdrawal_id,
+            "worker_ens": request.worker_ens,
+            "amount_usd": format_cents(amount),
+            "destination_address": request.destination_address,
+            "status": "pending",
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        })
+        
+        # Reserve funds (don't deduct until processed)
+        account["reserved_usd"] += amount
+        
+        return {
+            "status": "pending",
+            "withdrawal_id": withdrawal_id,
+            "amount_usd": format_cents(amount),
+            "destination": request.destination_address,
+            "message": "Withdrawal queued for processing",
+        }
 
 
 @app.get("/v1/withdrawals/{withdrawal_id}")
 async def get_withdrawal(withdrawal_id: str):
     """Get withdrawal status."""
-    for w in store.withdrawals:
-        if w["id"] == withdrawal_id:
-            return w
-    raise HTTPException(status_code=404, detail="Withdrawal not found")
+    withdrawal = store.get_withdrawal(withdrawal_id)
+    if not withdrawal:
+        raise HTTPException(status_code=404, detail="Withdrawal not found")
+    return withdrawal
 
 
 # =============================================================================
 # Transactions
 # =============================================================================
 
-@app.get("/v1/transactions", response_model=TransactionHistoryResponse)
-async def get_transactions(account: str, limit: int = 50):
-    """Get transaction history for an account."""
-    transactions = store.get_transactions(account, limit)
+@app.get("/v1/transactions")
+async def get_transactions(account: str, limit: int = 50, since_ns: Optional[int] = None):
+    """
+    Get transaction history for an account, newest first.
+
+    With since_ns (Unix time in nanoseconds), page forward from that time
+    instead, oldest first.
+    """
+    transactions = store.get_transactions(account, limit, since_ns)
     
-    return TransactionHistoryResponse(
+    return struct_response(TransactionHistoryResponse(
         account_ens=account,
         transactions=transactions,
-        total_count=len([t for t in store.transactions if t["account_ens"] == account]),
-    )
+        total_count=store.get_transaction_count(account),
+    ))
 
 
 # =============================================================================
@@ -580,10 +933,7 @@ async def get_transactions(account: str, limit: int = 50):
 @app.get("/v1/epochs")
 async def list_epochs():
     """List all epochs."""
-    return {
-        "epochs": list(store.epochs.values()),
-        "total": len(store.epochs),
-    }
+    return Response(content=store.get_epochs_list_blob(), media_type="application/json")
 
 
 @app.get("/v1/epochs/current")
@@ -598,14 +948,20 @@ async def get_current_epoch():
 @app.get("/v1/epochs/{epoch_id}")
 async def get_epoch(epoch_id: str):
     """Get epoch details."""
+    blob = store.get_epoch_blob(epoch_id)
+    if blob is not None:
+        return Response(content=blob, media_type="application/json")
     epoch = store.epochs.get(epoch_id)
     if not epoch:
         raise HTTPException(status_code=404, detail="Epoch not found")
     return epoch
 
 
-@app.post("/v1/epochs/{epoch_id}/seal")
-async def seal_epoch(epoch_id: str, request: EpochSealRequest):
+@app.post("/v1/epochs/{epoch_id}/seal", openapi_extra=msgspec_openapi(EpochSealRequest))
+async def seal_epoch(
+    epoch_id: str,
+    request: EpochSealRequest = Depends(msgspec_body(EpochSealRequest)),
+):
     """Seal an epoch with Merkle root and settlements."""
     epoch = store.epochs.get(epoch_id)
     if not epoch:
@@ -614,35 +970,39 @@ async def seal_epoch(epoch_id: str, request: EpochSealRequest):
     if epoch["status"] != "active":
         raise HTTPException(status_code=400, detail="Epoch already sealed")
     
+    # Parse settlements (one entry per worker) before touching the epoch, so
+    # a bad settlement leaves it active and unsettled
+    earnings: dict[str, int] = defaultdict(int)
+    try:
+        for settlement in request.settlements:
+            earnings[settlement["worker_ens"]] += to_cents(settlement["total_earned_usd"])
+    except KeyError as exc:
+        raise HTTPException(status_code=422, detail=f"Settlement missing {exc}")
+    except (ArithmeticError, TypeError, ValueError):
+        raise HTTPException(status_code=422, detail="Invalid settlement amount or worker")
+    
     # Update epoch
     epoch["status"] = "finalized"
+    store.epochs_finalized += 1
     epoch["jobs_merkle_root"] = request.jobs_merkle_root
     epoch["jobs_count"] = request.jobs_count
     epoch["total_revenue_usd"] = request.total_revenue_usd
     epoch["signature"] = request.signature
-    epoch["sealed_at"] = datetime.now(timezone.utc).isoformat()
+    # One clock read shared by the seal and every settlement tx
+    now_ns = time.time_ns()
+    epoch["sealed_at"] = format_ns(now_ns)
     
-    # Process settlements (finalize worker earnings)
-    for settlement in request.settlements:
-        worker_ens = settlement["worker_ens"]
-        earned = Decimal(settlement["total_earned_usd"])
-        
-        account = store.get_account(worker_ens)
-        if account:
-            # Move from pending to available
-            account["pending_usd"] -= earned
-            account["balance_usd"] += earned
-            account["total_in_usd"] += earned
-            
-            # Record transaction
-            store.record_transaction(
-                account_ens=worker_ens,
-                tx_type="EARNING",
-                amount=earned,
-                balance_after=account["balance_usd"],
-                reference_type="epoch",
-                reference_id=epoch_id,
-            )
+    async with AsyncExitStack() as held:
+        # Sorted acquisition so concurrent seals can't deadlock; workers
+        # without an account are skipped by settle_earnings anyway
+        for worker_ens in sorted(earnings):
+            if worker_ens in store.locks:
+                await held.enter_async_context(store.locks[worker_ens])
+        store.settle_earnings(epoch_id, earnings, now_ns)
+    
+    store.freeze_epoch(epoch_id)
+    
+    await FastAPICache.clear(namespace="stats")
     
     return {
         "status": "sealed",
@@ -657,6 +1017,27 @@ async def seal_epoch(epoch_id: str, request: EpochSealRequest):
 # Verification
 # =============================================================================
 
+def verify_merkle_proof(leaf: bytes, proof: list[dict], root: bytes) -> bool:
+    """
+    Walk a receipt's merkle_proof from the leaf to the root.
+
+    Same pairing as rails.crypto.signing.MerkleTree (sha256 over the raw
+    32-byte nodes), but nodes stay bytes the whole way: hashlib's sha256 is
+    OpenSSL's, so each step is one C call with no hex round trip.
+    """
+    sha256 = hashlib.sha256
+    node = leaf
+    for step in proof:
+        sibling = bytes.fromhex(step["hash"])
+        if len(sibling) != 32:
+            return False
+        if step["position"] == "left":
+            node = sha256(sibling + node).digest()
+        else:
+            node = sha256(node + sibling).digest()
+    return node == root
+
+
 @app.post("/v1/verify/receipt")
 async def verify_receipt(receipt: dict):
     """Verify a job receipt against epoch Merkle root."""
@@ -669,8 +1050,17 @@ async def verify_receipt(receipt: dict):
     if not epoch.get("jobs_merkle_root"):
         return {"valid": False, "error": "Epoch not sealed"}
     
-    # In production: verify Merkle proof
-    # For now, just check epoch exists and is sealed
+    try:
+        proof_valid = verify_merkle_proof(
+            bytes.fromhex(receipt.get("leaf_hash") or ""),
+            receipt.get("merkle_proof") or [],
+            bytes.fromhex(epoch["jobs_merkle_root"]),
+        )
+    except (ValueError, TypeError, KeyError):
+        return {"valid": False, "error": "Malformed receipt"}
+    
+    if not proof_valid:
+        return {"valid": False, "error": "Merkle proof does not match epoch root"}
     
     return {
         "valid": True,
@@ -686,4 +1076,12 @@ async def verify_receipt(receipt: dict):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("main:app", host=config.HOST, port=config.PORT, reload=True)
+    uvicorn.run(
+        "main:app",
+        host=config.HOST,
+        port=config.PORT,
+        reload=config.DEBUG,
+        loop="uvloop",
+        http="httptools",
+        workers=config.WORKERS,
+    )
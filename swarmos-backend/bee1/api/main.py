@@ -12,14 +12,20 @@ This is the main entry point for all SwarmOS operations:
 
 import os
 import time
+from collections import defaultdict
 from datetime import datetime, timezone
 from contextlib import asynccontextmanager
 from decimal import Decimal
 from typing import Optional
 
-from fastapi import FastAPI, HTTPException, Depends, Header
+from fastapi import FastAPI, HTTPException, Depends, Header, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.redis import RedisBackend
+from fastapi_cache.decorator import cache
+from redis import asyncio as aioredis
+from pydantic import BaseModel, TypeAdapter, ValidationError
 
 # Rails imports (shared libraries)
 import sys
@@ -32,8 +38,13 @@ from rails.schemas.api import (
     JobClaimResponse, JobCompleteRequest,
     ClientInfoResponse, ClientTopupRequest, ClientTopupResponse,
     CurrentEpochResponse, SystemStatusResponse, HealthResponse,
+    job_submit_adapter, job_complete_adapter, worker_register_adapter,
+    worker_heartbeat_adapter, client_topup_adapter,
+)
+from rails.money import to_cents, format_cents
+from rails.crypto.signing import (
+    ENSResolver, sha256_backend, verify_job_request, create_job_message, verify_signature,
 )
-from rails.crypto.signing import verify_job_request, create_job_message, verify_signature
 
 
 # =============================================================================
@@ -47,23 +58,77 @@ class Config:
     ENS: str = os.getenv("BEE1_ENS", "swarmos.eth")
     
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    # Per-process pool; total is REDIS_POOL_SIZE * uvicorn workers
+    REDIS_POOL_SIZE: int = int(os.getenv("REDIS_POOL_SIZE", "20"))
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./swarmledger.db")
     
+    # Longest a worker's claim may block waiting for a job. Each waiting
+    # worker holds a Redis connection, so size REDIS_POOL_SIZE above the
+    # number of idle workers.
+    CLAIM_WAIT_MAX: float = 25.0     # seconds
+    
+    # ENS → address lookups for signature checks; unset skips verification
+    ETH_RPC_URL: str = os.getenv("ETH_RPC_URL", "")
+    ENS_CACHE_TTL: int = int(os.getenv("ENS_CACHE_TTL", "600"))  # seconds
+    
+    # Short-lived response cache for dashboard-polled GETs
+    CACHE_TTL_STATUS: int = 3        # seconds
+    
     JOB_FEE_USD: Decimal = Decimal(os.getenv("JOB_FEE_USD", "0.10"))
     
     VERSION: str = "1.1.0"
+    
+    # Server: reload only for local development. WORKERS > 1 runs separate
+    # processes that do not share clients/jobs state; each also opens its own
+    # REDIS_POOL_SIZE connections.
+    DEBUG: bool = os.getenv("DEBUG") == "1"
+    WORKERS: int = int(os.getenv("WORKERS", "1"))
 
 
 config = Config()
 
 
+# =============================================================================
+# Request Bodies
+# =============================================================================
+
+def json_body(adapter: TypeAdapter):
+    """Dependency that validates the raw JSON body with a prebuilt TypeAdapter."""
+    async def decode_body(request: Request):
+        try:
+            return adapter.validate_json(await request.body())
+        except ValidationError as exc:
+            raise HTTPException(status_code=422, detail=exc.errors(include_url=False))
+
+    return decode_body
+
+
+# =============================================================================
+# Money
+# =============================================================================
+
+# Client balances are integer cents; the fee is parsed once here
+JOB_FEE_CENTS = to_cents(config.JOB_FEE_USD)
+JOB_FEE_STR = str(config.JOB_FEE_USD)
+
+
 # =============================================================================
 # Application State
 # =============================================================================
 
+# Starting balances for a client first seen on topup (flat, so .copy() suffices)
+DEFAULT_CLIENT = {
+    "balance_usd": 0,
+    "reserved_usd": 0,
+    "total_spent_usd": 0,
+    "total_jobs": 0,
+}
+
+
 class AppState:
     """Application state container."""
     queue: SwarmQueue
+    ens: Optional[ENSResolver]
     start_time: float
     current_epoch_id: str
     job_counter: int
@@ -71,22 +136,27 @@ class AppState:
     # In-memory stores (would be DB in production)
     clients: dict  # ens -> balance info
     jobs: dict     # job_id -> job info
+    epoch_completed_counts: dict  # epoch_id -> completed jobs, kept by complete_job
+    epoch_revenue_cents: dict     # epoch_id -> fees of completed jobs, kept by complete_job
     
     def __init__(self):
-        self.queue = SwarmQueue(config.REDIS_URL)
+        self.queue = SwarmQueue(config.REDIS_URL, max_connections=config.REDIS_POOL_SIZE)
+        self.ens = None
         self.start_time = time.time()
         self.current_epoch_id = "epoch-002"  # Would come from DB
         self.job_counter = 850  # Would come from DB
         self.clients = {
             # Demo client
             "xyzclinic.clientswarm.eth": {
-                "balance_usd": Decimal("24.50"),
-                "reserved_usd": Decimal("0"),
-                "total_spent_usd": Decimal("847.30"),
+                "balance_usd": 2450,
+                "reserved_usd": 0,
+                "total_spent_usd": 84730,
                 "total_jobs": 8473,
             }
         }
         self.jobs = {}
+        self.epoch_completed_counts = defaultdict(int)
+        self.epoch_revenue_cents = defaultdict(int)
 
 
 state = AppState()
@@ -104,9 +174,19 @@ async def lifespan(app: FastAPI):
     print(f"   ENS: {config.ENS}")
     print(f"   Redis: {config.REDIS_URL}")
     
+    sha256_fast, sha256_impl = sha256_backend()
+    if not sha256_fast:
+        print(f"   ⚠ Merkle hashing on {sha256_impl}; link OpenSSL >= 1.1.1 for SHA-NI")
+    
     await state.queue.connect()
     print(f"   ✓ Connected to Redis")
     
+    FastAPICache.init(RedisBackend(aioredis.from_url(config.REDIS_URL)), prefix="bee1")
+    
+    if config.ETH_RPC_URL:
+        state.ens = ENSResolver(config.ETH_RPC_URL, redis=state.queue.redis, ttl=config.ENS_CACHE_TTL)
+        print(f"   ✓ ENS resolution enabled")
+    
     yield
     
     # Shutdown
@@ -123,18 +203,22 @@ app = FastAPI(
     description="The Queen. Sovereign compute coordination.",
     version=config.VERSION,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
-# CORS (for eth.limo frontends)
+# CORS (for eth.limo frontends). A frozenset, since Starlette tests
+# `origin in allow_origins` on every cross-origin request
+CORS_ORIGINS = frozenset({
+    "https://clientswarm.eth.limo",
+    "https://swarmorb.eth.limo",
+    "https://swarmos.eth.limo",
+    "http://localhost:3000",
+    "http://localhost:4321",
+})
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[
-        "https://clientswarm.eth.limo",
-        "https://swarmorb.eth.limo",
-        "https://swarmos.eth.limo",
-        "http://localhost:3000",
-        "http://localhost:4321",
-    ],
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -161,6 +245,7 @@ async def health_check():
 
 
 @app.get("/api/v1/status", response_model=SystemStatusResponse)
+@cache(expire=config.CACHE_TTL_STATUS)
 async def system_status():
     """Get system-wide status."""
     stats = await state.queue.get_stats()
@@ -184,7 +269,9 @@ async def system_status():
 # =============================================================================
 
 @app.post("/api/v1/jobs", response_model=JobSubmitResponse)
-async def submit_job(request: JobSubmitRequest):
+async def submit_job(
+    request: JobSubmitRequest = Depends(json_body(job_submit_adapter)),
+):
     """
     Submit a new compute job.
     
@@ -198,22 +285,26 @@ async def submit_job(request: JobSubmitRequest):
         raise HTTPException(status_code=404, detail="Client not registered")
     
     available = client["balance_usd"] - client["reserved_usd"]
-    if available < config.JOB_FEE_USD:
+    if available < JOB_FEE_CENTS:
         raise HTTPException(
             status_code=402,
-            detail=f"Insufficient balance. Need ${config.JOB_FEE_USD}, have ${available}"
+            detail=f"Insufficient balance. Need ${JOB_FEE_STR}, have ${format_cents(available)}"
         )
     
-    # 2. Verify signature (simplified - would verify against ENS owner address)
-    # In production: resolve ENS → address, verify signature
-    message = create_job_message(
-        request.job_type,
-        request.client_ens,
-        request.dicom_ref,
-        request.timestamp,
-        request.nonce
-    )
-    # signature_valid = verify_signature(message, request.signature, resolved_address)
+    # 2. Verify signature against the ENS owner address (cached lookup)
+    if state.ens is not None:
+        resolved_address = await state.ens.resolve(request.client_ens)
+        if resolved_address is None:
+            raise HTTPException(status_code=401, detail="Client ENS does not resolve")
+        message = create_job_message(
+            request.job_type,
+            request.client_ens,
+            request.dicom_ref,
+            request.timestamp,
+            request.nonce
+        )
+        if not verify_signature(message, request.signature, resolved_address):
+            raise HTTPException(status_code=401, detail="Invalid signature")
     
     # 3. Check timestamp freshness (prevent replay)
     now = int(time.time())
@@ -226,7 +317,7 @@ async def submit_job(request: JobSubmitRequest):
     job_id = f"job-{epoch_num}-{state.job_counter:04d}"
     
     # 5. Reserve balance
-    client["reserved_usd"] += config.JOB_FEE_USD
+    client["reserved_usd"] += JOB_FEE_CENTS
     
     # 6. Create job record
     job_record = {
@@ -238,7 +329,7 @@ async def submit_job(request: JobSubmitRequest):
         "status": "queued",
         "dicom_ref": request.dicom_ref,
         "result_ref": None,
-        "fee_usd": str(config.JOB_FEE_USD),
+        "fee_usd": JOB_FEE_STR,
         "submitted_at": datetime.now(timezone.utc).isoformat(),
         "started_at": None,
         "completed_at": None,
@@ -251,7 +342,7 @@ async def submit_job(request: JobSubmitRequest):
         job_type=request.job_type,
         client_ens=request.client_ens,
         dicom_ref=request.dicom_ref,
-        fee_usd=str(config.JOB_FEE_USD),
+        fee_usd=JOB_FEE_STR,
         queued_at=time.time(),
     )
     await state.queue.enqueue_job(queued_job)
@@ -260,7 +351,7 @@ async def submit_job(request: JobSubmitRequest):
         job_id=job_id,
         status="queued",
         epoch_id=state.current_epoch_id,
-        fee_usd=str(config.JOB_FEE_USD),
+        fee_usd=JOB_FEE_STR,
         message="Job queued successfully"
     )
 
@@ -294,7 +385,9 @@ async def get_job_status(job_id: str):
 # =============================================================================
 
 @app.post("/api/v1/workers/register")
-async def register_worker(request: WorkerRegisterRequest):
+async def register_worker(
+    request: WorkerRegisterRequest = Depends(json_body(worker_register_adapter)),
+):
     """Register a new worker."""
     # Verify signature proves ENS ownership
     # In production: verify against ENS resolved address
@@ -314,7 +407,9 @@ async def register_worker(request: WorkerRegisterRequest):
 
 
 @app.post("/api/v1/workers/heartbeat", response_model=WorkerHeartbeatResponse)
-async def worker_heartbeat(request: WorkerHeartbeatRequest):
+async def worker_heartbeat(
+    request: WorkerHeartbeatRequest = Depends(json_body(worker_heartbeat_adapter)),
+):
     """Worker heartbeat."""
     await state.queue.set_worker_status(
         request.ens,
@@ -329,9 +424,17 @@ async def worker_heartbeat(request: WorkerHeartbeatRequest):
 
 
 @app.post("/api/v1/jobs/claim", response_model=JobClaimResponse)
-async def claim_job(worker_ens: str = Header(..., alias="X-Worker-ENS")):
-    """Worker claims next available job."""
-    job = await state.queue.claim_job(worker_ens)
+async def claim_job(
+    worker_ens: str = Header(..., alias="X-Worker-ENS"),
+    wait_s: float = Query(1.0, gt=0, le=config.CLAIM_WAIT_MAX),
+):
+    """
+    Worker claims next available job.
+    
+    Long-poll: with an empty queue the request is held for up to wait_s
+    seconds and returns as soon as a job is enqueued.
+    """
+    job = await state.queue.claim_job(worker_ens, block_ms=int(wait_s * 1000))
     
     if not job:
         return JobClaimResponse(
@@ -363,7 +466,10 @@ async def claim_job(worker_ens: str = Header(..., alias="X-Worker-ENS")):
 
 
 @app.post("/api/v1/jobs/{job_id}/complete")
-async def complete_job(job_id: str, request: JobCompleteRequest):
+async def complete_job(
+    job_id: str,
+    request: JobCompleteRequest = Depends(json_body(job_complete_adapter)),
+):
     """Worker submits job completion."""
     job = state.jobs.get(job_id)
     if not job:
@@ -381,11 +487,13 @@ async def complete_job(job_id: str, request: JobCompleteRequest):
     job["poe_hash"] = request.poe_hash
     job["execution_ms"] = request.execution_ms
     job["completed_at"] = datetime.now(timezone.utc).isoformat()
+    fee = JOB_FEE_CENTS if job["fee_usd"] == JOB_FEE_STR else to_cents(job["fee_usd"])
+    state.epoch_completed_counts[job["epoch_id"]] += 1
+    state.epoch_revenue_cents[job["epoch_id"]] += fee
     
     # Finalize payment
     client = state.clients.get(job["client_ens"])
     if client:
-        fee = Decimal(job["fee_usd"])
         client["reserved_usd"] -= fee
         client["balance_usd"] -= fee
         client["total_spent_usd"] += fee
@@ -395,6 +503,8 @@ async def complete_job(job_id: str, request: JobCompleteRequest):
     await state.queue.set_worker_status(request.worker_ens, "online", None)
     await state.queue.complete_job(job_id)
     
+    # /epochs/current is not cleared here: clear() scans the Redis keyspace,
+    # so its counters are left to catch up within CACHE_TTL_STATUS
     return {"status": "completed", "job_id": job_id}
 
 
@@ -415,40 +525,39 @@ async def get_client_info(ens: str):
     
     return ClientInfoResponse(
         ens=ens,
-        balance_usd=str(balance),
-        reserved_usd=str(reserved),
-        available_usd=str(available),
-        total_spent_usd=str(client["total_spent_usd"]),
+        balance_usd=format_cents(balance),
+        reserved_usd=format_cents(reserved),
+        available_usd=format_cents(available),
+        total_spent_usd=format_cents(client["total_spent_usd"]),
         total_jobs=client["total_jobs"],
-        scans_available=int(available / config.JOB_FEE_USD),
+        scans_available=available // JOB_FEE_CENTS,
         display_name=client.get("display_name"),
         created_at=datetime.now(timezone.utc),  # Would come from DB
     )
 
 
 @app.post("/api/v1/clients/{ens}/topup", response_model=ClientTopupResponse)
-async def topup_client(ens: str, request: ClientTopupRequest):
+async def topup_client(
+    ens: str,
+    request: ClientTopupRequest = Depends(json_body(client_topup_adapter)),
+):
     """Record a client USDC topup from L1."""
     # In production: verify L1 transaction
     
-    if ens not in state.clients:
-        # Create new client
-        state.clients[ens] = {
-            "balance_usd": Decimal("0"),
-            "reserved_usd": Decimal("0"),
-            "total_spent_usd": Decimal("0"),
-            "total_jobs": 0,
-        }
+    # One probe for existing clients; the default is only copied on a miss
+    client = state.clients.get(ens)
+    if client is None:
+        client = state.clients[ens] = DEFAULT_CLIENT.copy()
     
-    amount = Decimal(request.amount_usd)
-    state.clients[ens]["balance_usd"] += amount
-    new_balance = state.clients[ens]["balance_usd"]
+    amount = to_cents(request.amount_usd)
+    client["balance_usd"] += amount
+    new_balance = client["balance_usd"]
     
     return ClientTopupResponse(
         client_ens=ens,
-        amount_usd=str(amount),
-        new_balance_usd=str(new_balance),
-        scans_available=int(new_balance / config.JOB_FEE_USD),
+        amount_usd=format_cents(amount),
+        new_balance_usd=format_cents(new_balance),
+        scans_available=new_balance // JOB_FEE_CENTS,
         tx_hash=request.eth_tx_hash,
     )
 
@@ -458,24 +567,20 @@ async def topup_client(ens: str, request: ClientTopupRequest):
 # =============================================================================
 
 @app.get("/api/v1/epochs/current", response_model=CurrentEpochResponse)
+@cache(expire=config.CACHE_TTL_STATUS, namespace="epoch")
 async def get_current_epoch():
     """Get current active epoch."""
     stats = await state.queue.get_stats()
     
-    # Count completed jobs in current epoch
-    completed = sum(
-        1 for j in state.jobs.values()
-        if j["epoch_id"] == state.current_epoch_id and j["status"] == "completed"
-    )
-    
-    revenue = completed * float(config.JOB_FEE_USD)
+    completed = state.epoch_completed_counts.get(state.current_epoch_id, 0)
+    revenue = state.epoch_revenue_cents.get(state.current_epoch_id, 0)
     
     return CurrentEpochResponse(
         epoch_id=state.current_epoch_id,
         status="active",
         start_time=datetime.now(timezone.utc),  # Would come from DB
         jobs_completed=completed,
-        revenue_usd=f"{revenue:.2f}",
+        revenue_usd=format_cents(revenue),
         agents_online=stats["workers_online"],
         queue_depth=stats["queue_depth"],
     )
@@ -491,5 +596,8 @@ if __name__ == "__main__":
         "main:app",
         host=config.HOST,
         port=config.PORT,
-        reload=True,
+        reload=config.DEBUG,
+        loop="uvloop",
+        http="httptools",
+        workers=config.WORKERS,
     )
@@ -12,25 +12,47 @@ This daemon:
 """
 
 import os
+import signal
 import sys
 import time
 import asyncio
 import hashlib
-import json
 import subprocess
+from string import Template
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Optional
 from dataclasses import dataclass
 from pathlib import Path
 
 import httpx
+import orjson
+
+# Optional: in-process PDF rendering. Without it, reports go through the
+# wkhtmltopdf binary (a fork/exec and an HTML tempfile per report).
+try:
+    from weasyprint import CSS, HTML
+except (ImportError, OSError):  # OSError: Pango system libraries missing
+    HTML = None
+
+# Optional: SIMD BLAKE3 for result digests; sha256 otherwise
+try:
+    from blake3 import blake3
+except ImportError:
+    blake3 = None
+
+# Optional: libuv event loop; stock asyncio loop otherwise
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 
 # =============================================================================
 # Configuration
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class WorkerConfig:
     """Worker configuration."""
     # Identity
@@ -45,15 +67,24 @@ class WorkerConfig:
     # Network
     bee1_url: str = os.getenv("BEE1_URL", "http://localhost:8001")
     queenbee_url: str = os.getenv("QUEENBEE_URL", "http://localhost:8000")
+    ipfs_api_url: str = os.getenv("IPFS_API", "http://127.0.0.1:5001")
     ip_address: str = os.getenv("WORKER_IP", "10.0.0.10")
 
     # Output
     output_dir: str = os.getenv("OUTPUT_DIR", "/tmp/swarmos-results")
+    # Also write {job_id}_result.json locally (it is uploaded from memory)
+    keep_result_json: bool = os.getenv("KEEP_RESULT_JSON") == "1"
 
     # Behavior
     heartbeat_interval: int = 30  # seconds
     poll_interval: int = 2  # seconds between job polls
+    # Long-poll: Bee-1 holds each claim up to this long waiting for a job
+    claim_wait_s: float = float(os.getenv("CLAIM_WAIT_S", "25"))
     max_retries: int = 3
+    # Completions waiting to be POSTed; a full queue stalls finalize_job
+    completion_queue_size: int = 64
+    # Report threads (PDF + IPFS); also caps jobs finalizing behind inference
+    report_workers: int = int(os.getenv("REPORT_WORKERS", "4"))
 
 
 config = WorkerConfig()
@@ -62,10 +93,50 @@ config = WorkerConfig()
 Path(config.output_dir).mkdir(parents=True, exist_ok=True)
 
 
+# =============================================================================
+# QueenBee Client
+# =============================================================================
+
+# One pooled client for every QueenBee call, so jobs reuse keep-alive
+# connections (multiplexed over HTTP/2 when QueenBee is served over TLS)
+QUEENBEE_CLIENT = httpx.AsyncClient(
+    base_url=config.queenbee_url,
+    http2=True,
+    timeout=httpx.Timeout(120.0, connect=5.0),
+    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+)
+
+
+async def queenbee_spine_report(findings: str) -> dict:
+    """Request a spine report from QueenBee over the shared client."""
+    response = await QUEENBEE_CLIENT.post(
+        "/spine-report",
+        json={"findings": findings, "k_samples": 7, "max_new_tokens": 512},
+    )
+    response.raise_for_status()
+    return response.json()
+
+
 # =============================================================================
 # Inference Executors
 # =============================================================================
 
+def result_digest(result: dict) -> str:
+    """44-hex-char digest of a result dict, hashed as compact JSON."""
+    data = orjson.dumps(result)
+    if blake3 is not None:
+        return blake3(data).hexdigest(length=22)
+    return hashlib.sha256(data).hexdigest()[:44]
+
+
+# Blocking report steps (PDF render, IPFS add) run here so they overlap with
+# the next job's inference instead of holding up the event loop
+REPORT_POOL = ThreadPoolExecutor(max_workers=config.report_workers, thread_name_prefix="report")
+
+# IPFS daemon HTTP API: uploads without forking the `ipfs` CLI per job
+IPFS_CLIENT = httpx.AsyncClient(base_url=config.ipfs_api_url, timeout=60.0)
+
+
 class BaseInferenceExecutor:
     """Base class for inference executors."""
 
@@ -80,10 +151,88 @@ class BaseInferenceExecutor:
             job_id: Job identifier
 
         Returns:
-            dict with result_ref and execution metadata
+            dict with result and execution metadata; result_ref may be left
+            for finalize()
         """
         raise NotImplementedError
 
+    async def finalize(self, output: dict, job_id: str) -> dict:
+        """
+        Produce post-inference artifacts (reports, uploads) for execute()'s
+        output. Runs after the worker has moved on to its next job.
+
+        Returns:
+            output with result_ref filled in
+        """
+        return output
+
+
+REPORT_CSS = """
+    body { font-family: 'Helvetica', sans-serif; margin: 40px; color: #1a1a1a; }
+    .header { border-bottom: 3px solid #10b981; padding-bottom: 20px; margin-bottom: 30px; }
+    .logo { font-size: 24px; font-weight: bold; color: #10b981; }
+    .job-id { color: #666; font-size: 14px; }
+    h2 { color: #333; border-bottom: 1px solid #ddd; padding-bottom: 10px; }
+    table { width: 100%; border-collapse: collapse; margin: 20px 0; }
+    th, td { padding: 12px; text-align: left; border-bottom: 1px solid #eee; }
+    th { background: #f8f8f8; }
+    .confidence { background: #f0fdf4; padding: 15px; border-radius: 8px; margin: 20px 0; }
+    .footer { margin-top: 40px; padding-top: 20px; border-top: 1px solid #ddd; font-size: 12px; color: #666; }
+    ul { line-height: 1.8; }
+"""
+
+# Parsed once and shared by every WeasyPrint render
+REPORT_STYLESHEET = CSS(string=REPORT_CSS) if HTML is not None else None
+# WeasyPrint gets the pre-parsed stylesheet; wkhtmltopdf needs it inline
+REPORT_INLINE_STYLE = "" if HTML is not None else f"<style>{REPORT_CSS}</style>"
+
+STENOSIS_COLORS = {
+    "Normal": "#10b981",
+    "Mild": "#f59e0b",
+    "Moderate": "#f97316",
+    "Severe": "#ef4444",
+}
+
+REPORT_TEMPLATE = Template("""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>Spine MRI Analysis Report - $job_id</title>
+    $style
+</head>
+<body>
+    <div class="header">
+        <div class="logo">SwarmOS Medical AI</div>
+        <div class="job-id">Report ID: $job_id | Generated: $processed_at</div>
+    </div>
+
+    <h2>Stenosis Grading by Level</h2>
+    <table>
+        <tr><th>Spinal Level</th><th>Stenosis Grade</th></tr>
+        $stenosis_rows
+    </table>
+
+    <h2>Clinical Impression</h2>
+    <ul>$impressions</ul>
+
+    <h2>Recommendations</h2>
+    <ul>$recommendations</ul>
+
+    <div class="confidence">
+        <strong>AI Confidence:</strong> $confidence_score%
+        (Method: $confidence_method)
+    </div>
+
+    <div class="footer">
+        <p><strong>Model:</strong> $model</p>
+        <p><strong>Processing Time:</strong> ${execution_ms}ms</p>
+        <p><strong>DICOM Reference:</strong> $input_ref</p>
+        <p style="margin-top:20px"><em>This report was generated by SwarmOS sovereign compute infrastructure.
+        Results should be validated by a qualified radiologist.</em></p>
+    </div>
+</body>
+</html>""")
+
 
 class SpineMRIExecutor(BaseInferenceExecutor):
     """Spine MRI analysis using QueenBee-Spine model."""
@@ -103,26 +252,16 @@ class SpineMRIExecutor(BaseInferenceExecutor):
         findings_text = " ".join(sample_findings)
 
         # Call real QueenBee inference
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            try:
-                response = await client.post(
-                    f"{config.queenbee_url}/spine-report",
-                    json={
-                        "findings": findings_text,
-                        "k_samples": 7,
-                        "max_new_tokens": 512,
-                    }
-                )
-                response.raise_for_status()
-                inference_result = response.json()
-            except Exception as e:
-                print(f"⚠️  QueenBee inference failed: {e}, using fallback")
-                inference_result = {
-                    "impression": ["Unable to process - service unavailable"],
-                    "stenosis_grades": {},
-                    "confidence": {"score_0_100": 0, "method": "fallback"},
-                    "recommendation": ["Retry or manual review required"],
-                }
+        try:
+            inference_result = await queenbee_spine_report(findings_text)
+        except Exception as e:
+            print(f"⚠️  QueenBee inference failed: {e}, using fallback")
+            inference_result = {
+                "impression": ["Unable to process - service unavailable"],
+                "stenosis_grades": {},
+                "confidence": {"score_0_100": 0, "method": "fallback"},
+                "recommendation": ["Retry or manual review required"],
+            }
 
         execution_ms = int((time.time() - start_time) * 1000)
 
@@ -141,90 +280,57 @@ class SpineMRIExecutor(BaseInferenceExecutor):
             "execution_ms": execution_ms,
         }
 
-        # Generate PDF report
-        pdf_path = await self.generate_pdf(result, job_id)
-
-        # Upload to IPFS
-        result_ref = await self.upload_to_ipfs(result, pdf_path, job_id)
-
+        # PDF + IPFS happen in finalize(), overlapped with the next job
         return {
             "result": result,
-            "result_ref": result_ref,
-            "pdf_path": pdf_path,
             "execution_ms": execution_ms,
         }
 
-    async def generate_pdf(self, result: dict, job_id: str) -> str:
+    async def finalize(self, output: dict, job_id: str) -> dict:
+        """Render the PDF report on the report pool, then upload it."""
+        pdf_path = await asyncio.get_running_loop().run_in_executor(
+            REPORT_POOL, self.generate_pdf, output["result"], job_id
+        )
+        result_ref = await self.upload_to_ipfs(output["result"], pdf_path, job_id)
+        return {**output, "pdf_path": pdf_path, "result_ref": result_ref}
+
+    def generate_pdf(self, result: dict, job_id: str) -> str:
         """Generate PDF report from inference result."""
         pdf_path = Path(config.output_dir) / f"{job_id}_report.pdf"
         html_path = Path(config.output_dir) / f"{job_id}_report.html"
 
         # Build HTML report
-        stenosis_rows = ""
-        for level, grade in result.get("stenosis_grades", {}).items():
-            color = {"Normal": "#10b981", "Mild": "#f59e0b", "Moderate": "#f97316", "Severe": "#ef4444"}.get(grade, "#888")
-            stenosis_rows += f"<tr><td>{level}</td><td style='color:{color};font-weight:bold'>{grade}</td></tr>"
+        stenosis_rows = "".join([
+            f"<tr><td>{level}</td><td style='color:{STENOSIS_COLORS.get(grade, '#888')};font-weight:bold'>{grade}</td></tr>"
+            for level, grade in result.get("stenosis_grades", {}).items()
+        ])
 
         impressions = "".join(f"<li>{imp}</li>" for imp in result.get("impression", []))
         recommendations = "".join(f"<li>{rec}</li>" for rec in result.get("recommendation", []))
         confidence = result.get("confidence", {})
 
-        html_content = f"""<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <title>Spine MRI Analysis Report - {job_id}</title>
-    <style>
-        body {{ font-family: 'Helvetica', sans-serif; margin: 40px; color: #1a1a1a; }}
-        .header {{ border-bottom: 3px solid #10b981; padding-bottom: 20px; margin-bottom: 30px; }}
-        .logo {{ font-size: 24px; font-weight: bold; color: #10b981; }}
-        .job-id {{ color: #666; font-size: 14px; }}
-        h2 {{ color: #333; border-bottom: 1px solid #ddd; padding-bottom: 10px; }}
-        table {{ width: 100%; border-collapse: collapse; margin: 20px 0; }}
-        th, td {{ padding: 12px; text-align: left; border-bottom: 1px solid #eee; }}
-        th {{ background: #f8f8f8; }}
-        .confidence {{ background: #f0fdf4; padding: 15px; border-radius: 8px; margin: 20px 0; }}
-        .footer {{ margin-top: 40px; padding-top: 20px; border-top: 1px solid #ddd; font-size: 12px; color: #666; }}
-        ul {{ line-height: 1.8; }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <div class="logo">SwarmOS Medical AI</div>
-        <div class="job-id">Report ID: {job_id} | Generated: {result.get('processed_at', 'N/A')}</div>
-    </div>
-
-    <h2>Stenosis Grading by Level</h2>
-    <table>
-        <tr><th>Spinal Level</th><th>Stenosis Grade</th></tr>
-        {stenosis_rows}
-    </table>
-
-    <h2>Clinical Impression</h2>
-    <ul>{impressions}</ul>
-
-    <h2>Recommendations</h2>
-    <ul>{recommendations}</ul>
-
-    <div class="confidence">
-        <strong>AI Confidence:</strong> {confidence.get('score_0_100', 'N/A')}%
-        (Method: {confidence.get('method', 'N/A')})
-    </div>
+        html_content = REPORT_TEMPLATE.substitute(
+            job_id=job_id,
+            style=REPORT_INLINE_STYLE,
+            processed_at=result.get("processed_at", "N/A"),
+            stenosis_rows=stenosis_rows,
+            impressions=impressions,
+            recommendations=recommendations,
+            confidence_score=confidence.get("score_0_100", "N/A"),
+            confidence_method=confidence.get("method", "N/A"),
+            model=result.get("model", "N/A"),
+            execution_ms=result.get("execution_ms", "N/A"),
+            input_ref=result.get("input_ref", "N/A"),
+        )
 
-    <div class="footer">
-        <p><strong>Model:</strong> {result.get('model', 'N/A')}</p>
-        <p><strong>Processing Time:</strong> {result.get('execution_ms', 'N/A')}ms</p>
-        <p><strong>DICOM Reference:</strong> {result.get('input_ref', 'N/A')}</p>
-        <p style="margin-top:20px"><em>This report was generated by SwarmOS sovereign compute infrastructure.
-        Results should be validated by a qualified radiologist.</em></p>
-    </div>
-</body>
-</html>"""
+        if HTML is not None:
+            HTML(string=html_content).write_pdf(pdf_path, stylesheets=[REPORT_STYLESHEET])
+            return str(pdf_path)
 
         # Write HTML
         html_path.write_text(html_content)
 
-        # Convert to PDF using wkhtmltopdf or weasyprint if available
+        # Convert to PDF using wkhtmltopdf
         try:
             subprocess.run(
                 ["wkhtmltopdf", "--quiet", str(html_path), str(pdf_path)],
@@ -237,23 +343,62 @@ class SpineMRIExecutor(BaseInferenceExecutor):
         return str(pdf_path)
 
     async def upload_to_ipfs(self, result: dict, pdf_path: str, job_id: str) -> str:
-        """Upload result and PDF to IPFS."""
-        # Save JSON result
+        """
+        Upload the PDF and JSON result to IPFS.
+
+        Both files go up in one add wrapped in a directory, so the returned
+        ref is the directory CID holding the pair. Uses the daemon's HTTP
+        API; the `ipfs` CLI is only tried when the API is unreachable.
+        The JSON goes up from memory and only touches disk when
+        keep_result_json is set or the CLI fallback needs a file.
+        """
+        loop = asyncio.get_running_loop()
+        json_bytes = orjson.dumps(result, option=orjson.OPT_INDENT_2)
+        pdf_path = Path(pdf_path)
         json_path = Path(config.output_dir) / f"{job_id}_result.json"
-        json_path.write_text(json.dumps(result, indent=2))
 
-        # Try to add to IPFS
+        if config.keep_result_json:
+            await loop.run_in_executor(REPORT_POOL, json_path.write_bytes, json_bytes)
+
+        try:
+            pdf_bytes = await loop.run_in_executor(REPORT_POOL, pdf_path.read_bytes)
+            response = await IPFS_CLIENT.post(
+                "/api/v0/add",
+                params={"cid-version": "1", "wrap-with-directory": "true"},
+                files=[
+                    ("file", (pdf_path.name, pdf_bytes)),
+                    ("file", (json_path.name, json_bytes, "application/json")),
+                ],
+            )
+            response.raise_for_status()
+            # One JSON object per line; the wrapping directory comes last
+            last = response.text.strip().rsplit("\n", 1)[-1]
+            return f"ipfs://{orjson.loads(last)['Hash']}"
+        except httpx.TransportError:
+            return await loop.run_in_executor(
+                REPORT_POOL, self.ipfs_add_cli, result, pdf_path, json_path, json_bytes
+            )
+        except httpx.HTTPStatusError:
+            return self.fallback_ref(result)
+
+    def ipfs_add_cli(self, result: dict, pdf_path: Path, json_path: Path, json_bytes: bytes) -> str:
+        """Add the pair with the `ipfs` CLI (blocking)."""
+        if not config.keep_result_json:
+            json_path.write_bytes(json_bytes)
         try:
             proc = subprocess.run(
-                ["ipfs", "add", "-Q", "--cid-version=1", str(pdf_path)],
+                ["ipfs", "add", "-Q", "--cid-version=1", "--wrap-with-directory",
+                 str(pdf_path), str(json_path)],
                 capture_output=True, text=True, check=True
             )
             cid = proc.stdout.strip()
             return f"ipfs://{cid}"
         except (subprocess.CalledProcessError, FileNotFoundError):
-            # Fallback: generate hash-based reference
-            result_hash = hashlib.sha256(json.dumps(result).encode()).hexdigest()[:44]
-            return f"ipfs://Qm{result_hash}"
+            return self.fallback_ref(result)
+
+    def fallback_ref(self, result: dict) -> str:
+        """Hash-based reference when IPFS is unavailable."""
+        return f"ipfs://Qm{result_digest(result)}"
 
 
 class BrainMRIExecutor(BaseInferenceExecutor):
@@ -285,7 +430,7 @@ class BrainMRIExecutor(BaseInferenceExecutor):
             "execution_ms": execution_ms,
         }
 
-        result_ref = f"ipfs://Qm{hashlib.sha256(json.dumps(result).encode()).hexdigest()[:44]}"
+        result_ref = f"ipfs://Qm{result_digest(result)}"
 
         return {
             "result": result,
@@ -322,7 +467,7 @@ class ClinicalReportExecutor(BaseInferenceExecutor):
             "execution_ms": execution_ms,
         }
 
-        result_ref = f"ipfs://Qm{hashlib.sha256(json.dumps(result).encode()).hexdigest()[:44]}"
+        result_ref = f"ipfs://Qm{result_digest(result)}"
 
         return {
             "result": result,
@@ -352,7 +497,7 @@ class BeeWorker:
     2. Start heartbeat loop
     3. Poll for jobs
     4. Execute jobs
-    5. Submit results
+    5. Submit results (reports finalize while the next job runs)
     """
     
     def __init__(self, config: WorkerConfig):
@@ -360,10 +505,20 @@ class BeeWorker:
         self.client = httpx.AsyncClient(
             base_url=config.bee1_url,
             timeout=30.0,
-            headers={"X-Worker-ENS": config.ens}
+            headers={"X-Worker-ENS": config.ens},
+            http2=True,
         )
         self.running = False
+        self._tasks: list[asyncio.Task] = []
+        # Cleared if Bee-1 does not support long-poll claims
+        self.long_poll = True
         self.current_job_id: Optional[str] = None
+        # Jobs past inference whose report/upload is still running
+        self.pending: dict[str, asyncio.Task] = {}
+        # Completion payloads, POSTed to Bee-1 by completion_writer
+        self.completions: asyncio.Queue[dict] = asyncio.Queue(
+            maxsize=config.completion_queue_size
+        )
         self.jobs_completed = 0
         self.jobs_failed = 0
     
@@ -378,20 +533,40 @@ class BeeWorker:
         await self.register()
         
         self.running = True
-        
-        # Start background tasks
-        heartbeat_task = asyncio.create_task(self.heartbeat_loop())
-        job_task = asyncio.create_task(self.job_loop())
-        
-        print(f"   ✓ Worker ready")
+        loop = asyncio.get_running_loop()
+        # Outlives the loops below so queued completions can drain
+        writer = asyncio.create_task(self.completion_writer())
         
         try:
-            await asyncio.gather(heartbeat_task, job_task)
-        except asyncio.CancelledError:
-            print("Worker shutting down...")
+            # A crash in either loop cancels the other; stop() cancels both
+            async with asyncio.TaskGroup() as tg:
+                self._tasks = [
+                    tg.create_task(self.heartbeat_loop()),
+                    tg.create_task(self.job_loop()),
+                ]
+                for sig in (signal.SIGTERM, signal.SIGINT):
+                    loop.add_signal_handler(sig, self.stop)
+                
+                print(f"   ✓ Worker ready")
         finally:
+            for sig in (signal.SIGTERM, signal.SIGINT):
+                loop.remove_signal_handler(sig)
             self.running = False
+            if self.pending:
+                await asyncio.gather(*self.pending.values(), return_exceptions=True)
+            await self.completions.join()
+            writer.cancel()
             await self.client.aclose()
+            await QUEENBEE_CLIENT.aclose()
+            await IPFS_CLIENT.aclose()
+    
+    def stop(self):
+        """Stop the heartbeat and job loops; start() then drains and cleans up."""
+        if self.running:
+            print("Worker shutting down...")
+        self.running = False
+        for task in self._tasks:
+            task.cancel()
     
     async def register(self):
         """Register with Bee-1 controller."""
@@ -437,8 +612,8 @@ class BeeWorker:
     async def job_loop(self):
         """Poll for and execute jobs."""
         while self.running:
-            if self.current_job_id:
-                # Already processing a job
+            if self.current_job_id or len(self.pending) >= self.config.report_workers:
+                # GPU busy, or reports are backing up behind inference
                 await asyncio.sleep(self.config.poll_interval)
                 continue
             
@@ -448,7 +623,7 @@ class BeeWorker:
                 
                 if job:
                     await self.execute_job(job)
-                else:
+                elif not self.long_poll:
                     # No jobs available, wait before polling again
                     await asyncio.sleep(self.config.poll_interval)
                     
@@ -457,9 +632,27 @@ class BeeWorker:
                 await asyncio.sleep(self.config.poll_interval)
     
     async def claim_job(self) -> Optional[dict]:
-        """Try to claim a job from the queue."""
+        """
+        Try to claim a job from the queue.
+        
+        Long-polls Bee-1, so an empty queue returns only after claim_wait_s
+        (or as soon as a job arrives) and job_loop needs no sleep between
+        claims.
+        """
         try:
-            response = await self.client.post("/api/v1/jobs/claim")
+            if self.long_poll:
+                wait_s = self.config.claim_wait_s
+                response = await self.client.post(
+                    "/api/v1/jobs/claim",
+                    params={"wait_s": wait_s},
+                    timeout=wait_s + 5.0,
+                )
+                if response.status_code == 501:
+                    print("⚠️  Bee-1 does not support long-poll claims, polling instead")
+                    self.long_poll = False
+                    return None
+            else:
+                response = await self.client.post("/api/v1/jobs/claim")
             response.raise_for_status()
             
             data = response.json()
@@ -470,12 +663,23 @@ class BeeWorker:
             
             return None
             
+        except httpx.ReadTimeout:
+            # Long-poll expired without a job
+            return None
         except Exception as e:
             print(f"⚠️  Claim failed: {e}")
+            # Back off so an unreachable Bee-1 is not hammered
+            await asyncio.sleep(self.config.poll_interval)
             return None
     
+    def _fail_job(self, job_id: str, exc: Exception):
+        """Record a claimed job that will not complete."""
+        self.jobs_failed += 1
+        print(f"❌ Failed {job_id}: {exc}")
+        # TODO: Report failure to Bee-1; until then the job stays claimed there
+    
     async def execute_job(self, job: dict):
-        """Execute a claimed job."""
+        """Run inference for a claimed job, then hand it off to finalize_job."""
         job_id = job["job_id"]
         job_type = job["job_type"]
         dicom_ref = job["dicom_ref"]
@@ -491,30 +695,67 @@ class BeeWorker:
                 raise ValueError(f"Unknown job type: {job_type}")
             
             # Execute inference
-            result = await executor.execute(dicom_ref, job_id=job_id)
-            
-            # Generate Proof of Execution
-            poe_data = f"{job_id}:{result['result_ref']}:{self.config.ens}"
-            poe_hash = hashlib.sha256(poe_data.encode()).hexdigest()
-            
-            # Submit completion
-            await self.submit_completion(
-                job_id=job_id,
-                result_ref=result["result_ref"],
-                poe_hash=poe_hash,
-                execution_ms=result["execution_ms"],
-            )
-            
-            self.jobs_completed += 1
-            print(f"✅ Completed {job_id} in {result['execution_ms']}ms")
+            output = await executor.execute(dicom_ref, job_id=job_id)
             
         except Exception as e:
-            self.jobs_failed += 1
-            print(f"❌ Failed {job_id}: {e}")
-            # TODO: Report failure to Bee-1
+            self._fail_job(job_id, e)
+            return
             
         finally:
+            # Inference is done: free the worker to claim the next job
             self.current_job_id = None
+        
+        task = asyncio.create_task(self.finalize_job(job_id, executor, output))
+        self.pending[job_id] = task
+        task.add_done_callback(lambda _: self.pending.pop(job_id, None))
+    
+    async def finalize_job(self, job_id: str, executor: BaseInferenceExecutor, output: dict):
+        """Build artifacts, retrying with backoff, then queue the completion."""
+        for attempt in range(self.config.max_retries):
+            try:
+                if "result_ref" not in output:
+                    output = await executor.finalize(output, job_id)
+                break
+            except Exception as e:
+                if attempt + 1 < self.config.max_retries:
+                    print(f"⚠️  Finalizing {job_id} failed ({e}), retrying")
+                    await asyncio.sleep(2 ** attempt)
+                    continue
+                self._fail_job(job_id, e)
+                return
+        
+        # Generate Proof of Execution
+        poe_data = f"{job_id}:{output['result_ref']}:{self.config.ens}"
+        poe_hash = hashlib.sha256(poe_data.encode()).hexdigest()
+        
+        await self.completions.put({
+            "job_id": job_id,
+            "result_ref": output["result_ref"],
+            "poe_hash": poe_hash,
+            "execution_ms": output["execution_ms"],
+        })
+    
+    async def completion_writer(self):
+        """Submit queued completions to Bee-1, retrying with backoff."""
+        while True:
+            completion = await self.completions.get()
+            job_id = completion["job_id"]
+            try:
+                for attempt in range(self.config.max_retries):
+                    try:
+                        await self.submit_completion(**completion)
+                    except Exception as e:
+                        if attempt + 1 < self.config.max_retries:
+                            print(f"⚠️  Completing {job_id} failed ({e}), retrying")
+                            await asyncio.sleep(2 ** attempt)
+                            continue
+                        self._fail_job(job_id, e)
+                    else:
+                        self.jobs_completed += 1
+                        print(f"✅ Completed {job_id} in {completion['execution_ms']}ms")
+                    break
+            finally:
+                self.completions.task_done()
     
     async def submit_completion(
         self,
@@ -548,9 +789,13 @@ async def main():
     
     try:
         await worker.start()
-    except KeyboardInterrupt:
-        print("\n👋 Worker stopped")
+    except KeyboardInterrupt:  # before start() installs its signal handlers
+        pass
+    print("\n👋 Worker stopped")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
@@ -4,16 +4,28 @@ SwarmOS Rails - Cryptographic Utilities
 EIP-191 signing, ENS resolution, Merkle trees.
 """
 
+import asyncio
 import hashlib
 import json
+import ssl
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Optional
 from dataclasses import dataclass
 
+import orjson
+from cachetools import TTLCache
 from eth_account import Account
 from eth_account.messages import encode_defunct
 from eth_typing import ChecksumAddress
+from eth_utils import keccak, to_checksum_address
 from web3 import Web3
 
+# Optional: direct libsecp256k1 recovery (skips eth_account's object layers)
+try:
+    from coincurve import PublicKey as Secp256k1PublicKey
+except ImportError:
+    Secp256k1PublicKey = None
+
 
 # =============================================================================
 # EIP-191 Signing & Verification
@@ -38,6 +50,34 @@ def sign_message(message: str, private_key: str) -> str:
     return signed.signature.hex()
 
 
+EIP191_PREFIX = b"\x19Ethereum Signed Message:\n"
+
+
+def eip191_hash(message: str) -> bytes:
+    """keccak256 of the EIP-191 personal_sign envelope for a text message."""
+    data = message.encode("utf-8")
+    return keccak(EIP191_PREFIX + str(len(data)).encode() + data)
+
+
+def _recover_address_bytes(message: str, signature: str) -> bytes:
+    """Recover the 20-byte signer address; raises on a malformed signature."""
+    if Secp256k1PublicKey is None:
+        if not signature.startswith("0x"):
+            signature = f"0x{signature}"
+        recovered = Account.recover_message(encode_defunct(text=message), signature=signature)
+        return bytes.fromhex(recovered[2:])
+    
+    sig = bytes.fromhex(signature[2:] if signature.startswith("0x") else signature)
+    if len(sig) != 65:
+        raise ValueError("Signature must be 65 bytes")
+    v = sig[64] - 27 if sig[64] >= 27 else sig[64]
+    public_key = Secp256k1PublicKey.from_signature_and_message(
+        sig[:64] + bytes([v]), eip191_hash(message), hasher=None
+    )
+    # Address = last 20 bytes of keccak(uncompressed key without the 0x04 tag)
+    return keccak(public_key.format(compressed=False)[1:])[-20:]
+
+
 def verify_signature(message: str, signature: str, expected_address: str) -> bool:
     """
     Verify an EIP-191 signature.
@@ -51,17 +91,40 @@ def verify_signature(message: str, signature: str, expected_address: str) -> boo
         True if signature is valid and matches expected address
     """
     try:
-        if not signature.startswith("0x"):
-            signature = f"0x{signature}"
-        
-        message_hash = encode_defunct(text=message)
-        recovered = Account.recover_message(message_hash, signature=signature)
-        
-        return recovered.lower() == expected_address.lower()
+        recovered = _recover_address_bytes(message, signature)
+        return f"0x{recovered.hex()}" == expected_address.lower()
     except Exception:
         return False
 
 
+# Below this many signatures, thread startup costs more than it saves
+VERIFY_PARALLEL_MIN = 64
+
+
+def verify_many(
+    items: list[tuple[str, str, str]],
+    max_workers: Optional[int] = None,
+) -> list[bool]:
+    """
+    Verify a batch of EIP-191 signatures, e.g. every job in an epoch.
+    
+    coincurve releases the GIL inside secp256k1 recovery, so large batches
+    are spread over a thread pool; the eth_account fallback runs serially.
+    
+    Args:
+        items: (message, signature, expected_address) tuples
+        max_workers: Pool size (ThreadPoolExecutor default if None)
+    
+    Returns:
+        verify_signature() result per item, in order
+    """
+    if Secp256k1PublicKey is None or len(items) < VERIFY_PARALLEL_MIN:
+        return [verify_signature(*item) for item in items]
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(verify_signature, *zip(*items)))
+
+
 def recover_signer(message: str, signature: str) -> Optional[str]:
     """
     Recover the signer address from a signature.
@@ -70,15 +133,88 @@ def recover_signer(message: str, signature: str) -> Optional[str]:
         Checksummed address or None if recovery fails
     """
     try:
-        if not signature.startswith("0x"):
-            signature = f"0x{signature}"
-        
-        message_hash = encode_defunct(text=message)
-        return Account.recover_message(message_hash, signature=signature)
+        return to_checksum_address(_recover_address_bytes(message, signature))
     except Exception:
         return None
 
 
+# =============================================================================
+# ENS Resolution
+# =============================================================================
+
+class ENSResolver:
+    """
+    ENS name → address resolver with a two-tier TTL cache.
+    
+    An uncached ENS lookup is several RPC round trips (registry, resolver,
+    addr) and can take seconds, so it must not run on every job submission.
+    Lookups hit an in-process TTLCache first, then Redis (shared across
+    workers), and only then the chain. Concurrent misses for the same name
+    share one RPC call.
+    """
+    
+    REDIS_PREFIX = "ens:"
+    
+    def __init__(
+        self,
+        rpc_url: str,
+        redis: Any = None,
+        ttl: int = 600,
+        maxsize: int = 10_000,
+    ):
+        """
+        Args:
+            rpc_url: Ethereum JSON-RPC endpoint (mainnet, for .eth names)
+            redis: Optional redis.asyncio client (decode_responses=True)
+            ttl: Seconds a resolved address stays cached
+            maxsize: Max names held in process memory
+        """
+        self.w3 = Web3(Web3.HTTPProvider(rpc_url))
+        self.redis = redis
+        self.ttl = ttl
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._inflight: dict[str, asyncio.Task] = {}
+    
+    def _lookup(self, ens: str) -> Optional[str]:
+        """Blocking on-chain resolution."""
+        return self.w3.ens.address(ens)
+    
+    async def _fetch(self, ens: str) -> Optional[str]:
+        """Resolve through Redis, then the chain, and fill both caches."""
+        key = f"{self.REDIS_PREFIX}{ens}"
+        address = await self.redis.get(key) if self.redis is not None else None
+        if address is None:
+            address = await asyncio.to_thread(self._lookup, ens)
+            if address is not None and self.redis is not None:
+                await self.redis.set(key, address, ex=self.ttl)
+        # Misses are cached too, so unregistered names can't force RPC calls
+        self._cache[ens] = address
+        return address
+    
+    async def resolve(self, ens: str) -> Optional[str]:
+        """
+        Resolve an ENS name to a checksummed address.
+        
+        Returns:
+            Address, or None if the name has no address record
+        """
+        if ens in self._cache:
+            return self._cache[ens]
+        
+        task = self._inflight.get(ens)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(ens))
+            self._inflight[ens] = task
+            task.add_done_callback(lambda _: self._inflight.pop(ens, None))
+        return await asyncio.shield(task)
+    
+    async def resolve_many(self, names: list[str]) -> dict[str, Optional[str]]:
+        """Resolve a batch of names, fetching only the uncached ones."""
+        unique = list(dict.fromkeys(names))
+        addresses = await asyncio.gather(*(self.resolve(ens) for ens in unique))
+        return dict(zip(unique, addresses))
+
+
 # =============================================================================
 # Job Request Signing
 # =============================================================================
@@ -165,20 +301,58 @@ def sign_epoch(
 # Merkle Tree
 # =============================================================================
 
+def sha256_backend() -> tuple[bool, str]:
+    """
+    Report whether hashlib's sha256 is OpenSSL's (>= 1.1.1).
+
+    Only then does Merkle hashing get OpenSSL's runtime dispatch to SHA-NI /
+    ARMv8 crypto extensions; CPython's builtin fallback is scalar C.
+
+    Returns:
+        (fast, description)
+    """
+    openssl = hashlib.sha256.__name__ == "openssl_sha256"
+    fast = openssl and ssl.OPENSSL_VERSION_INFO >= (1, 1, 1)
+    return fast, ssl.OPENSSL_VERSION if openssl else "builtin sha256"
+
+
 def sha256_hex(data: bytes) -> str:
     """Compute SHA256 and return hex string."""
     return hashlib.sha256(data).hexdigest()
 
 
+# Value types whose orjson encoding is byte-identical to json.dumps' (floats
+# differ in exponent form; non-ASCII text and DEL in escaping)
+_ORJSON_SAFE_TYPES = frozenset({str, int, bool, type(None)})
+
+
 def canonical_json(obj: dict) -> bytes:
     """Produce canonical JSON bytes for hashing."""
+    # Fast path for flat records (jobs, receipts); same bytes as the slow path
+    if all(type(v) in _ORJSON_SAFE_TYPES for v in obj.values()):
+        try:
+            data = orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+        except TypeError:  # e.g. non-str keys or out-of-range ints
+            pass
+        else:
+            # json.dumps escapes DEL (0x7f) as \u007f; orjson emits it raw
+            if data.isascii() and b"\x7f" not in data:
+                return data
     return json.dumps(obj, sort_keys=True, separators=(',', ':')).encode('utf-8')
 
 
+def _hash_pair_raw(left: bytes, right: bytes) -> bytes:
+    """Hash two raw digests together."""
+    return hashlib.sha256(left + right).digest()
+
+
 def hash_pair(left: str, right: str) -> str:
     """Hash two hex strings together."""
-    combined = bytes.fromhex(left) + bytes.fromhex(right)
-    return sha256_hex(combined)
+    return _hash_pair_raw(bytes.fromhex(left), bytes.fromhex(right)).hex()
+
+
+HASH_SIZE = 32            # sha256 digest
+PAIR_SIZE = 2 * HASH_SIZE
 
 
 class MerkleTree:
@@ -195,45 +369,58 @@ class MerkleTree:
         # Sort deterministically
         self.items = sorted(items, key=lambda x: x.get(key_field, ''))
         
-        # Compute leaf hashes
-        self.leaves: list[str] = []
-        self.item_to_index: dict[str, int] = {}
-        
-        for i, item in enumerate(self.items):
-            leaf_hash = sha256_hex(canonical_json(item))
-            self.leaves.append(leaf_hash)
-            self.item_to_index[item.get(key_field, '')] = i
+        self.item_to_index: dict[str, int] = {
+            item.get(key_field, ''): i for i, item in enumerate(self.items)
+        }
         
-        # Build tree levels
-        self.levels: list[list[str]] = [self.leaves.copy()]
+        # Build tree levels; each level is one contiguous buffer of
+        # HASH_SIZE-byte nodes, leaves first. Leaf digests live only in
+        # levels[0]; hex only at the API boundary.
+        self.levels: list[bytes] = []
+        # siblings[lvl] holds, at node i's slot, the hash paired with node i
+        # (odd-duplicate rule applied), so proofs are plain slicing
+        self.siblings: list[bytes] = []
         self._build_tree()
     
+    @property
+    def leaves(self) -> list[str]:
+        """Leaf hashes as hex, in tree order."""
+        if not self.levels:
+            return []
+        leaves = self.levels[0]
+        return [leaves[i:i + HASH_SIZE].hex() for i in range(0, len(leaves), HASH_SIZE)]
+    
     def _build_tree(self) -> None:
         """Build tree levels from leaves to root."""
-        if not self.leaves:
+        if not self.items:
             return
         
-        current_level = self.leaves.copy()
+        sha256 = hashlib.sha256
+        level = b"".join([sha256(canonical_json(item)).digest() for item in self.items])
+        self.levels.append(level)
         
-        while len(current_level) > 1:
-            next_level = []
-            
-            for i in range(0, len(current_level), 2):
-                left = current_level[i]
-                # Odd number: duplicate last node
-                right = current_level[i + 1] if i + 1 < len(current_level) else left
-                parent = hash_pair(left, right)
-                next_level.append(parent)
-            
-            self.levels.append(next_level)
-            current_level = next_level
+        while len(level) > HASH_SIZE:
+            # Odd number: duplicate last node (stored levels stay unpadded)
+            if len(level) % PAIR_SIZE:
+                level += level[-HASH_SIZE:]
+            pairs = range(0, len(level), PAIR_SIZE)
+            self.siblings.append(b"".join([
+                level[i + HASH_SIZE:i + PAIR_SIZE] + level[i:i + HASH_SIZE]
+                for i in pairs
+            ]))
+            # Parents hash straight from 64-byte slices of the level buffer
+            level = b"".join([
+                sha256(level[i:i + PAIR_SIZE]).digest()
+                for i in pairs
+            ])
+            self.levels.append(level)
     
     @property
     def root(self) -> str:
         """Get Merkle root hash."""
-        if not self.levels or not self.levels[-1]:
+        if not self.levels:
             return sha256_hex(b'')
-        return self.levels[-1][0]
+        return self.levels[-1].hex()
     
     def get_proof(self, item_key: str) -> list[dict] | None:
         """
@@ -248,23 +435,13 @@ class MerkleTree:
         index = self.item_to_index[item_key]
         proof = []
         
-        for level in self.levels[:-1]:
-            level_size = len(level)
-            
-            if index % 2 == 0:
-                sibling_index = index + 1
-                position = 'right'
-            else:
-                sibling_index = index - 1
-                position = 'left'
-            
-            if sibling_index >= level_size:
-                sibling_hash = level[index]
-            else:
-                sibling_hash = level[sibling_index]
-            
-            proof.append({'hash': sibling_hash, 'position': position})
-            index = index // 2
+        for siblings in self.siblings:
+            start = index * HASH_SIZE
+            proof.append({
+                'hash': siblings[start:start + HASH_SIZE].hex(),
+                'position': 'left' if index & 1 else 'right',
+            })
+            index >>= 1
         
         return proof
     
@@ -272,7 +449,8 @@ class MerkleTree:
         """Get leaf hash for an item."""
         if item_key not in self.item_to_index:
             return None
-        return self.leaves[self.item_to_index[item_key]]
+        start = self.item_to_index[item_key] * HASH_SIZE
+        return self.levels[0][start:start + HASH_SIZE].hex()
 
 
 def verify_merkle_proof(
@@ -281,18 +459,18 @@ def verify_merkle_proof(
     expected_root: str
 ) -> bool:
     """Verify a Merkle inclusion proof."""
-    current = leaf_hash
+    # Walk the path in raw bytes; hex is decoded per step and encoded once
+    current = bytes.fromhex(leaf_hash)
     
     for step in proof:
-        sibling = step['hash']
-        position = step['position']
+        sibling = bytes.fromhex(step['hash'])
         
-        if position == 'left':
-            current = hash_pair(sibling, current)
+        if step['position'] == 'left':
+            current = _hash_pair_raw(sibling, current)
         else:
-            current = hash_pair(current, sibling)
+            current = _hash_pair_raw(current, sibling)
     
-    return current == expected_root
+    return current.hex() == expected_root
 
 
 # =============================================================================
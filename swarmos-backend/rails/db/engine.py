@@ -0,0 +1,54 @@
+"""
+SwarmOS Rails - Database Engine
+
+Async engine and session factory for the SwarmLedger database.
+
+Postgres goes through asyncpg (binary protocol, per-connection prepared
+statement cache); SQLite URLs are kept for local development via aiosqlite.
+"""
+
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine,
+)
+
+
+POOL_SIZE = 20
+MAX_OVERFLOW = 10
+
+# Plain driver URLs (as found in .env) mapped to their async dialects
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(url: str) -> str:
+    """Rewrite a sync DATABASE_URL to its async driver; explicit drivers are kept."""
+    scheme, sep, rest = url.partition("://")
+    return ASYNC_DRIVERS.get(scheme, scheme) + sep + rest
+
+
+def create_engine(url: str, echo: bool = False) -> AsyncEngine:
+    """
+    Create the async engine for a DATABASE_URL.
+
+    Postgres gets a sized pool with pre-ping so connections dropped by the
+    server are replaced instead of surfacing as errors mid-request.
+    """
+    url = async_database_url(url)
+    if url.startswith("sqlite"):
+        return create_async_engine(url, echo=echo)
+
+    return create_async_engine(
+        url,
+        echo=echo,
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        pool_pre_ping=True,
+    )
+
+
+def create_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    """Session factory; ORM helpers in models.py run via session.run_sync()."""
+    return async_sessionmaker(engine, expire_on_commit=False)
@@ -2,16 +2,21 @@
 SwarmOS Rails - Database Models
 
 SQLAlchemy models for the SwarmLedger database.
+
+Money columns hold integer USD cents (*_cents); format at the API boundary.
 """
 
+import re
 from datetime import datetime
 from decimal import Decimal
 from typing import Optional
 
 from sqlalchemy import (
-    Column, String, Integer, Numeric, DateTime, Text, ForeignKey, Index, Enum
+    Column, String, Integer, BigInteger, Numeric, DateTime, Text, ForeignKey, Index, Enum,
+    CheckConstraint,
+    text, insert, update,
 )
-from sqlalchemy.orm import DeclarativeBase, relationship
+from sqlalchemy.orm import DeclarativeBase, Session, relationship
 from sqlalchemy.sql import func
 import enum
 
@@ -54,6 +59,16 @@ class TxType(str, enum.Enum):
     WITHDRAWAL = "withdrawal"
 
 
+def status_enum(enum_cls: type[enum.Enum], name: str) -> Enum:
+    """Native (Postgres) enum type storing the lowercase member values."""
+    return Enum(
+        enum_cls,
+        name=name,
+        native_enum=True,
+        values_callable=lambda e: [member.value for member in e],
+    )
+
+
 # =============================================================================
 # Models
 # =============================================================================
@@ -64,18 +79,19 @@ class Job(Base):
     __tablename__ = "jobs"
     
     id = Column(String(32), primary_key=True)  # job-002-0848
-    epoch_id = Column(String(16), ForeignKey("epochs.id"), nullable=False)
+    # Part of the key because Postgres requires the partition column in it
+    epoch_id = Column(String(16), ForeignKey("epochs.id"), primary_key=True)
     client_ens = Column(String(128), ForeignKey("clients.ens"), nullable=False)
     worker_ens = Column(String(128), ForeignKey("workers.ens"), nullable=True)
     
     job_type = Column(String(64), nullable=False)  # spine_mri, brain_mri, etc
-    status = Column(String(16), default=JobStatus.PENDING.value, nullable=False)
+    status = Column(status_enum(JobStatus, "job_status"), default=JobStatus.PENDING, nullable=False)
     
     dicom_ref = Column(String(256), nullable=True)   # ipfs://Qm...
     result_ref = Column(String(256), nullable=True)  # ipfs://Qm...
     poe_hash = Column(String(64), nullable=True)     # proof of execution
     
-    fee_usd = Column(Numeric(10, 2), default=Decimal("0.10"))
+    fee_cents = Column(BigInteger, default=10, nullable=False)
     execution_ms = Column(Integer, nullable=True)
     
     submitted_at = Column(DateTime, nullable=False, default=func.now())
@@ -83,16 +99,34 @@ class Job(Base):
     completed_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=func.now())
     
-    # Relationships
-    epoch = relationship("Epoch", back_populates="jobs")
-    client = relationship("Client", back_populates="jobs")
-    worker = relationship("Worker", back_populates="jobs")
+    # Relationships. All use lazy="raise": load them explicitly, e.g.
+    # select(Job).options(selectinload(Job.client)), instead of per-row
+    # lazy SELECTs.
+    epoch = relationship("Epoch", back_populates="jobs", lazy="raise")
+    client = relationship("Client", back_populates="jobs", lazy="raise")
+    worker = relationship("Worker", back_populates="jobs", lazy="raise")
     
+    # Composite indexes follow the dashboard queries; each also serves
+    # lookups on its leading column alone
     __table_args__ = (
-        Index("ix_jobs_epoch_id", "epoch_id"),
-        Index("ix_jobs_client_ens", "client_ens"),
-        Index("ix_jobs_worker_ens", "worker_ens"),
-        Index("ix_jobs_status", "status"),
+        Index("ix_jobs_epoch_status", "epoch_id", "status"),
+        Index("ix_jobs_client_submitted", "client_ens", "submitted_at"),
+        Index("ix_jobs_worker_status", "worker_ens", "status"),
+        # Pending jobs are a small, hot slice of the table
+        Index(
+            "ix_jobs_pending", "epoch_id",
+            postgresql_where=text("status = 'pending'"),
+            sqlite_where=text("status = 'pending'"),
+        ),
+        # The key is (id, epoch_id), so pin epoch_id to the epoch encoded in
+        # the job ID (job-002-0848 -> epoch-002); that keeps id unique alone
+        CheckConstraint(
+            "id LIKE 'job-' || substr(epoch_id, 7) || '-%'",
+            name="ck_jobs_id_epoch",
+        ),
+        # One partition per epoch (see create_jobs_partition); queries on
+        # epoch_id touch only that epoch's heap and indexes
+        {"postgresql_partition_by": "LIST (epoch_id)"},
     )
 
 
@@ -102,7 +136,7 @@ class Epoch(Base):
     __tablename__ = "epochs"
     
     id = Column(String(16), primary_key=True)  # epoch-002
-    status = Column(String(16), default=EpochStatus.ACTIVE.value, nullable=False)
+    status = Column(status_enum(EpochStatus, "epoch_status"), default=EpochStatus.ACTIVE, nullable=False)
     
     start_time = Column(DateTime, nullable=False)
     end_time = Column(DateTime, nullable=True)
@@ -110,12 +144,12 @@ class Epoch(Base):
     jobs_count = Column(Integer, default=0)
     jobs_merkle_root = Column(String(64), nullable=True)
     
-    total_revenue = Column(Numeric(10, 2), default=Decimal("0"))
-    work_pool = Column(Numeric(10, 2), default=Decimal("0"))
-    readiness_pool = Column(Numeric(10, 2), default=Decimal("0"))
-    protocol_fee = Column(Numeric(10, 2), default=Decimal("0"))
-    operator_fee = Column(Numeric(10, 2), default=Decimal("0"))
-    total_distributed = Column(Numeric(10, 2), default=Decimal("0"))
+    total_revenue_cents = Column(BigInteger, default=0)
+    work_pool_cents = Column(BigInteger, default=0)
+    readiness_pool_cents = Column(BigInteger, default=0)
+    protocol_fee_cents = Column(BigInteger, default=0)
+    operator_fee_cents = Column(BigInteger, default=0)
+    total_distributed_cents = Column(BigInteger, default=0)
     
     signature = Column(Text, nullable=True)  # EIP-191 signature
     ipfs_hash = Column(String(64), nullable=True)
@@ -124,8 +158,8 @@ class Epoch(Base):
     sealed_at = Column(DateTime, nullable=True)
     
     # Relationships
-    jobs = relationship("Job", back_populates="epoch")
-    payouts = relationship("Payout", back_populates="epoch")
+    jobs = relationship("Job", back_populates="epoch", lazy="raise")
+    payouts = relationship("Payout", back_populates="epoch", lazy="raise")
 
 
 class Client(Base):
@@ -135,9 +169,9 @@ class Client(Base):
     
     ens = Column(String(128), primary_key=True)  # xyz.clientswarm.eth
     
-    balance_usd = Column(Numeric(10, 2), default=Decimal("0"))
-    reserved_usd = Column(Numeric(10, 2), default=Decimal("0"))  # Pending jobs
-    total_spent_usd = Column(Numeric(10, 2), default=Decimal("0"))
+    balance_cents = Column(BigInteger, default=0)
+    reserved_cents = Column(BigInteger, default=0)  # Pending jobs
+    total_spent_cents = Column(BigInteger, default=0)
     total_jobs = Column(Integer, default=0)
     
     display_name = Column(String(256), nullable=True)
@@ -147,8 +181,8 @@ class Client(Base):
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
     
     # Relationships
-    jobs = relationship("Job", back_populates="client")
-    transactions = relationship("CreditTransaction", back_populates="client")
+    jobs = relationship("Job", back_populates="client", lazy="raise")
+    transactions = relationship("CreditTransaction", back_populates="client", lazy="raise")
 
 
 class Worker(Base):
@@ -158,7 +192,7 @@ class Worker(Base):
     
     ens = Column(String(128), primary_key=True)  # bee-01.swarmbee.eth
     
-    status = Column(String(16), default=WorkerStatus.OFFLINE.value, nullable=False)
+    status = Column(status_enum(WorkerStatus, "worker_status"), default=WorkerStatus.OFFLINE, nullable=False)
     gpu_model = Column(String(64), nullable=True)
     vram_gb = Column(Integer, nullable=True)
     cuda_version = Column(String(16), nullable=True)
@@ -167,7 +201,7 @@ class Worker(Base):
     
     jobs_completed = Column(Integer, default=0)
     jobs_failed = Column(Integer, default=0)
-    total_earned_usd = Column(Numeric(10, 2), default=Decimal("0"))
+    total_earned_cents = Column(BigInteger, default=0)
     uptime_seconds = Column(Integer, default=0)
     
     ip_address = Column(String(45), nullable=True)  # LAN IP
@@ -175,8 +209,8 @@ class Worker(Base):
     registered_at = Column(DateTime, default=func.now())
     
     # Relationships
-    jobs = relationship("Job", back_populates="worker")
-    payouts = relationship("Payout", back_populates="worker")
+    jobs = relationship("Job", back_populates="worker", lazy="raise")
+    payouts = relationship("Payout", back_populates="worker", lazy="raise")
     
     __table_args__ = (
         Index("ix_workers_status", "status"),
@@ -196,19 +230,19 @@ class Payout(Base):
     uptime_seconds = Column(Integer, default=0)
     poe_success_rate = Column(Numeric(5, 4), default=Decimal("1.0"))
     
-    work_share_usd = Column(Numeric(10, 2), default=Decimal("0"))
-    readiness_share_usd = Column(Numeric(10, 2), default=Decimal("0"))
-    total_payout_usd = Column(Numeric(10, 2), default=Decimal("0"))
+    work_share_cents = Column(BigInteger, default=0)
+    readiness_share_cents = Column(BigInteger, default=0)
+    total_payout_cents = Column(BigInteger, default=0)
     
-    status = Column(String(16), default=PayoutStatus.PENDING.value)
+    status = Column(status_enum(PayoutStatus, "payout_status"), default=PayoutStatus.PENDING)
     paid_at = Column(DateTime, nullable=True)
     tx_hash = Column(String(66), nullable=True)  # L1 tx hash if paid on-chain
     
     created_at = Column(DateTime, default=func.now())
     
     # Relationships
-    epoch = relationship("Epoch", back_populates="payouts")
-    worker = relationship("Worker", back_populates="payouts")
+    epoch = relationship("Epoch", back_populates="payouts", lazy="raise")
+    worker = relationship("Worker", back_populates="payouts", lazy="raise")
     
     __table_args__ = (
         Index("ix_payouts_epoch_id", "epoch_id"),
@@ -225,8 +259,8 @@ class CreditTransaction(Base):
     client_ens = Column(String(128), ForeignKey("clients.ens"), nullable=False)
     
     tx_type = Column(String(16), nullable=False)  # deposit, job_charge, etc
-    amount_usd = Column(Numeric(10, 2), nullable=False)
-    balance_after = Column(Numeric(10, 2), nullable=False)
+    amount_cents = Column(BigInteger, nullable=False)
+    balance_after_cents = Column(BigInteger, nullable=False)
     
     reference = Column(String(64), nullable=True)  # job_id or external ref
     eth_tx_hash = Column(String(66), nullable=True)  # L1 tx hash
@@ -234,7 +268,7 @@ class CreditTransaction(Base):
     created_at = Column(DateTime, default=func.now())
     
     # Relationships
-    client = relationship("Client", back_populates="transactions")
+    client = relationship("Client", back_populates="transactions", lazy="raise")
     
     __table_args__ = (
         Index("ix_credit_tx_client_ens", "client_ens"),
@@ -246,12 +280,108 @@ class CreditTransaction(Base):
 # Utilities
 # =============================================================================
 
+# Rows per executemany; keeps statement parameter sets bounded
+BULK_INSERT_BATCH = 1000
+
+
+def _bulk_insert(session: Session, model: type[Base], rows: list[dict]) -> None:
+    """Insert plain dict rows with one executemany per batch (no ORM flush)."""
+    stmt = insert(model)
+    for start in range(0, len(rows), BULK_INSERT_BATCH):
+        session.execute(stmt, rows[start:start + BULK_INSERT_BATCH])
+
+
+def bulk_create_payouts(session: Session, rows: list[dict]) -> None:
+    """Insert an epoch's payout rows (Payout column names as keys)."""
+    _bulk_insert(session, Payout, rows)
+
+
+def bulk_create_credit_tx(session: Session, rows: list[dict]) -> None:
+    """Insert credit transaction rows (CreditTransaction column names as keys)."""
+    _bulk_insert(session, CreditTransaction, rows)
+
+
+def complete_job(
+    session: Session,
+    job_id: str,
+    result_ref: str,
+    poe_hash: str,
+    execution_ms: int,
+    completed_at: datetime,
+) -> bool:
+    """
+    Mark a processing job completed and roll it into its epoch.
+    
+    Epoch.jobs_count and total_revenue_cents are bumped in the same
+    transaction, so sealing reads them instead of aggregating over jobs.
+    
+    Returns:
+        False if the job does not exist or is not processing
+    """
+    row = session.execute(
+        update(Job)
+        .where(
+            Job.id == job_id,
+            Job.epoch_id == job_epoch_id(job_id),  # prunes to one partition
+            Job.status == JobStatus.PROCESSING,
+        )
+        .values(
+            status=JobStatus.COMPLETED,
+            result_ref=result_ref,
+            poe_hash=poe_hash,
+            execution_ms=execution_ms,
+            completed_at=completed_at,
+        )
+        .returning(Job.epoch_id, Job.fee_cents)
+    ).first()
+    if row is None:
+        return False
+    
+    session.execute(
+        update(Epoch)
+        .where(Epoch.id == row.epoch_id)
+        .values(
+            jobs_count=Epoch.jobs_count + 1,
+            total_revenue_cents=Epoch.total_revenue_cents + row.fee_cents,
+        )
+    )
+    return True
+
+
 def generate_job_id(epoch_id: str, sequence: int) -> str:
     """Generate job ID like job-002-0848"""
     epoch_num = epoch_id.split("-")[1]
     return f"job-{epoch_num}-{sequence:04d}"
 
 
+def job_epoch_id(job_id: str) -> str:
+    """Epoch ID encoded in a job ID (job-002-0848 -> epoch-002)"""
+    return f"epoch-{job_id.split('-')[1]}"
+
+
 def generate_epoch_id(sequence: int) -> str:
     """Generate epoch ID like epoch-002"""
     return f"epoch-{sequence:03d}"
+
+
+EPOCH_ID_RE = re.compile(r"epoch-\d+")
+
+
+def create_jobs_partition(session: Session, epoch_id: str) -> None:
+    """
+    Create the jobs partition for an epoch (Postgres only).
+    
+    Call when the epoch is opened, before its first job is inserted. A
+    sealed epoch's partition can later be detached
+    (ALTER TABLE jobs DETACH PARTITION jobs_epoch_002) and archived.
+    """
+    if session.get_bind().dialect.name != "postgresql":
+        return
+    if not EPOCH_ID_RE.fullmatch(epoch_id):
+        raise ValueError(f"Invalid epoch ID: {epoch_id}")
+    
+    partition = "jobs_" + epoch_id.replace("-", "_")
+    session.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {partition} "
+        f"PARTITION OF jobs FOR VALUES IN ('{epoch_id}')"
+    ))
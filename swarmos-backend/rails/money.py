@@ -0,0 +1,24 @@
+"""
+SwarmOS Rails - Money
+
+USD amounts are integer cents internally; strings only at the API boundary.
+"""
+
+from decimal import Decimal
+
+
+def to_cents(amount) -> int:
+    """
+    Parse a USD amount (str, float or Decimal) into integer cents.
+    
+    Sub-cent amounts round half to even (Decimal's default context):
+    "0.105" -> 10, "0.115" -> 12. Floats go through str() so 0.1 is 10.
+    """
+    return int((Decimal(str(amount)) * 100).to_integral_value())
+
+
+def format_cents(cents: int) -> str:
+    """Format integer cents as a USD amount string ("-1.05")."""
+    sign = "-" if cents < 0 else ""
+    cents = abs(cents)
+    return f"{sign}{cents // 100}.{cents % 100:02d}"
@@ -4,18 +4,81 @@ SwarmOS Rails - Redis Queue
 Job queue and worker management using Redis.
 """
 
-import json
+import asyncio
+import random
 import time
 from typing import Optional, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from datetime import datetime
 
+import orjson
 import redis.asyncio as redis
+from redis.exceptions import ResponseError
 
 
-@dataclass
+# Record a sign of life (plus optional field/value pairs) for a registered
+# worker: hash fields, last-seen ZSET and ready ZSET in one atomic
+# round-trip. Unknown workers are left alone so no partial records appear.
+# KEYS: worker hash, heartbeat ZSET, ready ZSET. ARGV: ens, now, [field, value]...
+_TOUCH_WORKER = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'last_heartbeat', ARGV[2], unpack(ARGV, 3))
+redis.call('ZADD', KEYS[2], ARGV[2], ARGV[1])
+local w = redis.call('HMGET', KEYS[1], 'status', 'vram_gb')
+if w[1] == 'online' then
+    redis.call('ZADD', KEYS[3], w[2], ARGV[1])
+else
+    redis.call('ZREM', KEYS[3], ARGV[1])
+end
+return 1
+"""
+
+# Smallest-VRAM ready worker with at least the requested VRAM that has
+# been seen since the cutoff, or false.
+# KEYS: ready ZSET, heartbeat ZSET. ARGV: min VRAM (GB), heartbeat cutoff.
+_PICK_WORKER = """
+local cutoff = tonumber(ARGV[2])
+for _, ens in ipairs(redis.call('ZRANGEBYSCORE', KEYS[1], ARGV[1], '+inf')) do
+    local seen = redis.call('ZSCORE', KEYS[2], ens)
+    if seen and tonumber(seen) > cutoff then
+        return ens
+    end
+end
+return false
+"""
+
+# All get_stats counters in one round-trip; worker payloads stay server-side.
+# KEYS: jobs stream, workers index.
+# ARGV: now, heartbeat TTL, worker key prefix, consumer group.
+# Returns {queue_depth, processing, total, online (incl. busy), busy}.
+_STATS = """
+local pending = redis.call('XPENDING', KEYS[1], ARGV[4])[1]
+local now = tonumber(ARGV[1])
+local ttl = tonumber(ARGV[2])
+local total, online, busy = 0, 0, 0
+for _, ens in ipairs(redis.call('SMEMBERS', KEYS[2])) do
+    local w = redis.call('HMGET', ARGV[3] .. ens, 'status', 'last_heartbeat')
+    if w[1] then
+        total = total + 1
+        if now - tonumber(w[2]) < ttl then
+            if w[1] == 'online' then
+                online = online + 1
+            elseif w[1] == 'busy' then
+                online = online + 1
+                busy = busy + 1
+            end
+        end
+    end
+end
+return {redis.call('XLEN', KEYS[1]) - pending, pending, total, online, busy}
+"""
+
+
+@dataclass(slots=True, frozen=True)
 class QueuedJob:
-    """A job in the queue."""
+    """A job in the queue (immutable once enqueued)."""
     job_id: str
     job_type: str
     client_ens: str
@@ -23,9 +86,25 @@ class QueuedJob:
     fee_usd: str
     queued_at: float
     priority: int = 0  # Higher = more urgent
+    
+    @classmethod
+    def from_entry(cls, data: dict[str, str]) -> "QueuedJob":
+        """Rebuild from a jobs stream entry."""
+        if "job" in data:
+            return cls(**orjson.loads(data["job"]))
+        # Per-field entries written before the single-field payload
+        return cls(
+            job_id=data["job_id"],
+            job_type=data["job_type"],
+            client_ens=data["client_ens"],
+            dicom_ref=data["dicom_ref"],
+            fee_usd=data["fee_usd"],
+            queued_at=float(data["queued_at"]),
+            priority=int(data.get("priority", 0)),
+        )
 
 
-@dataclass 
+@dataclass(slots=True)
 class WorkerInfo:
     """Worker registration info."""
     ens: str
@@ -35,32 +114,115 @@ class WorkerInfo:
     ip_address: str
     current_job_id: Optional[str] = None
     last_heartbeat: float = 0
+    
+    def to_hash(self) -> dict[str, Any]:
+        """Field mapping for the worker's Redis hash ("" stands for None)."""
+        # Built directly: asdict() deep-copies every value on each call
+        return {
+            "ens": self.ens,
+            "status": self.status,
+            "gpu_model": self.gpu_model,
+            "vram_gb": self.vram_gb,
+            "ip_address": self.ip_address,
+            "current_job_id": self.current_job_id or "",
+            "last_heartbeat": self.last_heartbeat,
+        }
+    
+    @classmethod
+    def from_hash(cls, data: dict[str, str]) -> "WorkerInfo":
+        """Rebuild from a decoded HGETALL reply."""
+        return cls(
+            ens=data["ens"],
+            status=data["status"],
+            gpu_model=data["gpu_model"],
+            vram_gb=int(data["vram_gb"]),
+            ip_address=data["ip_address"],
+            current_job_id=data.get("current_job_id") or None,
+            last_heartbeat=float(data.get("last_heartbeat", 0)),
+        )
 
 
 class SwarmQueue:
     """
     Redis-based job queue for SwarmOS.
     
-    Uses Redis Streams for reliable job processing.
+    Uses Redis Streams for reliable job processing: workers read through a
+    consumer group, and a job stays in the group's pending list until it is
+    completed, so jobs of crashed or failed workers are claimed again.
     """
     
     JOBS_STREAM = "swarm:jobs:pending"
+    JOBS_GROUP = "workers"
+    # job_id -> stream message ID of claimed jobs (for XACK on completion)
     JOBS_PROCESSING = "swarm:jobs:processing"
-    WORKERS_HASH = "swarm:workers"
+    # Claimed jobs idle this long are handed to the next claiming worker
+    JOBS_RECLAIM_IDLE_MS = 15 * 60 * 1000
+    # One hash per worker (swarm:worker:{ens}) plus a set of registered ENS
+    WORKER_KEY = "swarm:worker:{}"
+    WORKERS_INDEX = "swarm:workers:index"
+    # ens scored by last heartbeat, for range queries on staleness
+    HEARTBEAT_ZSET = "swarm:workers:heartbeat"
+    # ens of online (idle) workers scored by VRAM GB, for GPU matching
+    READY_ZSET = "swarm:workers:ready"
     WORKER_HEARTBEAT_TTL = 60  # seconds
+    # get_stats results are shared for about this long (jittered +-10%)
+    STATS_CACHE_TTL = 1.0  # seconds
     
-    def __init__(self, redis_url: str = "redis://localhost:6379/0"):
+    def __init__(
+        self,
+        redis_url: str = "redis://localhost:6379/0",
+        max_connections: int = 20,
+        health_check_interval: int = 30,
+    ):
+        """
+        Args:
+            redis_url: Redis connection URL
+            max_connections: Pool size for this process. Keep
+                workers * max_connections under the server's maxclients.
+            health_check_interval: Seconds a connection may sit idle before
+                it is PINGed on checkout, so dropped sockets are replaced
+                rather than failing a request
+        """
         self.redis_url = redis_url
+        self.max_connections = max_connections
+        self.health_check_interval = health_check_interval
+        self._pool: Optional[redis.BlockingConnectionPool] = None
         self._redis: Optional[redis.Redis] = None
+        # (expires_at monotonic, stats); the lock lets one caller recompute
+        # while concurrent callers wait for its result
+        self._stats_cache: Optional[tuple[float, dict]] = None
+        self._stats_lock = asyncio.Lock()
     
     async def connect(self) -> None:
-        """Connect to Redis."""
-        self._redis = redis.from_url(self.redis_url, decode_responses=True)
+        """Connect to Redis through a bounded connection pool."""
+        # Blocking pool: callers wait for a free connection instead of
+        # erroring with "Too many connections" under bursts
+        self._pool = redis.BlockingConnectionPool.from_url(
+            self.redis_url,
+            decode_responses=True,
+            max_connections=self.max_connections,
+            health_check_interval=self.health_check_interval,
+        )
+        self._redis = redis.Redis(connection_pool=self._pool)
+        self._touch_worker = self._redis.register_script(_TOUCH_WORKER)
+        self._stats = self._redis.register_script(_STATS)
+        self._pick_worker = self._redis.register_script(_PICK_WORKER)
+        
+        try:
+            # From "0" so jobs enqueued before the group existed are served
+            await self._redis.xgroup_create(
+                self.JOBS_STREAM, self.JOBS_GROUP, id="0", mkstream=True
+            )
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
     
     async def disconnect(self) -> None:
         """Disconnect from Redis."""
         if self._redis:
             await self._redis.close()
+        if self._pool:
+            await self._pool.disconnect()
     
     @property
     def redis(self) -> redis.Redis:
@@ -79,70 +241,72 @@ class SwarmQueue:
         Returns:
             Redis stream message ID
         """
-        data = {
-            "job_id": job.job_id,
-            "job_type": job.job_type,
-            "client_ens": job.client_ens,
-            "dicom_ref": job.dicom_ref,
-            "fee_usd": job.fee_usd,
-            "queued_at": str(job.queued_at),
-            "priority": str(job.priority),
-        }
+        # One typed JSON field instead of stringifying each attribute;
+        # orjson serializes the dataclass natively (no asdict() copy)
+        data = {"job": orjson.dumps(job)}
         
         message_id = await self.redis.xadd(self.JOBS_STREAM, data)
         return message_id
     
-    async def claim_job(self, worker_ens: str) -> Optional[QueuedJob]:
+    async def claim_job(self, worker_ens: str, block_ms: int = 1000) -> Optional[QueuedJob]:
         """
         Claim the next available job for a worker.
         
+        Jobs left idle by a crashed worker, or requeued by fail_job, are
+        taken over first; otherwise the next new job is read from the group.
+        
+        Args:
+            worker_ens: Claiming worker (the group consumer name)
+            block_ms: How long to wait for a job when the queue is empty.
+                Holds one pool connection for the duration. 0 or less
+                returns immediately (Redis treats BLOCK 0 as forever).
+        
         Returns:
             QueuedJob if available, None otherwise
         """
-        # Read one message from stream
-        messages = await self.redis.xread(
-            {self.JOBS_STREAM: "0"},
+        _, entries, *_ = await self.redis.xautoclaim(
+            self.JOBS_STREAM,
+            self.JOBS_GROUP,
+            worker_ens,
+            min_idle_time=self.JOBS_RECLAIM_IDLE_MS,
             count=1,
-            block=1000  # 1 second timeout
         )
+        # Entries deleted while pending come back without data (Redis 6.2)
+        entries = [entry for entry in entries if entry[1]]
         
-        if not messages:
-            return None
-        
-        stream_name, entries = messages[0]
         if not entries:
-            return None
+            messages = await self.redis.xreadgroup(
+                self.JOBS_GROUP,
+                worker_ens,
+                {self.JOBS_STREAM: ">"},
+                count=1,
+                block=block_ms if block_ms > 0 else None
+            )
+            if not messages:
+                return None
+            
+            stream_name, entries = messages[0]
+            if not entries:
+                return None
         
         message_id, data = entries[0]
+        job = QueuedJob.from_entry(data)
+        await self.redis.hset(self.JOBS_PROCESSING, job.job_id, message_id)
         
-        # Move to processing set
-        await self.redis.hset(
-            self.JOBS_PROCESSING,
-            data["job_id"],
-            json.dumps({
-                "worker_ens": worker_ens,
-                "claimed_at": time.time(),
-                "message_id": message_id,
-            })
-        )
-        
-        # Remove from pending stream
-        await self.redis.xdel(self.JOBS_STREAM, message_id)
-        
-        return QueuedJob(
-            job_id=data["job_id"],
-            job_type=data["job_type"],
-            client_ens=data["client_ens"],
-            dicom_ref=data["dicom_ref"],
-            fee_usd=data["fee_usd"],
-            queued_at=float(data["queued_at"]),
-            priority=int(data.get("priority", 0)),
-        )
+        return job
     
     async def complete_job(self, job_id: str) -> bool:
-        """Mark a job as completed and remove from processing."""
-        removed = await self.redis.hdel(self.JOBS_PROCESSING, job_id)
-        return removed > 0
+        """Acknowledge a completed job and drop it from the stream."""
+        message_id = await self.redis.hget(self.JOBS_PROCESSING, job_id)
+        if not message_id:
+            return False
+        
+        async with self.redis.pipeline() as pipe:
+            pipe.xack(self.JOBS_STREAM, self.JOBS_GROUP, message_id)
+            pipe.xdel(self.JOBS_STREAM, message_id)
+            pipe.hdel(self.JOBS_PROCESSING, job_id)
+            await pipe.execute()
+        return True
     
     async def fail_job(self, job_id: str, requeue: bool = True) -> bool:
         """
@@ -152,25 +316,46 @@ class SwarmQueue:
             job_id: The job ID
             requeue: If True, put back in queue for retry
         """
-        processing_data = await self.redis.hget(self.JOBS_PROCESSING, job_id)
+        message_id = await self.redis.hget(self.JOBS_PROCESSING, job_id)
+        if not message_id:
+            return True
         
-        if processing_data:
-            await self.redis.hdel(self.JOBS_PROCESSING, job_id)
-            
-            if requeue:
-                # Re-add to queue (would need original job data)
-                # For now, just log that it failed
-                pass
+        if requeue:
+            # Keep it pending but mark it idle past the reclaim threshold,
+            # so the next claim_job takes it over
+            async with self.redis.pipeline() as pipe:
+                pipe.xclaim(
+                    self.JOBS_STREAM,
+                    self.JOBS_GROUP,
+                    "requeue",
+                    min_idle_time=0,
+                    message_ids=[message_id],
+                    idle=self.JOBS_RECLAIM_IDLE_MS,
+                )
+                pipe.hdel(self.JOBS_PROCESSING, job_id)
+                await pipe.execute()
+        else:
+            async with self.redis.pipeline() as pipe:
+                pipe.xack(self.JOBS_STREAM, self.JOBS_GROUP, message_id)
+                pipe.xdel(self.JOBS_STREAM, message_id)
+                pipe.hdel(self.JOBS_PROCESSING, job_id)
+                await pipe.execute()
         
         return True
     
     async def get_queue_depth(self) -> int:
         """Get number of jobs waiting in queue."""
-        return await self.redis.xlen(self.JOBS_STREAM)
+        # Claimed jobs stay in the stream until acknowledged
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.xlen(self.JOBS_STREAM)
+            pipe.xpending(self.JOBS_STREAM, self.JOBS_GROUP)
+            length, summary = await pipe.execute()
+        return length - summary["pending"]
     
     async def get_processing_count(self) -> int:
         """Get number of jobs currently being processed."""
-        return await self.redis.hlen(self.JOBS_PROCESSING)
+        summary = await self.redis.xpending(self.JOBS_STREAM, self.JOBS_GROUP)
+        return summary["pending"]
     
     # =========================================================================
     # Worker Registry Operations
@@ -179,22 +364,23 @@ class SwarmQueue:
     async def register_worker(self, worker: WorkerInfo) -> None:
         """Register or update a worker."""
         worker.last_heartbeat = time.time()
-        await self.redis.hset(
-            self.WORKERS_HASH,
-            worker.ens,
-            json.dumps(asdict(worker))
-        )
+        async with self.redis.pipeline() as pipe:
+            pipe.hset(self.WORKER_KEY.format(worker.ens), mapping=worker.to_hash())
+            pipe.sadd(self.WORKERS_INDEX, worker.ens)
+            pipe.zadd(self.HEARTBEAT_ZSET, {worker.ens: worker.last_heartbeat})
+            if worker.status == "online":
+                pipe.zadd(self.READY_ZSET, {worker.ens: worker.vram_gb})
+            else:
+                pipe.zrem(self.READY_ZSET, worker.ens)
+            await pipe.execute()
     
     async def update_heartbeat(self, worker_ens: str) -> bool:
         """Update worker heartbeat timestamp."""
-        data = await self.redis.hget(self.WORKERS_HASH, worker_ens)
-        if not data:
-            return False
-        
-        worker_data = json.loads(data)
-        worker_data["last_heartbeat"] = time.time()
-        await self.redis.hset(self.WORKERS_HASH, worker_ens, json.dumps(worker_data))
-        return True
+        updated = await self._touch_worker(
+            keys=[self.WORKER_KEY.format(worker_ens), self.HEARTBEAT_ZSET, self.READY_ZSET],
+            args=[worker_ens, time.time()],
+        )
+        return bool(updated)
     
     async def set_worker_status(
         self,
@@ -203,70 +389,88 @@ class SwarmQueue:
         current_job_id: Optional[str] = None
     ) -> bool:
         """Update worker status."""
-        data = await self.redis.hget(self.WORKERS_HASH, worker_ens)
-        if not data:
-            return False
-        
-        worker_data = json.loads(data)
-        worker_data["status"] = status
-        worker_data["current_job_id"] = current_job_id
-        worker_data["last_heartbeat"] = time.time()
-        await self.redis.hset(self.WORKERS_HASH, worker_ens, json.dumps(worker_data))
-        return True
+        updated = await self._touch_worker(
+            keys=[self.WORKER_KEY.format(worker_ens), self.HEARTBEAT_ZSET, self.READY_ZSET],
+            args=[
+                worker_ens, time.time(),
+                "status", status,
+                "current_job_id", current_job_id or "",
+            ],
+        )
+        return bool(updated)
     
     async def get_worker(self, worker_ens: str) -> Optional[WorkerInfo]:
         """Get worker info."""
-        data = await self.redis.hget(self.WORKERS_HASH, worker_ens)
+        data = await self.redis.hgetall(self.WORKER_KEY.format(worker_ens))
         if not data:
             return None
         
-        worker_data = json.loads(data)
-        return WorkerInfo(**worker_data)
+        return WorkerInfo.from_hash(data)
+    
+    async def _get_workers(self, members) -> list[WorkerInfo]:
+        """Pipelined HGETALL for the given ENS names (missing ones skipped)."""
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for ens in members:
+                pipe.hgetall(self.WORKER_KEY.format(ens))
+            rows = await pipe.execute()
+        
+        return [WorkerInfo.from_hash(data) for data in rows if data]
     
     async def get_all_workers(self) -> list[WorkerInfo]:
         """Get all registered workers."""
-        all_data = await self.redis.hgetall(self.WORKERS_HASH)
-        workers = []
-        
-        for ens, data in all_data.items():
-            worker_data = json.loads(data)
-            workers.append(WorkerInfo(**worker_data))
-        
-        return workers
+        return await self._get_workers(await self.redis.smembers(self.WORKERS_INDEX))
     
     async def get_online_workers(self) -> list[WorkerInfo]:
         """Get workers that are online and not busy."""
-        all_workers = await self.get_all_workers()
-        now = time.time()
-        
-        return [
-            w for w in all_workers
-            if w.status == "online"
-            and (now - w.last_heartbeat) < self.WORKER_HEARTBEAT_TTL
-        ]
+        # Only workers seen within the TTL are fetched
+        recent = await self.redis.zrangebyscore(
+            self.HEARTBEAT_ZSET, f"({time.time() - self.WORKER_HEARTBEAT_TTL}", "+inf"
+        )
+        return [w for w in await self._get_workers(recent) if w.status == "online"]
     
-    async def get_available_worker(self) -> Optional[WorkerInfo]:
-        """Get next available worker for job assignment."""
-        online = await self.get_online_workers()
+    async def get_available_worker(self, min_vram_gb: int = 0) -> Optional[WorkerInfo]:
+        """
+        Get next available worker for job assignment.
         
-        if not online:
+        Picks the live idle worker with the least VRAM that still has
+        min_vram_gb, leaving larger GPUs free for jobs that need them.
+        """
+        ens = await self._pick_worker(
+            keys=[self.READY_ZSET, self.HEARTBEAT_ZSET],
+            args=[min_vram_gb, time.time() - self.WORKER_HEARTBEAT_TTL],
+        )
+        if not ens:
             return None
         
-        # Simple round-robin: return first available
-        # Could be enhanced with load balancing, GPU matching, etc.
-        return online[0]
+        return await self.get_worker(ens)
     
     async def cleanup_stale_workers(self) -> int:
         """Mark workers with stale heartbeats as offline."""
-        all_workers = await self.get_all_workers()
-        now = time.time()
-        cleaned = 0
+        # Only workers not seen within the TTL; they leave the ZSET once
+        # marked, so each sweep costs O(log N + newly stale)
+        stale = await self.redis.zrangebyscore(
+            self.HEARTBEAT_ZSET, "-inf", f"({time.time() - self.WORKER_HEARTBEAT_TTL}"
+        )
+        if not stale:
+            return 0
         
-        for worker in all_workers:
-            if (now - worker.last_heartbeat) > self.WORKER_HEARTBEAT_TTL:
-                if worker.status != "offline":
-                    await self.set_worker_status(worker.ens, "offline")
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for ens in stale:
+                pipe.hget(self.WORKER_KEY.format(ens), "status")
+            statuses = await pipe.execute()
+        
+        cleaned = 0
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for ens, status in zip(stale, statuses):
+                if status is not None and status != "offline":
+                    pipe.hset(
+                        self.WORKER_KEY.format(ens),
+                        mapping={"status": "offline", "current_job_id": ""},
+                    )
                     cleaned += 1
+            pipe.zrem(self.HEARTBEAT_ZSET, *stale)
+            pipe.zrem(self.READY_ZSET, *stale)
+            await pipe.execute()
         
         return cleaned
     
@@ -275,26 +479,35 @@ class SwarmQueue:
     # =========================================================================
     
     async def get_stats(self) -> dict:
-        """Get queue and worker stats."""
-        all_workers = await self.get_all_workers()
-        now = time.time()
+        """Get queue and worker stats (cached for STATS_CACHE_TTL)."""
+        cached = self._stats_cache
+        if cached and time.monotonic() < cached[0]:
+            return cached[1]
         
-        online_count = sum(
-            1 for w in all_workers
-            if w.status in ("online", "busy")
-            and (now - w.last_heartbeat) < self.WORKER_HEARTBEAT_TTL
-        )
-        
-        busy_count = sum(
-            1 for w in all_workers
-            if w.status == "busy"
-            and (now - w.last_heartbeat) < self.WORKER_HEARTBEAT_TTL
+        async with self._stats_lock:
+            cached = self._stats_cache
+            if cached and time.monotonic() < cached[0]:
+                return cached[1]
+            
+            stats = await self._fetch_stats()
+            ttl = self.STATS_CACHE_TTL * random.uniform(0.9, 1.1)
+            self._stats_cache = (time.monotonic() + ttl, stats)
+            return stats
+    
+    async def _fetch_stats(self) -> dict:
+        # Worker keys are built inside the script, so this needs a single
+        # Redis instance (not Cluster)
+        depth, processing, total, online_count, busy_count = await self._stats(
+            keys=[self.JOBS_STREAM, self.WORKERS_INDEX],
+            args=[
+                time.time(), self.WORKER_HEARTBEAT_TTL, self.WORKER_KEY.format(""), self.JOBS_GROUP,
+            ],
         )
         
         return {
-            "queue_depth": await self.get_queue_depth(),
-            "processing": await self.get_processing_count(),
-            "workers_total": len(all_workers),
+            "queue_depth": depth,
+            "processing": processing,
+            "workers_total": total,
             "workers_online": online_count,
             "workers_busy": busy_count,
             "workers_available": online_count - busy_count,
@@ -7,7 +7,12 @@ API request/response schemas.
 from datetime import datetime
 from decimal import Decimal
 from typing import Optional, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+
+
+class ResponseModel(BaseModel):
+    """Base for response schemas; can be built straight from ORM rows."""
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
 
 
 # =============================================================================
@@ -24,7 +29,7 @@ class JobSubmitRequest(BaseModel):
     signature: str = Field(..., description="EIP-191 signature")
 
 
-class JobSubmitResponse(BaseModel):
+class JobSubmitResponse(ResponseModel):
     """Response after job submission."""
     job_id: str
     status: str
@@ -33,7 +38,7 @@ class JobSubmitResponse(BaseModel):
     message: str
 
 
-class JobStatusResponse(BaseModel):
+class JobStatusResponse(ResponseModel):
     """Job status response."""
     job_id: str
     epoch_id: str
@@ -50,7 +55,7 @@ class JobStatusResponse(BaseModel):
     completed_at: Optional[datetime]
 
 
-class JobReceiptResponse(BaseModel):
+class JobReceiptResponse(ResponseModel):
     """Merkle receipt for a completed job."""
     receipt_version: str
     job_id: str
@@ -90,13 +95,13 @@ class WorkerHeartbeatRequest(BaseModel):
     memory_utilization: Optional[float] = None
 
 
-class WorkerHeartbeatResponse(BaseModel):
+class WorkerHeartbeatResponse(ResponseModel):
     """Heartbeat response."""
     acknowledged: bool
     server_time: datetime
 
 
-class JobClaimResponse(BaseModel):
+class JobClaimResponse(ResponseModel):
     """Response when worker claims a job."""
     job_id: Optional[str]
     job_type: Optional[str]
@@ -120,7 +125,7 @@ class JobCompleteRequest(BaseModel):
 # Client Schemas
 # =============================================================================
 
-class ClientInfoResponse(BaseModel):
+class ClientInfoResponse(ResponseModel):
     """Client account info."""
     ens: str
     balance_usd: str
@@ -128,7 +133,7 @@ class ClientInfoResponse(BaseModel):
     available_usd: str
     total_spent_usd: str
     total_jobs: int
-    scans_available: int  # balance / 0.10
+    scans_available: int  # available cents // job fee cents
     display_name: Optional[str]
     created_at: datetime
 
@@ -140,7 +145,7 @@ class ClientTopupRequest(BaseModel):
     eth_tx_hash: str = Field(..., description="L1 transaction hash")
 
 
-class ClientTopupResponse(BaseModel):
+class ClientTopupResponse(ResponseModel):
     """Topup confirmation."""
     client_ens: str
     amount_usd: str
@@ -149,7 +154,7 @@ class ClientTopupResponse(BaseModel):
     tx_hash: str
 
 
-class TransactionHistoryItem(BaseModel):
+class TransactionHistoryItem(ResponseModel):
     """A single transaction in history."""
     tx_type: str
     amount_usd: str
@@ -163,7 +168,7 @@ class TransactionHistoryItem(BaseModel):
 # Epoch Schemas
 # =============================================================================
 
-class EpochSummaryResponse(BaseModel):
+class EpochSummaryResponse(ResponseModel):
     """Epoch summary."""
     epoch_id: str
     status: str
@@ -176,7 +181,7 @@ class EpochSummaryResponse(BaseModel):
     ipfs_hash: Optional[str]
 
 
-class EpochDetailResponse(BaseModel):
+class EpochDetailResponse(ResponseModel):
     """Detailed epoch info."""
     epoch_id: str
     status: str
@@ -190,7 +195,7 @@ class EpochDetailResponse(BaseModel):
     ipfs_hash: Optional[str]
 
 
-class CurrentEpochResponse(BaseModel):
+class CurrentEpochResponse(ResponseModel):
     """Current active epoch status."""
     epoch_id: str
     status: str
@@ -205,7 +210,7 @@ class CurrentEpochResponse(BaseModel):
 # System Schemas
 # =============================================================================
 
-class SystemStatusResponse(BaseModel):
+class SystemStatusResponse(ResponseModel):
     """System-wide status."""
     status: str  # healthy, degraded, down
     current_epoch: str
@@ -218,9 +223,22 @@ class SystemStatusResponse(BaseModel):
     total_revenue_today: str
 
 
-class HealthResponse(BaseModel):
+class HealthResponse(ResponseModel):
     """Health check response."""
     status: str
     timestamp: datetime
     version: str
     components: dict  # redis, db, ipfs status
+
+
+# =============================================================================
+# Adapters
+# =============================================================================
+# Built once at import so hot endpoints can validate raw body bytes with the
+# compiled validator instead of going through a per-request model parse.
+
+job_submit_adapter = TypeAdapter(JobSubmitRequest)
+job_complete_adapter = TypeAdapter(JobCompleteRequest)
+worker_register_adapter = TypeAdapter(WorkerRegisterRequest)
+worker_heartbeat_adapter = TypeAdapter(WorkerHeartbeatRequest)
+client_topup_adapter = TypeAdapter(ClientTopupRequest)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Make the shared rails package importable, as bee1/bee2 do at startup
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
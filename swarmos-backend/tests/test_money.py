@@ -0,0 +1,51 @@
+"""Tests for rails.money cents parsing and formatting."""
+
+from decimal import Decimal
+
+import pytest
+
+from rails.money import format_cents, to_cents
+
+
+@pytest.mark.parametrize("amount, cents", [
+    ("0.10", 10),
+    ("12.70", 1270),
+    ("1", 100),
+    ("0", 0),
+    ("-3.05", -305),
+    (Decimal("847.30"), 84730),
+    (0.1, 10),          # float via str(), not its binary value
+    (0.29, 29),         # int(0.29 * 100) would give 28
+    (1e-3, 0),
+])
+def test_to_cents(amount, cents):
+    assert to_cents(amount) == cents
+
+
+@pytest.mark.parametrize("amount, cents", [
+    ("0.105", 10),      # half to even
+    ("0.115", 12),
+    ("0.125", 12),
+    ("0.1051", 11),     # above half rounds up
+    ("-0.105", -10),
+])
+def test_to_cents_rounds_half_even(amount, cents):
+    assert to_cents(amount) == cents
+
+
+@pytest.mark.parametrize("cents, text", [
+    (0, "0.00"),
+    (5, "0.05"),
+    (10, "0.10"),
+    (1270, "12.70"),
+    (-5, "-0.05"),
+    (-305, "-3.05"),
+    (10 ** 15 + 1, "10000000000000.01"),
+])
+def test_format_cents(cents, text):
+    assert format_cents(cents) == text
+
+
+@pytest.mark.parametrize("cents", [0, 1, 99, 100, 101, -1, -99, -100, 123456789])
+def test_round_trip(cents):
+    assert to_cents(format_cents(cents)) == cents
@@ -0,0 +1,52 @@
+"""Tests for rails.crypto.signing: canonical JSON and Merkle proofs."""
+
+import json
+
+import pytest
+
+from rails.crypto.signing import (
+    MerkleTree, canonical_json, sha256_hex, verify_merkle_proof,
+)
+
+
+def slow_canonical_json(obj: dict) -> bytes:
+    return json.dumps(obj, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+
+@pytest.mark.parametrize("code", range(128))
+def test_canonical_json_ascii_parity(code):
+    char = chr(code)
+    obj = {"a": f"x{char}y", f"k{char}": 1}
+    assert canonical_json(obj) == slow_canonical_json(obj)
+
+
+@pytest.mark.parametrize("obj", [
+    {"a": "x\x7fy"},
+    {"job_id": "job-002-0848", "price": "0.10", "n": 3, "ok": True, "ref": None},
+    {"text": "café", "emoji": "\U0001f41d"},
+    {"big": 2 ** 70},
+    {"f": 0.1, "e": 1e20},
+    {"nested": {"b": 1, "a": [1, 2]}},
+    {},
+])
+def test_canonical_json_parity(obj):
+    assert canonical_json(obj) == slow_canonical_json(obj)
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 5, 8, 13])
+def test_merkle_proofs_verify(count):
+    items = [{"id": f"job-001-{i:04d}", "price": "0.10"} for i in range(count)]
+    tree = MerkleTree(items)
+    
+    for item in items:
+        leaf = sha256_hex(canonical_json(item))
+        assert tree.get_leaf_hash(item["id"]) == leaf
+        assert verify_merkle_proof(leaf, tree.get_proof(item["id"]), tree.root)
+
+
+def test_merkle_proof_rejects_other_leaf():
+    items = [{"id": f"job-001-{i:04d}"} for i in range(4)]
+    tree = MerkleTree(items)
+    
+    other = sha256_hex(canonical_json({"id": "job-001-9999"}))
+    assert not verify_merkle_proof(other, tree.get_proof("job-001-0000"), tree.root)